@@ -0,0 +1,152 @@
+"""Shared back-pressure for slskd API calls made from many worker threads.
+
+A token bucket caps the request rate of the whole run, a Retry-After from
+slskd (429/503) pauses the bucket for everyone, and a circuit breaker stops
+all workers for a cooldown after several transient failures in a row, then
+lets a single probe call through before reopening the flood gates.
+"""
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+DEFAULT_RATE = 10.0
+DEFAULT_BURST = 20
+DEFAULT_FAILURE_THRESHOLD = 5
+DEFAULT_COOLDOWN = 30.0
+# Longest Retry-After (seconds) honoured as-is.
+RETRY_AFTER_MAX = 300.0
+
+
+def retry_after(exc: Exception, now: Optional[datetime] = None) -> Optional[float]:
+    """Seconds requested by a Retry-After header on the error's response, if any."""
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    value = headers.get("Retry-After")
+    if not value:
+        return None
+    value = str(value).strip()
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            when = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=timezone.utc)
+        seconds = (when - (now or datetime.now(timezone.utc))).total_seconds()
+    return min(max(seconds, 0.0), RETRY_AFTER_MAX)
+
+
+class TokenBucket:
+    """`rate` requests per second with bursts of up to `burst`; rate <= 0 disables it."""
+
+    def __init__(self, rate: float = DEFAULT_RATE, burst: int = DEFAULT_BURST, clock=None):
+        self.rate = rate
+        self.capacity = float(max(1, burst))
+        self.clock = clock or time.monotonic
+        self.tokens = self.capacity
+        self.updated = self.clock()
+        self.paused_until = 0.0
+        self.waited = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = self.clock()
+                delay = self.paused_until - now
+                if delay <= 0:
+                    self.tokens = min(self.capacity, self.tokens + max(0.0, now - self.updated) * self.rate)
+                    self.updated = max(self.updated, now)
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return
+                    delay = (1 - self.tokens) / self.rate
+                self.waited += delay
+            time.sleep(delay)
+
+    def pause(self, seconds: float) -> None:
+        """Server back-pressure: hand out no tokens for `seconds`, then start empty."""
+        with self._lock:
+            until = self.clock() + seconds
+            self.paused_until = max(self.paused_until, until)
+            self.tokens = 0.0
+            self.updated = max(self.updated, self.paused_until)
+
+
+class CircuitBreaker:
+    """Opens after `threshold` failures in a row; closes again once a probe succeeds."""
+
+    def __init__(
+        self, threshold: int = DEFAULT_FAILURE_THRESHOLD, cooldown: float = DEFAULT_COOLDOWN, clock=None
+    ):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.clock = clock or time.monotonic
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.probing = False
+        self.trips = 0
+        self._cond = threading.Condition()
+
+    def wait(self) -> None:
+        """Block while the circuit is open; after the cooldown one caller probes."""
+        with self._cond:
+            while self.opened_at is not None:
+                remaining = self.opened_at + self.cooldown - self.clock()
+                if remaining <= 0 and not self.probing:
+                    self.probing = True
+                    return
+                # Re-check at least every second in case the probe never reports back.
+                self._cond.wait(min(remaining, 1.0) if remaining > 0 else 1.0)
+
+    def success(self) -> None:
+        with self._cond:
+            self.failures = 0
+            if self.opened_at is not None:
+                self.opened_at = None
+                self.probing = False
+                self._cond.notify_all()
+
+    def failure(self) -> bool:
+        """Count a transient failure; True if it (re)opened the circuit."""
+        with self._cond:
+            self.failures += 1
+            tripped = self.opened_at is None and 0 < self.threshold <= self.failures
+            if not (self.probing or tripped):
+                return False
+            self.opened_at = self.clock()
+            self.probing = False
+            self.trips += 1
+            self._cond.notify_all()
+            return True
+
+
+class ApiGuard:
+    def __init__(self, bucket: Optional[TokenBucket] = None, breaker: Optional[CircuitBreaker] = None):
+        self.bucket = bucket or TokenBucket()
+        self.breaker = breaker or CircuitBreaker()
+
+    def before(self) -> None:
+        self.breaker.wait()
+        self.bucket.acquire()
+
+    def success(self) -> None:
+        self.breaker.success()
+
+    def failure(self, exc: Exception) -> Optional[float]:
+        """Record a transient failure; returns the server's Retry-After, if any."""
+        wait = retry_after(exc)
+        if wait is not None:
+            self.bucket.pause(wait)
+        if self.breaker.failure():
+            print(
+                f"[warn] slskd looks unhealthy ({self.breaker.failures} failures in a row); "
+                f"pausing all requests for {self.breaker.cooldown:.0f}s"
+            )
+        return wait
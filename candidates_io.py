@@ -0,0 +1,159 @@
+"""Read and write candidate files as CSV, Parquet or Arrow IPC (Feather).
+
+The format is picked from the file suffix. Columnar formats need pyarrow and
+let each consumer load only the columns it uses.
+"""
+import csv
+from pathlib import Path
+from typing import Dict, Iterator, List, Sequence
+
+COLUMNAR_SUFFIXES = {
+    ".parquet": "parquet",
+    ".pq": "parquet",
+    ".arrow": "arrow",
+    ".feather": "arrow",
+}
+
+
+def candidates_format(path) -> str:
+    return COLUMNAR_SUFFIXES.get(Path(path).suffix.lower(), "csv")
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow  # noqa: F401
+    except Exception as exc:
+        raise SystemExit(
+            "Parquet/Arrow candidate files require pyarrow. Install it: pip install pyarrow"
+        ) from exc
+    return pyarrow
+
+
+def candidates_schema():
+    pa = _require_pyarrow()
+    return pa.schema(
+        [
+            ("artist", pa.string()),
+            ("track", pa.string()),
+            ("bpm", pa.int32()),
+            ("energy", pa.float64()),
+            ("danceability", pa.float64()),
+            ("style", pa.dictionary(pa.int32(), pa.string())),
+            ("label", pa.string()),
+            ("genres", pa.string()),
+            ("search_string", pa.string()),
+        ]
+    )
+
+
+def write_columnar_table(table, path) -> None:
+    _require_pyarrow()
+    if candidates_format(path) == "parquet":
+        import pyarrow.parquet as pq
+
+        pq.write_table(table, str(path))
+    else:
+        import pyarrow.feather as feather
+
+        feather.write_feather(table, str(path))
+
+
+def read_candidate_columns(
+    path, columns: Sequence[str], optional: Sequence[str] = ()
+) -> Dict[str, List]:
+    """Load only the given columns from a candidates file as {column: values}.
+
+    Missing `columns` raise ValueError; missing `optional` columns come back
+    as None values.
+    """
+    fmt = candidates_format(path)
+    wanted = list(columns) + [col for col in optional if col not in columns]
+    if fmt == "csv":
+        with open(path, newline="", encoding="utf-8") as f:
+            reader = csv.DictReader(f)
+            available = reader.fieldnames or []
+            missing = [col for col in columns if col not in available]
+            if missing:
+                raise ValueError(f"{path} must include column(s): {', '.join(missing)}")
+            present = [col for col in wanted if col in available]
+            data: Dict[str, List] = {col: [] for col in present}
+            for row in reader:
+                for col in present:
+                    data[col].append(row[col])
+    else:
+        _require_pyarrow()
+        if fmt == "parquet":
+            import pyarrow.parquet as pq
+
+            available = pq.read_schema(str(path)).names
+        else:
+            import pyarrow.ipc as ipc
+
+            with ipc.open_file(str(path)) as reader:
+                available = reader.schema.names
+        missing = [col for col in columns if col not in available]
+        if missing:
+            raise ValueError(f"{path} must include column(s): {', '.join(missing)}")
+        present = [col for col in wanted if col in available]
+
+        if fmt == "parquet":
+            table = pq.read_table(str(path), columns=present)
+        else:
+            import pyarrow.feather as feather
+
+            table = feather.read_table(str(path), columns=present, memory_map=True)
+        data = {col: table.column(col).to_pylist() for col in present}
+
+    length = len(next(iter(data.values()))) if data else 0
+    for col in wanted:
+        data.setdefault(col, [None] * length)
+    return data
+
+
+def iter_candidate_rows(path, columns: Sequence[str], optional: Sequence[str] = ()) -> Iterator[Dict]:
+    data = read_candidate_columns(path, columns, optional)
+    names = list(data)
+    for values in zip(*(data[col] for col in names)):
+        yield dict(zip(names, values))
+
+
+def write_columnar_from_csv(csv_path, path, styles: Sequence[str]) -> int:
+    """Stream a candidates CSV into Parquet/Arrow batch by batch.
+
+    `styles` is the full set of style values; a fixed dictionary keeps every
+    batch compatible with the Arrow IPC file format.
+    """
+    pa = _require_pyarrow()
+    import pyarrow.compute as pc
+    import pyarrow.csv as pacsv
+
+    schema = candidates_schema()
+    dictionary = pa.array(sorted(styles), type=pa.string())
+    column_types = {
+        field.name: (field.type.value_type if pa.types.is_dictionary(field.type) else field.type)
+        for field in schema
+    }
+    reader = pacsv.open_csv(
+        str(csv_path),
+        convert_options=pacsv.ConvertOptions(column_types=column_types),
+    )
+    if candidates_format(path) == "parquet":
+        import pyarrow.parquet as pq
+
+        writer = pq.ParquetWriter(str(path), schema)
+    else:
+        import pyarrow.ipc as ipc
+
+        writer = ipc.new_file(str(path), schema)
+
+    written = 0
+    with writer:
+        for batch in reader:
+            indices = pc.index_in(batch.column("style"), value_set=dictionary).cast(pa.int32())
+            columns = [
+                pa.DictionaryArray.from_arrays(indices, dictionary) if name == "style" else batch.column(name)
+                for name in schema.names
+            ]
+            writer.write_batch(pa.RecordBatch.from_arrays(columns, schema=schema))
+            written += batch.num_rows
+    return written
@@ -1,8 +1,30 @@
+from __future__ import annotations
+
 import argparse
-import pandas as pd
-import re
+import csv
+import glob
+import heapq
+import os
 import sys
+import tempfile
+import time
 from pathlib import Path
+from typing import TYPE_CHECKING
+
+from style_rules import DEFAULT_CLASSIFIER, StyleClassifier, load_style_rules
+from text_normalize import TRACK_JUNK_PATTERNS, TRACK_JUNK_RE, clean_track_name, primary_artist  # noqa: F401
+from spotify_export import PANDAS_NA_VALUES, canonical_header, iter_export_chunks, load_export
+from candidates_io import (
+    candidates_format,
+    candidates_schema,
+    read_candidate_columns,
+    write_columnar_from_csv,
+    write_columnar_table,
+)
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
 
 
 def _setup_logging() -> None:
@@ -40,54 +62,64 @@ DEFAULT_INPUT_FILE = "spotify_export.csv"
 
 # ---------------- HELPERS ----------------
 
-def clean_track_name(name):
-    junk = [
-        r"\(.*extended.*\)",
-        r"\(.*original.*\)",
-        r"\(.*radio.*\)",
-        r"\(.*remaster.*\)",
-        r"\[.*\]",
-        r"- extended.*",
-        r"- original.*",
-    ]
-    cleaned = str(name)
-    for j in junk:
-        cleaned = re.sub(j, "", cleaned, flags=re.IGNORECASE)
-    return cleaned.strip()
+CANDIDATE_COLUMNS = [
+    "artist",
+    "track",
+    "bpm",
+    "energy",
+    "danceability",
+    "style",
+    "label",
+    "genres",
+    "search_string",
+]
+
 
-def normalize_artist(artist):
-    # Soulseek suele fallar con múltiples artistas
-    return artist.split(";")[0].strip()
+normalize_artist = primary_artist
 
 def infer_style(genres, bpm, energy):
-    g = str(genres).lower()
-
-    if "garage" in g or "break" in g:
-        return "Garage / Breaky"
-    if "minimal" in g or "micro" in g:
-        return "Minimal / Micro"
-    if "tech house" in g:
-        return "Tech House"
-    if "deep" in g or energy < 0.6:
-        return "Deep House"
-    if bpm >= 126 and energy >= 0.65:
-        return "Peak House"
-    return "House / Groovy"
-
-
-def build_candidates_dataframe(df: pd.DataFrame) -> pd.DataFrame:
+    return DEFAULT_CLASSIFIER.classify(genres, bpm, energy)
+
+
+def infer_style_vectorized(
+    genres: pd.Series,
+    bpm: pd.Series,
+    energy: pd.Series,
+    classifier: StyleClassifier | None = None,
+) -> np.ndarray:
+    """Column-wise `infer_style`: same rules, evaluated as boolean masks."""
+    return (classifier or DEFAULT_CLASSIFIER).classify_frame(genres, bpm, energy)
+
+
+def _round_like_builtin(values: pd.Series, ndigits: int) -> np.ndarray:
+    import numpy as np
+
+    # np.round scales by 10**ndigits, which rounds values such as 0.005 the
+    # other way from round(). Only values landing next to .5 after scaling
+    # can disagree, so those few are re-rounded with the builtin.
+    arr = values.to_numpy(dtype=float)
+    out = np.round(arr, ndigits)
+    scaled = arr * (10 ** ndigits)
+    near_half = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    if near_half.any():
+        out[near_half] = [round(v, ndigits) for v in arr[near_half].tolist()]
+    return out
+
+
+def _finalize_candidates(out: pd.DataFrame) -> pd.DataFrame:
+    out.drop_duplicates(subset=["search_string"], inplace=True)
+    out.sort_values(by=["style", "bpm"], inplace=True)
+    return out
+
+
+def build_candidates_dataframe_rowwise(
+    df: pd.DataFrame, classifier: StyleClassifier | None = None
+) -> pd.DataFrame:
+    """Reference row-at-a-time implementation of `build_candidates_dataframe`."""
+    import pandas as pd
+
+    classifier = classifier or DEFAULT_CLASSIFIER
     rows = []
-    columns = [
-        "artist",
-        "track",
-        "bpm",
-        "energy",
-        "danceability",
-        "style",
-        "label",
-        "genres",
-        "search_string",
-    ]
 
     for _, row in df.iterrows():
         artist_raw = row["Artist Name(s)"]
@@ -101,7 +133,7 @@ def build_candidates_dataframe(df: pd.DataFrame) -> pd.DataFrame:
         genres = row["Genres"]
         label = row["Record Label"]
 
-        style = infer_style(genres, bpm, energy)
+        style = classifier.classify(genres, bpm, energy, danceability)
 
         rows.append({
             "artist": artist,
@@ -115,57 +147,607 @@ def build_candidates_dataframe(df: pd.DataFrame) -> pd.DataFrame:
             "search_string": f"{artist} - {track}",
         })
 
-    out = pd.DataFrame(rows, columns=columns)
+    out = pd.DataFrame(rows, columns=CANDIDATE_COLUMNS)
+    return _finalize_candidates(out)
 
-    out.drop_duplicates(subset=["search_string"], inplace=True)
-    out.sort_values(by=["style", "bpm"], inplace=True)
-    return out
+
+def build_candidates_dataframe(
+    df: pd.DataFrame, classifier: StyleClassifier | None = None
+) -> pd.DataFrame:
+    import pandas as pd
+
+    if df.empty:
+        return pd.DataFrame(columns=CANDIDATE_COLUMNS)
+    return _finalize_candidates(candidate_rows(df.reset_index(drop=True), classifier))
 
 
-def default_output_for_input(input_file: str) -> str:
+def candidate_rows(df: pd.DataFrame, classifier: StyleClassifier | None = None) -> pd.DataFrame:
+    """One candidate per export row, aligned with df's index; not deduplicated."""
+    import numpy as np
+    import pandas as pd
+
+    artist = df["Artist Name(s)"].str.split(";", n=1).str[0].str.strip()
+    track = df["Track Name"].astype(str).str.replace(TRACK_JUNK_RE, "", regex=True).str.strip()
+    bpm = pd.Series(np.round(df["Tempo"].to_numpy(dtype=float)).astype("int64"), index=df.index)
+    energy = pd.Series(_round_like_builtin(df["Energy"], 2), index=df.index)
+    danceability = pd.Series(_round_like_builtin(df["Danceability"], 2), index=df.index)
+
+    out = pd.DataFrame(
+        {
+            "artist": artist,
+            "track": track,
+            "bpm": bpm,
+            "energy": energy,
+            "danceability": danceability,
+            "style": pd.Series(
+                (classifier or DEFAULT_CLASSIFIER).classify_frame(df["Genres"], bpm, energy, danceability),
+                index=df.index,
+            ),
+            "label": df["Record Label"],
+            "genres": df["Genres"],
+            "search_string": artist + " - " + track,
+        },
+        columns=CANDIDATE_COLUMNS,
+    )
+    # Match the dtypes pandas infers for the row-wise frame.
+    return out.infer_objects()
+
+
+OUTPUT_SUFFIXES = {"csv": ".csv", "parquet": ".parquet", "arrow": ".arrow"}
+
+
+def default_output_for_input(input_file: str, output_format: str = "csv") -> str:
     input_path = Path(input_file)
-    return str(input_path.with_name(f"{input_path.stem}_dj_candidates.csv"))
+    suffix = OUTPUT_SUFFIXES[output_format]
+    return str(input_path.with_name(f"{input_path.stem}_dj_candidates{suffix}"))
 
 
-def main(input_file: str, output_file: str) -> None:
-    df = pd.read_csv(input_file)
+def candidates_to_arrow(out: pd.DataFrame):
+    """Typed Arrow table: categorical style, int bpm, float energy/danceability."""
+    import pyarrow as pa
 
-    required_columns = [
-        "Artist Name(s)",
-        "Track Name",
-        "Tempo",
-        "Energy",
-        "Danceability",
-        "Genres",
-        "Record Label",
-    ]
-    missing = [col for col in required_columns if col not in df.columns]
+    typed = out[CANDIDATE_COLUMNS].astype(
+        {"bpm": "int32", "energy": "float64", "danceability": "float64", "style": "category"}
+    )
+    return pa.Table.from_pandas(typed, schema=candidates_schema(), preserve_index=False)
+
+
+def write_candidates(out: pd.DataFrame, output_file: str) -> None:
+    if candidates_format(output_file) == "csv":
+        out.to_csv(output_file, index=False)
+        return
+    write_columnar_table(candidates_to_arrow(out), output_file)
+
+
+def read_candidates_frame(path: str) -> pd.DataFrame:
+    import pandas as pd
+
+    if candidates_format(path) == "csv":
+        return pd.read_csv(path, keep_default_na=False, float_precision="round_trip")
+    return pd.DataFrame(read_candidate_columns(path, CANDIDATE_COLUMNS))
+
+
+REQUIRED_COLUMNS = [
+    "Artist Name(s)",
+    "Track Name",
+    "Tempo",
+    "Energy",
+    "Danceability",
+    "Genres",
+    "Record Label",
+]
+TEXT_COLUMNS = ["Artist Name(s)", "Track Name", "Genres", "Record Label"]
+NUMERIC_COLUMNS = ["Tempo", "Energy", "Danceability"]
+def check_required_columns(columns) -> None:
+    missing = [col for col in REQUIRED_COLUMNS if col not in columns]
     if missing:
         raise SystemExit(f"Missing required columns: {', '.join(missing)}")
 
-    df = df.copy()
-    for col in ["Artist Name(s)", "Track Name", "Genres", "Record Label"]:
-        df[col] = df[col].fillna("").astype(str)
 
-    for col in ["Tempo", "Energy", "Danceability"]:
-        df[col] = pd.to_numeric(df[col], errors="coerce")
-        invalid = df[col].isna().sum()
-        if invalid:
-            print(f"⚠️  {invalid} rows have invalid {col}; defaulting to 0")
+def prepare_export_frame(df: pd.DataFrame) -> tuple[pd.DataFrame, dict[str, int]]:
+    """Coerce an export frame in place; returns it with per-issue row counts."""
+    import numpy as np
+    import pandas as pd
+
+    issues: dict[str, int] = {}
+    for col in TEXT_COLUMNS:
+        values = df[col]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            values = values.astype(object)
+        df[col] = values.fillna("").astype(str)
+
+    for col in NUMERIC_COLUMNS:
+        values = pd.to_numeric(df[col], errors="coerce")
+        # inf cannot become an integer BPM; count it as invalid like text.
+        # Adding 0.0 turns -0.0 into 0.0 whether or not the column parsed as int.
+        df[col] = values.where(np.isfinite(values)) + 0.0
+        issues[col] = int(df[col].isna().sum())
         df[col] = df[col].fillna(0)
 
     empty_artist = df["Artist Name(s)"].str.strip() == ""
     empty_track = df["Track Name"].str.strip() == ""
-    if (empty_artist | empty_track).any():
-        dropped = int((empty_artist | empty_track).sum())
-        print(f"⚠️  Dropping {dropped} rows missing artist or track")
-        df = df[~(empty_artist | empty_track)]
+    missing = empty_artist | empty_track
+    issues["dropped"] = int(missing.sum())
+    if issues["dropped"]:
+        df = df[~missing]
+    return df, issues
+
+
+def report_export_issues(issues: dict[str, int]) -> None:
+    for col in NUMERIC_COLUMNS:
+        if issues.get(col):
+            print(f"⚠️  {issues[col]} rows have invalid {col}; defaulting to 0")
+    if issues.get("dropped"):
+        print(f"⚠️  Dropping {issues['dropped']} rows missing artist or track")
+
+
+# ---------------- FAST ENGINE ----------------
+# csv-module engine for small exports: skips the pandas import entirely and
+# writes the same bytes as the pandas path.
+
+ENGINES = ("auto", "csv", "pandas")
+FAST_ENGINE_MAX_ROWS = 5000
+
+
+def _parse_number(raw: str) -> float | None:
+    """float() restricted to what pandas parses; None for missing/invalid cells."""
+    if raw in PANDAS_NA_VALUES or not raw.isascii() or "_" in raw:
+        return None
+    try:
+        value = float(raw)
+    except ValueError:
+        return None
+    if value != value or value in (float("inf"), float("-inf")):
+        return None
+    return value + 0.0
+
+
+def read_export_rows(input_file: str, max_rows: int | None = None) -> tuple[list[str], list[list[str]] | None]:
+    """Header and data rows via the csv module; rows is None past max_rows."""
+    with open(input_file, newline="", encoding="utf-8-sig") as f:
+        reader = csv.reader(f)
+        header = canonical_header(next(reader, []))
+        rows = []
+        for row in reader:
+            if not row:
+                continue
+            rows.append(row)
+            if max_rows is not None and len(rows) > max_rows:
+                return header, None
+    return header, rows
+
+
+def build_candidate_records(
+    header: list[str], rows: list[list[str]], classifier: StyleClassifier | None = None
+) -> tuple[list[list], dict[str, int]]:
+    """Pure-Python `prepare_export_frame` + `build_candidates_dataframe`."""
+    classifier = classifier or DEFAULT_CLASSIFIER
+    positions = {}
+    for idx, name in enumerate(header):
+        positions.setdefault(name, idx)
+    text_idx = [positions[col] for col in TEXT_COLUMNS]
+    num_idx = [positions[col] for col in NUMERIC_COLUMNS]
+    width = len(header)
+    issues = {col: 0 for col in NUMERIC_COLUMNS}
+    issues["dropped"] = 0
+
+    records = []
+    seen = set()
+    for row in rows:
+        if len(row) < width:
+            row = row + [""] * (width - len(row))
+        artist_raw, track_raw, genres, label = (
+            "" if row[i] in PANDAS_NA_VALUES else row[i] for i in text_idx
+        )
+        numbers = []
+        for col, i in zip(NUMERIC_COLUMNS, num_idx):
+            value = _parse_number(row[i])
+            if value is None:
+                issues[col] += 1
+                value = 0.0
+            numbers.append(value)
+        if not artist_raw.strip() or not track_raw.strip():
+            issues["dropped"] += 1
+            continue
+
+        artist = primary_artist(artist_raw)
+        track = clean_track_name(track_raw)
+        search_string = f"{artist} - {track}"
+        if search_string in seen:
+            continue
+        seen.add(search_string)
+        bpm = round(numbers[0])
+        energy = round(numbers[1], 2)
+        danceability = round(numbers[2], 2)
+        style = classifier.classify(genres, bpm, energy, danceability)
+        records.append([artist, track, bpm, energy, danceability, style, label, genres, search_string])
+
+    style_idx = CANDIDATE_COLUMNS.index("style")
+    bpm_idx = CANDIDATE_COLUMNS.index("bpm")
+    records.sort(key=lambda r: (r[style_idx], r[bpm_idx]))
+    return records, issues
+
+
+def write_candidate_records(records: list[list], output_file: str) -> None:
+    with open(output_file, "w", newline="", encoding="utf-8") as out:
+        writer = csv.writer(out, lineterminator=os.linesep)
+        writer.writerow(CANDIDATE_COLUMNS)
+        writer.writerows(records)
+
+
+class HashedSeenSet:
+    """Membership set of 64-bit hashes kept in one sorted uint64 array."""
+
+    def __init__(self) -> None:
+        import numpy as np
+
+        self._hashes = np.empty(0, dtype=np.uint64)
+
+    def __len__(self) -> int:
+        return len(self._hashes)
+
+    def add_new(self, values: pd.Series) -> np.ndarray:
+        """Add unseen values; returns a mask of the ones that were new."""
+        import numpy as np
+        import pandas as pd
+
+        hashes = pd.util.hash_pandas_object(values, index=False).to_numpy()
+        if not len(self._hashes):
+            found = np.zeros(len(hashes), dtype=bool)
+        else:
+            pos = np.searchsorted(self._hashes, hashes)
+            found = self._hashes[np.minimum(pos, len(self._hashes) - 1)] == hashes
+        fresh = np.sort(hashes[~found])
+        self._hashes = np.insert(self._hashes, np.searchsorted(self._hashes, fresh), fresh)
+        return ~found
+
+
+def merge_sorted_runs(run_paths: list[Path], output_file: str) -> int:
+    """K-way merge of candidate runs already sorted by style, bpm."""
+    style_idx = CANDIDATE_COLUMNS.index("style")
+    bpm_idx = CANDIDATE_COLUMNS.index("bpm")
+    handles = [path.open(newline="", encoding="utf-8") for path in run_paths]
+    written = 0
+    try:
+        readers = []
+        for handle in handles:
+            reader = csv.reader(handle)
+            next(reader, None)
+            readers.append(reader)
+        with open(output_file, "w", newline="", encoding="utf-8") as out:
+            # Same dialect pandas uses for to_csv, so output is unchanged.
+            writer = csv.writer(out, lineterminator=os.linesep)
+            writer.writerow(CANDIDATE_COLUMNS)
+            # heapq.merge is stable across runs, matching a stable sort.
+            for row in heapq.merge(*readers, key=lambda r: (r[style_idx], int(r[bpm_idx]))):
+                writer.writerow(row)
+                written += 1
+    finally:
+        for handle in handles:
+            handle.close()
+    return written
+
+
+def stream_candidates(
+    input_file: str,
+    output_file: str,
+    chunksize: int,
+    classifier: StyleClassifier | None = None,
+) -> int:
+    """Chunked variant of main(): bounded memory, same output file."""
+    seen = HashedSeenSet()
+    styles: set[str] = set()
+    issues: dict[str, int] = {}
+    with tempfile.TemporaryDirectory(prefix="dj_candidates_") as tmp_dir:
+        run_paths: list[Path] = []
+        for i, chunk in enumerate(iter_export_chunks(input_file, REQUIRED_COLUMNS, chunksize)):
+            if i == 0:
+                check_required_columns(chunk.columns)
+            chunk, chunk_issues = prepare_export_frame(chunk)
+            for key, count in chunk_issues.items():
+                issues[key] = issues.get(key, 0) + count
+            if i == 0:
+                print("📄 Columnas detectadas:")
+                print(chunk.columns.tolist())
+
+            out = build_candidates_dataframe(chunk, classifier)
+            out = out[seen.add_new(out["search_string"])]
+            if out.empty:
+                continue
+            styles.update(out["style"].unique().tolist())
+            run_path = Path(tmp_dir) / f"run_{i:05d}.csv"
+            out.to_csv(run_path, index=False)
+            run_paths.append(run_path)
+
+        report_export_issues(issues)
+        if candidates_format(output_file) == "csv":
+            return merge_sorted_runs(run_paths, output_file)
+        merged_csv = Path(tmp_dir) / "merged.csv"
+        merge_sorted_runs(run_paths, str(merged_csv))
+        return write_columnar_from_csv(merged_csv, output_file, styles)
+
+
+MANIFEST_COLUMNS = ["track_uri", "row_hash", "search_string"]
+
+
+def default_manifest_for_output(output_file: str) -> str:
+    output_path = Path(output_file)
+    return str(output_path.with_name(f"{output_path.stem}_manifest.csv"))
+
+
+def default_delta_for_output(output_file: str) -> str:
+    output_path = Path(output_file)
+    return str(output_path.with_name(f"{output_path.stem}_delta{output_path.suffix or '.csv'}"))
+
+
+def row_hashes(df: pd.DataFrame, salt: str = "") -> pd.Series:
+    # The salt (style rules signature) invalidates rows when the rules change.
+    import pandas as pd
+
+    hashes = pd.util.hash_pandas_object(df[REQUIRED_COLUMNS].assign(_salt=salt), index=False)
+    return pd.Series([format(h, "016x") for h in hashes.tolist()], index=df.index, dtype=object)
+
+
+def load_manifest(manifest_file: str) -> pd.DataFrame:
+    import pandas as pd
+
+    path = Path(manifest_file)
+    if not path.exists():
+        return pd.DataFrame(columns=MANIFEST_COLUMNS, dtype=object)
+    manifest = pd.read_csv(path, dtype=str, keep_default_na=False)
+    missing = [col for col in MANIFEST_COLUMNS if col not in manifest.columns]
+    if missing:
+        raise SystemExit(f"Manifest {manifest_file} is missing columns: {', '.join(missing)}")
+    return manifest[MANIFEST_COLUMNS]
+
+
+def incremental_candidates(
+    input_file: str,
+    output_file: str,
+    manifest_file: str,
+    delta_file: str,
+    classifier: StyleClassifier | None = None,
+) -> dict[str, int]:
+    """Rebuild the candidates file reusing rows whose Track URI and hash are unchanged."""
+    import pandas as pd
+
+    df = load_export(input_file, REQUIRED_COLUMNS, optional=["Track URI"])
+    check_required_columns(df.columns)
+    if "Track URI" not in df.columns:
+        raise SystemExit("Incremental mode requires a 'Track URI' column in the export")
+
+    df, issues = prepare_export_frame(df)
+    report_export_issues(issues)
+    df = df.reset_index(drop=True)
+
+    uris = df["Track URI"].fillna("").astype(str).str.strip()
+    classifier = classifier or DEFAULT_CLASSIFIER
+    hashes = row_hashes(df, classifier.signature)
+
+    if Path(output_file).exists():
+        previous = load_manifest(manifest_file).drop_duplicates(subset=["track_uri"])
+        existing = read_candidates_frame(output_file)
+        missing = [col for col in CANDIDATE_COLUMNS if col not in existing.columns]
+        if missing:
+            raise SystemExit(f"Existing output {output_file} is missing columns: {', '.join(missing)}")
+        existing = existing.drop_duplicates(subset=["search_string"]).set_index("search_string", drop=False)
+    else:
+        previous = pd.DataFrame(columns=MANIFEST_COLUMNS, dtype=object)
+        existing = pd.DataFrame(columns=CANDIDATE_COLUMNS).set_index("search_string", drop=False)
+
+    previous = previous.set_index("track_uri")
+    prev_hash = uris.map(previous["row_hash"])
+    prev_search = uris.map(previous["search_string"])
+    # A stored row is only reusable when exactly one URI produced it;
+    # otherwise dedup order decides which row's values survive.
+    shared = previous["search_string"].value_counts()
+    reuse = (
+        (uris != "")
+        & (prev_hash == hashes)
+        & prev_search.map(shared).eq(1)
+        & prev_search.isin(existing.index)
+    )
+
+    fresh = candidate_rows(df[~reuse], classifier) if (~reuse).any() else pd.DataFrame(columns=CANDIDATE_COLUMNS)
+    reused = existing.loc[prev_search[reuse], CANDIDATE_COLUMNS]
+    reused.index = df.index[reuse]
+    combined = pd.concat([frame for frame in (fresh, reused) if not frame.empty]) if len(df) else fresh
+    combined = combined.sort_index()
+
+    manifest = pd.DataFrame(
+        {
+            "track_uri": uris,
+            "row_hash": hashes,
+            "search_string": combined["search_string"].reindex(df.index),
+        },
+        columns=MANIFEST_COLUMNS,
+    )
+    manifest = manifest[manifest["track_uri"] != ""].drop_duplicates(subset=["track_uri"])
+
+    out = _finalize_candidates(combined[CANDIDATE_COLUMNS].copy())
+    delta = out[~out["search_string"].isin(existing.index)]
+
+    write_candidates(out, output_file)
+    write_candidates(delta, delta_file)
+    manifest.to_csv(manifest_file, index=False)
+    return {
+        "total": len(out),
+        "reused": int(reuse.sum()),
+        "recomputed": int((~reuse).sum()),
+        "new": len(delta),
+    }
+
+
+GENERATED_STEM_SUFFIXES = ("_dj_candidates", "_manifest", "_delta")
+
+
+def resolve_batch_inputs(pattern: str) -> list[Path]:
+    """Export files for --batch: every *.csv in a directory, or a glob match."""
+    path = Path(pattern).expanduser()
+    if path.is_dir():
+        matches = sorted(path.glob("*.csv"))
+    else:
+        matches = sorted(Path(p) for p in glob.glob(str(path)))
+    # Skip outputs of earlier runs that live next to the exports.
+    return [
+        p for p in matches
+        if p.is_file() and not p.stem.endswith(GENERATED_STEM_SUFFIXES)
+    ]
+
+
+def default_merged_output(pattern: str, output_format: str = "csv") -> str:
+    path = Path(pattern).expanduser()
+    directory = path if path.is_dir() else path.parent
+    return str(directory / f"merged_dj_candidates{OUTPUT_SUFFIXES[output_format]}")
+
+
+def process_export(input_file: str, output_file: str, style_rules: str | None = None) -> dict:
+    """Batch worker: one export to one candidates file, without printing."""
+    started = time.perf_counter()
+    classifier = load_style_rules(style_rules)
+    df = load_export(input_file, REQUIRED_COLUMNS)
+    check_required_columns(df.columns)
+    rows = len(df)
+    df, issues = prepare_export_frame(df)
+    out = build_candidates_dataframe(df, classifier)
+    write_candidates(out, output_file)
+    return {
+        "input": input_file,
+        "output": output_file,
+        "rows": rows,
+        "candidates": len(out),
+        "issues": issues,
+        "seconds": time.perf_counter() - started,
+    }
+
+
+def run_batch(
+    inputs: list[Path],
+    merged_output: str,
+    output_format: str = "csv",
+    workers: int | None = None,
+    style_rules: str | None = None,
+) -> list[dict]:
+    """Process many exports in a process pool and merge them into one file."""
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    import pandas as pd
+
+    jobs = [
+        (str(path), default_output_for_input(str(path), output_format), style_rules)
+        for path in inputs
+    ]
+    started = time.perf_counter()
+    results: dict[str, dict] = {}
+    failures: dict[str, str] = {}
+    workers = max(1, min(workers or os.cpu_count() or 1, len(jobs)))
+    if workers == 1:
+        for job in jobs:
+            input_file = job[0]
+            try:
+                results[input_file] = process_export(*job)
+            except (Exception, SystemExit) as exc:
+                failures[input_file] = str(exc)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(process_export, *job): job[0] for job in jobs}
+            for future in as_completed(futures):
+                input_file = futures[future]
+                try:
+                    results[input_file] = future.result()
+                except (Exception, SystemExit) as exc:
+                    failures[input_file] = str(exc)
+    wall = time.perf_counter() - started
+
+    ordered = [results[job[0]] for job in jobs if job[0] in results]
+    print(f"{'seconds':>8}  {'rows':>8}  {'candidates':>10}  file")
+    for result in ordered:
+        print(
+            f"{result['seconds']:8.2f}  {result['rows']:8d}  {result['candidates']:10d}  {result['input']}"
+        )
+        report_export_issues(result["issues"])
+    for input_file, error in failures.items():
+        print(f"❌ {input_file}: {error}")
+
+    # Merge in input order so the first playlist wins on duplicate search strings.
+    frames = [read_candidates_frame(result["output"]) for result in ordered]
+    frames = [frame for frame in frames if not frame.empty]
+    merged = (
+        _finalize_candidates(pd.concat(frames, ignore_index=True))
+        if frames
+        else pd.DataFrame(columns=CANDIDATE_COLUMNS)
+    )
+    write_candidates(merged, merged_output)
+
+    busy = sum(result["seconds"] for result in ordered)
+    print(
+        f"⏱️  {len(ordered)} files in {wall:.2f}s with {workers} workers "
+        f"(sum of per-file time {busy:.2f}s)"
+    )
+    print(f"✅ Generado {merged_output}")
+    print(f"🎧 Tracks procesados: {len(merged)}")
+    return ordered
+
+
+def main(
+    input_file: str,
+    output_file: str,
+    chunksize: int | None = None,
+    incremental: bool = False,
+    manifest_file: str | None = None,
+    delta_file: str | None = None,
+    style_rules: str | None = None,
+    engine: str = "auto",
+) -> None:
+    try:
+        classifier = load_style_rules(style_rules)
+    except ValueError as exc:
+        raise SystemExit(f"Invalid style rules: {exc}") from exc
+
+    if incremental:
+        if chunksize:
+            raise SystemExit("--incremental cannot be combined with --chunksize")
+        manifest_file = manifest_file or default_manifest_for_output(output_file)
+        delta_file = delta_file or default_delta_for_output(output_file)
+        stats = incremental_candidates(input_file, output_file, manifest_file, delta_file, classifier)
+        print(f"♻️  Rows reused: {stats['reused']}, rows recomputed: {stats['recomputed']}")
+        print(f"✅ Generado {output_file}")
+        print(f"🎧 Tracks procesados: {stats['total']}")
+        print(f"🆕 Nuevos candidatos: {stats['new']} -> {delta_file}")
+        return
+
+    if chunksize:
+        processed = stream_candidates(input_file, output_file, chunksize, classifier)
+        print(f"✅ Generado {output_file}")
+        print(f"🎧 Tracks procesados: {processed}")
+        return
+
+    if engine == "csv" and candidates_format(output_file) != "csv":
+        raise SystemExit("--engine csv only writes CSV output; use --engine pandas for Parquet/Arrow")
+    if engine != "pandas" and candidates_format(output_file) == "csv":
+        header, rows = read_export_rows(input_file, None if engine == "csv" else FAST_ENGINE_MAX_ROWS)
+        if rows is not None:
+            check_required_columns(header)
+            records, issues = build_candidate_records(header, rows, classifier)
+            report_export_issues(issues)
+            print("📄 Columnas detectadas:")
+            print(REQUIRED_COLUMNS)
+            write_candidate_records(records, output_file)
+            print(f"✅ Generado {output_file}")
+            print(f"🎧 Tracks procesados: {len(records)}")
+            return
+
+    df = load_export(input_file, REQUIRED_COLUMNS)
+    check_required_columns(df.columns)
+
+    df, issues = prepare_export_frame(df)
+    report_export_issues(issues)
 
     print("📄 Columnas detectadas:")
     print(df.columns.tolist())
 
-    out = build_candidates_dataframe(df)
-    out.to_csv(output_file, index=False)
+    out = build_candidates_dataframe(df, classifier)
+    write_candidates(out, output_file)
 
     print(f"✅ Generado {output_file}")
     print(f"🎧 Tracks procesados: {len(out)}")
@@ -178,8 +760,90 @@ if __name__ == "__main__":
     parser.add_argument(
         "--output",
         default=None,
-        help="Path to output CSV (default: <input_stem>_dj_candidates.csv)",
+        help="Path to output file; .parquet/.arrow write columnar files (default: <input_stem>_dj_candidates.csv)",
+    )
+    parser.add_argument(
+        "--format",
+        choices=sorted(OUTPUT_SUFFIXES),
+        default="csv",
+        help="Output format when --output is not given (parquet/arrow need pyarrow)",
+    )
+    parser.add_argument(
+        "--chunksize",
+        type=int,
+        default=None,
+        help="Stream the export in chunks of N rows to bound memory on very large files",
+    )
+    parser.add_argument(
+        "--engine",
+        choices=ENGINES,
+        default="auto",
+        help=f"csv skips importing pandas; auto uses it for CSV output up to {FAST_ENGINE_MAX_ROWS} rows",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only reprocess rows whose Track URI is new or changed since the last run",
+    )
+    parser.add_argument(
+        "--manifest",
+        default=None,
+        help="Incremental manifest path (default: <output_stem>_manifest.csv)",
+    )
+    parser.add_argument(
+        "--delta-output",
+        default=None,
+        help="CSV of candidates new in this run (default: <output_stem>_delta.csv)",
+    )
+    parser.add_argument(
+        "--style-rules",
+        default=None,
+        help="JSON style rule table (default: built-in house/techno rules)",
+    )
+    parser.add_argument(
+        "--batch",
+        default=None,
+        help="Directory or glob of exports to process in parallel (one candidates file each plus a merged file)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes for --batch (default: CPU count)",
+    )
+    parser.add_argument(
+        "--merged-output",
+        default=None,
+        help="Merged candidates for --batch (default: merged_dj_candidates.csv next to the exports)",
     )
     args = parser.parse_args()
-    output_file = args.output or default_output_for_input(args.input)
-    main(args.input, output_file)
+    if args.batch:
+        if args.incremental or args.chunksize:
+            raise SystemExit("--batch cannot be combined with --incremental or --chunksize")
+        inputs = resolve_batch_inputs(args.batch)
+        if not inputs:
+            raise SystemExit(f"No exports found for --batch {args.batch}")
+        merged_output = args.merged_output or default_merged_output(args.batch, args.format)
+        try:
+            load_style_rules(args.style_rules)
+        except ValueError as exc:
+            raise SystemExit(f"Invalid style rules: {exc}") from exc
+        run_batch(
+            inputs,
+            merged_output,
+            output_format=args.format,
+            workers=args.workers,
+            style_rules=args.style_rules,
+        )
+    else:
+        output_file = args.output or default_output_for_input(args.input, args.format)
+        main(
+            args.input,
+            output_file,
+            chunksize=args.chunksize,
+            incremental=args.incremental,
+            manifest_file=args.manifest,
+            delta_file=args.delta_output,
+            style_rules=args.style_rules,
+            engine=args.engine,
+        )
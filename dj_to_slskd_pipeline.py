@@ -1,13 +1,16 @@
 #!/usr/bin/env python3
 import argparse
-import csv
+import heapq
 import os
 import random
 import sys
+import threading
 import time
 import uuid
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import islice
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
 
 import typing
 import requests
@@ -25,11 +28,67 @@ if not hasattr(typing, "NotRequired"):
 
 import slskd_api
 
+from api_guard import (
+    DEFAULT_BURST,
+    DEFAULT_COOLDOWN,
+    DEFAULT_FAILURE_THRESHOLD,
+    DEFAULT_RATE,
+    ApiGuard,
+    CircuitBreaker,
+    TokenBucket,
+)
+from candidates_io import read_candidate_columns
+from json_stream import iter_json_array
+from library_index import OwnedIndex
+from peer_reputation import DEFAULT_HALF_LIFE_DAYS, PeerReputation
+from run_journal import (
+    COMPLETED,
+    FAILED,
+    NO_RESULTS,
+    QUEUED,
+    SEARCHING,
+    RunJournal,
+    default_journal_for_csv,
+)
+from search_cache import DEFAULT_TTL_HOURS, SearchCache
+
 DEFAULT_HOST = "http://localhost:5030"
 DEFAULT_URL_BASE = "/api/v0"
 DEFAULT_RETRIES = int(os.getenv("SLSKD_RETRY_ATTEMPTS", "3"))
 DEFAULT_RETRY_BACKOFF = float(os.getenv("SLSKD_RETRY_BACKOFF", "0.5"))
 DEFAULT_RETRY_MAX_DELAY = float(os.getenv("SLSKD_RETRY_MAX_DELAY", "8"))
+DEFAULT_API_RATE = float(os.getenv("SLSKD_API_RATE", str(DEFAULT_RATE)))
+DEFAULT_CONCURRENCY = int(os.getenv("SLSKD_CONCURRENCY", "4"))
+DEFAULT_SETTLE_MS = int(os.getenv("SLSKD_SETTLE_MS", "6000"))
+DEFAULT_CACHE_PATH = os.getenv("SLSKD_SEARCH_CACHE", "slskd_search_cache.sqlite")
+DEFAULT_OWNED_INDEX = os.getenv("INTELLIDJ_OWNED_INDEX", "owned_tracks_index.json")
+DEFAULT_PEER_DB = os.getenv("SLSKD_PEER_DB", "slskd_peers.sqlite")
+DEFAULT_ENQUEUE_BATCH = int(os.getenv("SLSKD_ENQUEUE_BATCH", "10"))
+DEFAULT_TOP_K = int(os.getenv("SLSKD_TOP_K", "5"))
+# Ranking: penalties for lossy low-bitrate and preview-length files, and peer
+# terms (free upload slot, queue length, upload speed in bytes/s).
+LOW_BITRATE_KBPS = 192
+LOW_BITRATE_PENALTY = 40
+SHORT_TRACK_SECONDS = 60
+SHORT_TRACK_PENALTY = 80
+FREE_SLOT_BONUS = 40
+QUEUE_PENALTY_PER_ITEM = 2
+QUEUE_PENALTY_MAX = 60
+SPEED_BONUS_MAX = 20
+SPEED_BONUS_FULL = 1_000_000
+DEFAULT_ENQUEUE_WAIT_MS = int(os.getenv("SLSKD_ENQUEUE_WAIT_MS", "5000"))
+# Search polling: first delay, growth factor and ceiling (seconds).
+POLL_INITIAL_DELAY = 0.5
+POLL_BACKOFF = 1.5
+POLL_MAX_DELAY = 4.0
+# Bytes read at a time when streaming a search's responses.
+STREAM_CHUNK_SIZE = 64 * 1024
+# --bulk-poll: max age (seconds) of the shared searches listing.
+BULK_POLL_INTERVAL = 1.0
+
+# Shared by every retry_with_backoff call; main() replaces it with one built
+# from the command line.
+API_GUARD = ApiGuard()
 
 
 def _setup_logging() -> None:
@@ -113,64 +172,241 @@ def retry_with_backoff(
     base_delay: float = DEFAULT_RETRY_BACKOFF,
     max_delay: float = DEFAULT_RETRY_MAX_DELAY,
     should_retry=_should_retry_http,
+    guard: Optional[ApiGuard] = None,
 ):
+    """Call `func`, retrying transient failures with exponential jitter.
+
+    Every attempt goes through `guard` (default: the run-wide API_GUARD), so
+    all workers share one rate limit and circuit breaker. A Retry-After on
+    the error replaces the computed delay.
+    """
+    guard = API_GUARD if guard is None else guard
     attempt = 0
     while True:
+        guard.before()
         try:
-            return func()
+            result = func()
         except Exception as exc:
-            if attempt >= retries or (should_retry and not should_retry(exc)):
+            transient = not should_retry or should_retry(exc)
+            if not transient:
+                # slskd answered (e.g. 404): it is healthy even if the call failed.
+                guard.success()
+                raise
+            server_delay = guard.failure(exc)
+            if attempt >= retries:
                 raise
-            delay = min(max_delay, base_delay * (2 ** attempt))
-            delay += random.uniform(0, base_delay)
+            if server_delay is not None:
+                delay = server_delay
+            else:
+                delay = min(max_delay, base_delay * (2 ** attempt))
+                delay += random.uniform(0, base_delay)
             print(f"[warn] {label} failed ({exc}); retrying in {delay:.1f}s")
             time.sleep(delay)
             attempt += 1
+        else:
+            guard.success()
+            return result
+
+
+def build_session(api_key: str, pool_size: int) -> requests.Session:
+    """One keep-alive connection pool for every slskd REST call.
 
+    Like slskd_api's own session, error statuses raise HTTPError.
+    """
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=2, pool_maxsize=max(1, pool_size))
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({"accept": "*/*", "X-API-Key": api_key})
+    session.hooks["response"].append(lambda r, *args, **kwargs: r.raise_for_status())
+    return session
 
-def fetch_search_responses(base_url: str, api_key: str, search_id: str) -> List[Dict]:
+
+def share_session(slskd, session: requests.Session) -> None:
+    """Make every slskd_api endpoint group send its requests through `session`."""
+    for api in vars(slskd).values():
+        if hasattr(api, "session"):
+            api.session = session
+
+
+def fetch_search_responses(
+    base_url: str,
+    api_key: str,
+    search_id: str,
+    session: Optional[requests.Session] = None,
+    top_k: Optional[int] = None,
+    priors: Optional[Dict[str, float]] = None,
+) -> List[Dict]:
+    """A search's responses from the REST endpoint.
+
+    With `top_k`, the body is streamed and only the top_k files (see
+    stream_top_responses) are kept, instead of decoding it all at once.
+    """
     url = f"{base_url}/api/v0/searches/{search_id}/responses"
     headers = {"X-API-KEY": api_key}
-    r = retry_with_backoff(
-        lambda: requests.get(url, headers=headers, timeout=10),
-        label="requests.get search_responses",
-    )
+    http = session or requests
+    stream = top_k is not None
+    try:
+        r = retry_with_backoff(
+            lambda: http.get(url, headers=headers, timeout=10, stream=stream),
+            label="requests.get search_responses",
+        )
+    except requests.HTTPError as exc:
+        # Raised by the shared session's status hook.
+        if exc.response is not None and exc.response.status_code == 404:
+            return []
+        raise
     if r.status_code == 404:
         return []
     r.raise_for_status()
+    if stream:
+        try:
+            return stream_top_responses(r.iter_content(chunk_size=STREAM_CHUNK_SIZE), top_k, priors)
+        finally:
+            r.close()
     data = r.json()
     return data if isinstance(data, list) else []
 
 
 def load_search_strings(csv_path: str, limit: int | None) -> List[str]:
-    with open(csv_path, newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        if "search_string" not in reader.fieldnames:
-            raise ValueError("CSV must include a 'search_string' column")
-        rows = [row["search_string"].strip() for row in reader if row.get("search_string")]
+    # Only the search_string column is loaded (CSV, Parquet or Arrow input).
+    try:
+        data = read_candidate_columns(csv_path, ["search_string"])
+    except ValueError as exc:
+        raise ValueError("CSV must include a 'search_string' column") from exc
+    rows = [value.strip() for value in data["search_string"] if value]
     if limit is not None:
         return rows[:limit]
     return rows
 
 
-def score_file(file_info: Dict) -> Tuple[int, int]:
+def load_candidate_isrcs(csv_path: str) -> Dict[str, str]:
+    """search_string -> ISRC for candidates files that carry an isrc column."""
+    data = read_candidate_columns(csv_path, ["search_string"], optional=["isrc", "ISRC"])
+    isrcs = data.get("isrc") or data.get("ISRC") or []
+    return {
+        (query or "").strip(): isrc
+        for query, isrc in zip(data["search_string"], isrcs)
+        if query and isrc
+    }
+
+
+def drop_owned(
+    searches: List[str], owned: OwnedIndex, isrcs: Optional[Dict[str, str]] = None
+) -> Tuple[List[str], List[str]]:
+    """Split searches into (still to search, already owned)."""
+    isrcs = isrcs or {}
+    keep, dropped = [], []
+    for query in searches:
+        (dropped if owned.owns(query, isrcs.get(query)) else keep).append(query)
+    return keep, dropped
+
+
+def _number(value) -> float:
+    try:
+        return float(value or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def score_file(file_info: Dict, peer: Optional[Dict] = None, prior: float = 0.0) -> Tuple[float, int]:
+    """(score, size) of one file; `peer` is the response it came from.
+
+    Format first (FLAC, then MP3, 320 kbps), minus penalties for low
+    bitrates and preview-length files, plus the peer's free upload slot and
+    speed minus its queue length, plus `prior` (the peer's reputation).
+    Attributes slskd does not report count as neutral. rank_files computes
+    the same score vectorized.
+    """
     name = str(file_info.get("filename", "")).lower()
     ext = str(file_info.get("extension", "")).lower()
     size = int(file_info.get("size") or 0)
+    bitrate = _number(file_info.get("bitRate"))
+    length = _number(file_info.get("length"))
 
-    score = 0
+    score = 0.0
     if name.endswith(".flac") or ext == "flac":
         score += 100
     if "flac" in name:
         score += 20
     if name.endswith(".mp3") or ext == "mp3":
         score += 5
-    if "320" in name:
+    if "320" in name or bitrate >= 320:
         score += 10
+    if 0 < bitrate < LOW_BITRATE_KBPS:
+        score -= LOW_BITRATE_PENALTY
+    if 0 < length < SHORT_TRACK_SECONDS:
+        score -= SHORT_TRACK_PENALTY
+
+    if peer:
+        if peer.get("hasFreeUploadSlot") is True:
+            score += FREE_SLOT_BONUS
+        score -= min(_number(peer.get("queueLength")) * QUEUE_PENALTY_PER_ITEM, QUEUE_PENALTY_MAX)
+        score += min(_number(peer.get("uploadSpeed")) / SPEED_BONUS_FULL, 1.0) * SPEED_BONUS_MAX
+    score += prior
 
     return score, size
 
 
+def _float_column(items: List[Dict], key: str):
+    import numpy as np
+
+    values = [item.get(key) or 0 for item in items]
+    try:
+        return np.array(values, dtype=float)
+    except (TypeError, ValueError):
+        return np.array([_number(value) for value in values])
+
+
+def score_responses(responses: List[Dict], priors: Optional[Dict[str, float]] = None):
+    """Vectorized score_file over every file of every response.
+
+    `priors` maps usernames to their reputation prior. Returns (pairs,
+    scores, sizes): the (user, file) pairs in response order and numpy
+    arrays aligned with them. Responses without a username are skipped.
+    """
+    import numpy as np
+
+    pairs = []
+    peers = []
+    counts = []
+    for response in responses:
+        username = response.get("username")
+        if not username:
+            continue
+        files = iter_files(response)
+        pairs.extend((username, f) for f in files)
+        peers.append(response)
+        counts.append(len(files))
+    if not pairs:
+        return pairs, np.zeros(0), np.zeros(0, dtype=np.int64)
+
+    files = [f for _, f in pairs]
+    names = np.array([str(f.get("filename", "")).lower() for f in files])
+    exts = np.array([str(f.get("extension", "")).lower() for f in files])
+    sizes = _float_column(files, "size").astype(np.int64)
+    bitrate = _float_column(files, "bitRate")
+    length = _float_column(files, "length")
+    # Peer attributes once per response, repeated for each of its files.
+    free_slot = np.repeat([peer.get("hasFreeUploadSlot") is True for peer in peers], counts)
+    queue = np.repeat(_float_column(peers, "queueLength"), counts)
+    speed = np.repeat(_float_column(peers, "uploadSpeed"), counts)
+
+    scores = np.zeros(len(pairs))
+    scores += 100 * (np.char.endswith(names, ".flac") | (exts == "flac"))
+    scores += 20 * (np.char.find(names, "flac") >= 0)
+    scores += 5 * (np.char.endswith(names, ".mp3") | (exts == "mp3"))
+    scores += 10 * ((np.char.find(names, "320") >= 0) | (bitrate >= 320))
+    scores -= LOW_BITRATE_PENALTY * ((bitrate > 0) & (bitrate < LOW_BITRATE_KBPS))
+    scores -= SHORT_TRACK_PENALTY * ((length > 0) & (length < SHORT_TRACK_SECONDS))
+    scores += FREE_SLOT_BONUS * free_slot
+    scores -= np.minimum(queue * QUEUE_PENALTY_PER_ITEM, QUEUE_PENALTY_MAX)
+    scores += np.minimum(speed / SPEED_BONUS_FULL, 1.0) * SPEED_BONUS_MAX
+    if priors:
+        scores += np.repeat([priors.get(peer["username"], 0.0) for peer in peers], counts)
+    return pairs, scores, sizes
+
+
 def normalize_responses(raw) -> List[Dict]:
     if raw is None:
         return []
@@ -194,39 +430,827 @@ def iter_files(response: Dict) -> List[Dict]:
     return []
 
 
-def pick_best_file(responses: List[Dict]) -> Tuple[str, Dict] | Tuple[None, None]:
-    best_user = None
-    best_file = None
-    best_score = (-1, -1)
+def stream_top_responses(
+    chunks: Iterable[bytes], top_k: int, priors: Optional[Dict[str, float]] = None
+) -> List[Dict]:
+    """Responses from a streamed JSON array, pruned to their top_k files.
 
-    for response in responses:
-        username = response.get("username")
+    Each response is scored as it is decoded and only a heap of the top_k
+    files survives, so memory stays flat however many peers answer. The
+    result keeps the original response and file order, so rank_files ranks
+    it exactly like the full list.
+    """
+    heap: List[Tuple] = []  # (score, size, -position, peer index, file): min-heap of the best
+    peers: List[Dict] = []
+    position = 0
+    for response in iter_json_array(chunks):
+        if not isinstance(response, dict) or not response.get("username"):
+            continue
         files = iter_files(response)
-        for f in files:
-            score = score_file(f)
-            if score > best_score:
-                best_score = score
-                best_user = username
-                best_file = f
-
-    if not best_user or not best_file:
+        peer = {key: value for key, value in response.items() if value is not files}
+        prior = priors.get(peer["username"], 0.0) if priors else 0.0
+        for file_info in files:
+            score, size = score_file(file_info, peer, prior)
+            item = (score, size, -position, len(peers), file_info)
+            position += 1
+            if len(heap) < top_k:
+                heapq.heappush(heap, item)
+            elif item[:3] > heap[0][:3]:
+                heapq.heapreplace(heap, item)
+        peers.append(peer)
+
+    kept: Dict[int, List[Dict]] = {}
+    for _, _, _, index, file_info in sorted(heap, key=lambda item: -item[2]):
+        kept.setdefault(index, []).append(file_info)
+    return [{**peers[index], "files": files} for index, files in sorted(kept.items())]
+
+
+def rank_files(
+    responses: List[Dict], top_k: int = 1, priors: Optional[Dict[str, float]] = None
+) -> List[Tuple[str, Dict]]:
+    """The top_k (user, file) pairs across all responses, best first.
+
+    Ordered by score, then size; the first of otherwise equal files wins.
+    """
+    import numpy as np
+
+    pairs, scores, sizes = score_responses(responses, priors)
+    if not pairs:
+        return []
+    # lexsort uses the last key first: score desc, size desc, position asc.
+    order = np.lexsort((np.arange(len(pairs)), -sizes, -scores))[: max(1, top_k)]
+    return [pairs[i] for i in order]
+
+
+def pick_best_file(responses: List[Dict]) -> Tuple[str, Dict] | Tuple[None, None]:
+    ranked = rank_files(responses, 1)
+    if not ranked:
         return None, None
+    return ranked[0]
+
+
+class AdaptivePoller:
+    """Polling cadence for one search.
+
+    Polls quickly at first and backs off towards `maximum`; the search counts
+    as settled once its (responseCount, fileCount) stop changing for
+    `settle` seconds.
+    """
+
+    def __init__(
+        self,
+        timeout: float,
+        settle: float,
+        initial: float = POLL_INITIAL_DELAY,
+        maximum: float = POLL_MAX_DELAY,
+        factor: float = POLL_BACKOFF,
+        clock=None,
+    ):
+        self.clock = clock or time.monotonic
+        self.started = self.clock()
+        self.deadline = self.started + timeout
+        self.settle = settle
+        self.delay = initial
+        self.maximum = maximum
+        self.factor = factor
+        self.polls = 0
+        self.counts: Optional[Tuple[int, int]] = None
+        self.changed_at = self.started
+
+    def expired(self) -> bool:
+        return self.clock() >= self.deadline
 
-    return best_user, best_file
+    def elapsed(self) -> float:
+        return self.clock() - self.started
+
+    def observe(self, counts: Tuple[int, int]) -> bool:
+        """Record the latest counts; True once non-zero counts have held for the settle window."""
+        self.polls += 1
+        now = self.clock()
+        if counts != self.counts:
+            self.counts = counts
+            self.changed_at = now
+            return False
+        return any(counts) and now - self.changed_at >= self.settle
+
+    def sleep(self) -> None:
+        remaining = self.deadline - self.clock()
+        if remaining <= 0:
+            return
+        time.sleep(min(self.delay, remaining))
+        self.delay = min(self.maximum, self.delay * self.factor)
+
+
+def _search_counts(state_obj: Dict) -> Tuple[int, int]:
+    return int(state_obj.get("responseCount") or 0), int(state_obj.get("fileCount") or 0)
+
+
+def _response_calls(
+    slskd, api_base, api_key, search_id, state_id, search_token, session=None, top_k=None, priors=None
+):
+    """(endpoint, call) pairs for every way slskd versions serve search responses, in fallback order."""
+    calls = [
+        # Direct REST endpoint for responses (more reliable than wrapper); streamed when top_k is set.
+        ("rest", lambda: fetch_search_responses(api_base, api_key, search_id, session, top_k, priors)),
+        (
+            "state",
+            lambda: retry_with_backoff(
+                lambda: slskd.searches.state(state_id, includeResponses=True),
+                label="slskd.searches.state",
+            ),
+        ),
+        (
+            "responses",
+            lambda: retry_with_backoff(
+                lambda: slskd.searches.search_responses(state_id),
+                label="slskd.searches.search_responses",
+            ),
+        ),
+    ]
+    # As a fallback, try state/responses using the alternate identifier
+    if search_token != state_id:
+        calls += [
+            (
+                "state_alt",
+                lambda: retry_with_backoff(
+                    lambda: slskd.searches.state(search_token, includeResponses=True),
+                    label="slskd.searches.state (alt)",
+                ),
+            ),
+            (
+                "responses_alt",
+                lambda: retry_with_backoff(
+                    lambda: slskd.searches.search_responses(search_token),
+                    label="slskd.searches.search_responses (alt)",
+                ),
+            ),
+        ]
+    return calls
+
+
+class ResponseEndpoint:
+    """Remembers which endpoint served search responses on this server.
+
+    The first search with results probes the full fallback chain; later
+    fetches call only the endpoint that worked. Shared by all workers.
+    """
+
+    def __init__(self, name: Optional[str] = None):
+        self.name = name
+        self._lock = threading.Lock()
+
+    def remember(self, name: str) -> None:
+        with self._lock:
+            if self.name is None:
+                self.name = name
+                print(f"[info] search responses served by: {name}")
+
+
+def fetch_responses(
+    slskd,
+    api_base: str,
+    api_key: str,
+    search_id: str,
+    state_id,
+    search_token,
+    session=None,
+    endpoint: Optional[ResponseEndpoint] = None,
+    top_k: Optional[int] = None,
+    priors: Optional[Dict[str, float]] = None,
+):
+    """Fetch a search's responses, through the cached endpoint when known.
+
+    Returns (responses, raw_responses, state_obj); the last two are kept for
+    --debug output. With `top_k`, the REST endpoint keeps only the top_k
+    files (the slskd_api endpoints always return everything).
+    """
+    calls = _response_calls(
+        slskd, api_base, api_key, search_id, state_id, search_token, session, top_k, priors
+    )
+    if endpoint is not None and endpoint.name:
+        chosen = [call for call in calls if call[0] == endpoint.name]
+        if chosen:
+            # Fall back to the full chain only if the known endpoint errors out.
+            try:
+                raw = chosen[0][1]()
+            except Exception:
+                pass
+            else:
+                is_state = endpoint.name.startswith("state")
+                return (
+                    normalize_responses(raw),
+                    None if is_state else raw,
+                    raw if is_state else None,
+                )
+
+    raw_responses = None
+    state_obj = None
+    for name, call in calls:
+        try:
+            raw = call()
+        except Exception:
+            continue
+        if name.startswith("state"):
+            state_obj = raw if isinstance(raw, dict) else state_obj
+        else:
+            raw_responses = raw
+        responses = normalize_responses(raw)
+        if responses:
+            if endpoint is not None:
+                endpoint.remember(name)
+            return responses, raw_responses, state_obj
+    return [], raw_responses, state_obj
+
+
+class SearchStates:
+    """Search states for every worker from one `searches.get_all()` call.
+
+    A listing older than `max_age` seconds is refreshed by the next caller;
+    callers arriving meanwhile wait and reuse it, so N concurrent searches
+    cost one list request per interval instead of N state requests.
+    """
+
+    def __init__(self, slskd, max_age: float = BULK_POLL_INTERVAL, clock=None):
+        self.slskd = slskd
+        self.max_age = max_age
+        self.clock = clock or time.monotonic
+        self.states: Dict[str, Dict] = {}
+        self.fetched_at: Optional[float] = None
+        self.refreshes = 0
+        self._lock = threading.Lock()
+
+    def refresh(self) -> None:
+        listing = retry_with_backoff(
+            lambda: self.slskd.searches.get_all(),
+            label="slskd.searches.get_all",
+        )
+        states = {}
+        for item in listing if isinstance(listing, list) else []:
+            if not isinstance(item, dict):
+                continue
+            for key in ("id", "token"):
+                if item.get(key) is not None:
+                    states[str(item[key])] = item
+        self.states = states
+        self.fetched_at = self.clock()
+        self.refreshes += 1
+
+    def get(self, search_id) -> Optional[Dict]:
+        """State of one search, or None if the listing does not have it (yet)."""
+        with self._lock:
+            if self.fetched_at is None or self.clock() - self.fetched_at >= self.max_age:
+                try:
+                    self.refresh()
+                except Exception:
+                    return None
+            return self.states.get(str(search_id))
+
+
+class SearchResult(NamedTuple):
+    query: str
+    state_id: Optional[str]  # None when answered from the cache
+    user: Optional[str]
+    file_info: Optional[Dict]
+    cached: bool = False
+    error: Optional[str] = None  # set when the search itself failed
+    alternatives: Tuple[Tuple[str, Dict], ...] = ()  # next-best (user, file) pairs
+
+
+def _ranked_result(
+    query: str, state_id, responses: List[Dict], options, cached: bool = False, priors=None
+) -> SearchResult:
+    ranked = rank_files(responses, getattr(options, "top_k", 1), priors)
+    if not ranked:
+        return SearchResult(query, state_id, None, None, cached=cached)
+    (user, file_info), alternatives = ranked[0], tuple(ranked[1:])
+    return SearchResult(query, state_id, user, file_info, cached=cached, alternatives=alternatives)
+
+
+def search_best_file(
+    slskd,
+    query: str,
+    options,
+    api_base: str,
+    api_key: str,
+    session: Optional[requests.Session] = None,
+    endpoint: Optional[ResponseEndpoint] = None,
+    states: Optional["SearchStates"] = None,
+    cache: Optional[SearchCache] = None,
+    priors: Optional[Dict[str, float]] = None,
+) -> SearchResult:
+    """Run one search, wait for responses and pick the best file.
+
+    `options` carries the CLI settings (search_timeout_ms, settle_ms,
+    response_limit, file_limit, no_stop, debug). Safe to call from worker
+    threads. With `states`, waiting reads the shared searches listing instead
+    of polling this search's state. With `cache`, fresh cached responses
+    are used without searching, and new responses are stored. `priors`
+    (username -> reputation) feed the ranking.
+    """
+    if cache is not None:
+        cached = cache.get(query)
+        if cached is not None:
+            return _ranked_result(query, None, cached, options, cached=True, priors=priors)
+
+    search_id = str(uuid.uuid4())
+    search_resp = retry_with_backoff(
+        lambda: slskd.searches.search_text(
+            searchText=query,
+            id=search_id,
+            fileLimit=options.file_limit,
+            responseLimit=options.response_limit,
+            searchTimeout=options.search_timeout_ms,
+        ),
+        label="slskd.searches.search_text",
+    )
+    # slskd may return its own token/id; prefer them if present
+    search_token = None
+    search_id_actual = search_id
+    if isinstance(search_resp, dict):
+        search_id_actual = search_resp.get("id") or search_id_actual
+        search_token = search_resp.get("token") or search_resp.get("id")
+    if not search_token:
+        search_token = search_id_actual
+    # Prefer UUID token for state/response calls when available
+    state_id = search_token
+    if isinstance(search_token, int):
+        state_id = search_id_actual
+
+    # Wait on the lightweight state (counts only) until the search completes,
+    # hits its limits or stops growing; responses are fetched once afterwards.
+    poller = AdaptivePoller(
+        timeout=max(options.search_timeout_ms / 1000.0, 1.0),
+        settle=options.settle_ms / 1000.0,
+    )
+    state_obj = None
+    complete = False
+    reason = "timeout"
+    while not poller.expired():
+        poller.sleep()
+        state_obj = states.get(state_id) if states is not None else None
+        if state_obj is None:
+            try:
+                state_obj = retry_with_backoff(
+                    lambda: slskd.searches.state(state_id),
+                    label="slskd.searches.state",
+                )
+            except Exception:
+                state_obj = None
+        if not isinstance(state_obj, dict):
+            # No usable state on this server; fall through to fetching responses.
+            reason = "no state"
+            break
+        counts = _search_counts(state_obj)
+        if state_obj.get("isComplete", False):
+            complete = True
+            reason = "complete"
+            break
+        if counts[0] >= options.response_limit or counts[1] >= options.file_limit:
+            reason = "limit"
+            break
+        if poller.observe(counts):
+            reason = "settled"
+            break
+
+    response_count = _search_counts(state_obj)[0] if isinstance(state_obj, dict) else None
+    # Stop the search to finalize results once we are done waiting on it.
+    if (not options.no_stop) and (not complete) and response_count:
+        try:
+            retry_with_backoff(
+                lambda: slskd.searches.stop(state_id),
+                label="slskd.searches.stop",
+            )
+        except Exception:
+            pass
+
+    responses = []
+    raw_responses = None
+    if complete and response_count == 0:
+        pass
+    else:
+        # Responses can lag the counts briefly after a stop; retry until the deadline.
+        while True:
+            responses, raw_responses, fetched_state = fetch_responses(
+                slskd,
+                api_base,
+                api_key,
+                search_id_actual,
+                state_id,
+                search_token,
+                session,
+                endpoint,
+                getattr(options, "top_k", 1),
+                priors,
+            )
+            if fetched_state is not None:
+                state_obj = fetched_state
+            if responses or response_count == 0 or poller.expired():
+                break
+            poller.sleep()
+    if options.debug and (not responses):
+        print(f"[debug] no responses after {poller.elapsed():.1f}s ({reason})")
+
+    if options.debug:
+        print(f"[debug] query: {query}")
+        print(f"[debug] polls: {poller.polls}, waited {poller.elapsed():.1f}s, stopped on: {reason}")
+        if isinstance(search_resp, dict):
+            print(f"[debug] search_resp keys: {sorted(search_resp.keys())}")
+        print(f"[debug] search_id: {search_id_actual}")
+        print(f"[debug] search_token: {search_token}")
+        print(f"[debug] state_id: {state_id}")
+        print(f"[debug] raw response type: {type(raw_responses)}")
+        if isinstance(raw_responses, list):
+            print(f"[debug] raw response length: {len(raw_responses)}")
+        if isinstance(state_obj, dict):
+            print(f"[debug] state keys: {sorted(state_obj.keys())}")
+            print(f"[debug] state counts: responses={state_obj.get('responseCount')} files={state_obj.get('fileCount')}")
+            print(f"[debug] state complete: {state_obj.get('isComplete')}")
+            resp_val = state_obj.get("responses")
+            if isinstance(resp_val, list):
+                print(f"[debug] state responses len: {len(resp_val)}")
+            else:
+                print(f"[debug] state responses type: {type(resp_val)}")
+        if responses:
+            sample = responses[0]
+            print(f"[debug] response keys: {sorted(sample.keys())}")
+            files = iter_files(sample)
+            print(f"[debug] first response files: {len(files)}")
+        else:
+            if isinstance(raw_responses, dict):
+                print(f"[debug] raw response keys: {sorted(raw_responses.keys())}")
+
+    if cache is not None and responses:
+        cache.put(query, responses)
+    return _ranked_result(query, state_id, responses, options, priors=priors)
+
+
+def run_concurrently(func, items: Iterable, concurrency: int) -> Iterator[Tuple[object, object]]:
+    """Yield (item, func(item)) as calls finish, with at most `concurrency` in flight.
+
+    Items are submitted lazily, so a slow call never holds back the results
+    of faster ones and nothing beyond the window has started yet.
+    """
+    items = iter(items)
+    executor = ThreadPoolExecutor(max_workers=max(1, concurrency))
+    pending = {}
+    try:
+        for item in islice(items, max(1, concurrency)):
+            pending[executor.submit(func, item)] = item
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                item = pending.pop(future)
+                for nxt in islice(items, 1):
+                    pending[executor.submit(func, nxt)] = nxt
+                yield item, future.result()
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _file_entry(file_info: Dict) -> Dict:
+    return {"filename": file_info.get("filename"), "size": file_info.get("size")}
+
+
+def iter_downloads(payload) -> Iterator[Dict]:
+    """Flatten transfers.get_all_downloads() (users -> directories -> files)."""
+    for user in payload if isinstance(payload, list) else []:
+        for directory in user.get("directories") or []:
+            for transfer in directory.get("files") or []:
+                yield {"username": user.get("username"), **transfer}
+
+
+def transfer_outcome(state: str) -> Optional[str]:
+    """'completed', 'failed' or None (still queued or running) for a slskd transfer state."""
+    state = state or ""
+    if not state.startswith("Completed"):
+        return None
+    return "completed" if "Succeeded" in state else "failed"
+
+
+class TransferMonitor:
+    """Watches queued downloads and fails over to the next-best peer.
+
+    Each poll makes one transfers.get_all_downloads() request. A transfer
+    that ends in an error, rejection, timeout or cancellation, or whose
+    bytesTransferred has not grown for `stall_timeout` seconds, is cancelled
+    and the row's next alternative (skipping the same peer) is enqueued.
+    Rows without alternatives left are marked failed.
+    """
+
+    def __init__(
+        self,
+        slskd,
+        journal: RunJournal,
+        stall_timeout: float,
+        reputation: Optional[PeerReputation] = None,
+        clock=None,
+    ):
+        self.slskd = slskd
+        self.journal = journal
+        self.reputation = reputation
+        self.stall_timeout = stall_timeout
+        self.clock = clock or time.monotonic
+        # (username, filename) -> (bytesTransferred, last time it grew)
+        self.progress: Dict[Tuple[str, str], Tuple[int, float]] = {}
+        self.completed = 0
+        self.failovers = 0
+        self.failed = 0
+
+    def poll(self) -> int:
+        """Check every queued row once; returns how many are still active."""
+        payload = retry_with_backoff(
+            lambda: self.slskd.transfers.get_all_downloads(),
+            label="slskd.transfers.get_all_downloads",
+        )
+        transfers = {(t.get("username"), t.get("filename")): t for t in iter_downloads(payload)}
+        now = self.clock()
+        active = 0
+        for row in self.journal.queued():
+            key = (row["username"], row["filename"])
+            transfer = transfers.get(key)
+            if transfer is None:
+                # Not listed (yet, or removed from the UI); leave it alone.
+                active += 1
+                continue
+            outcome = transfer_outcome(transfer.get("state"))
+            if outcome == "completed":
+                self.journal.record(row["query"], COMPLETED, username=key[0], filename=key[1])
+                print(f"[done] {key[0]}: {key[1]}")
+                if self.reputation is not None:
+                    self.reputation.record_transfer(key[0], True, _number(transfer.get("averageSpeed")) or None)
+                self.completed += 1
+                self.progress.pop(key, None)
+                continue
+            if outcome == "failed":
+                active += self._failover(row, transfer, transfer.get("state"))
+                continue
+            transferred = int(transfer.get("bytesTransferred") or 0)
+            last = self.progress.get(key)
+            if last is None or transferred > last[0]:
+                self.progress[key] = (transferred, now)
+            elif now - last[1] >= self.stall_timeout:
+                active += self._failover(row, transfer, f"no progress for {self.stall_timeout:.0f}s")
+                continue
+            active += 1
+        return active
+
+    def _failover(self, row: Dict, transfer: Dict, reason: str) -> bool:
+        """Cancel the row's download and enqueue its next alternative; False if none is left."""
+        query, user = row["query"], row["username"]
+        self.progress.pop((user, row["filename"]), None)
+        if self.reputation is not None:
+            self.reputation.record_transfer(user, False)
+        if transfer_outcome(transfer.get("state")) is None and transfer.get("id"):
+            try:
+                retry_with_backoff(
+                    lambda: self.slskd.transfers.cancel_download(user, transfer["id"]),
+                    label="slskd.transfers.cancel_download",
+                )
+            except Exception:
+                pass
+        alternatives = [alt for alt in row["alternatives"] if alt.get("username") != user]
+        while alternatives:
+            alt = alternatives.pop(0)
+            entry = {"filename": alt.get("filename"), "size": alt.get("size")}
+            try:
+                ok = retry_with_backoff(
+                    lambda: self.slskd.transfers.enqueue(alt["username"], [entry]),
+                    label="slskd.transfers.enqueue (failover)",
+                )
+            except Exception:
+                ok = False
+            if ok:
+                print(f"[failover] {query}: {user} ({reason}) -> {alt['username']}: {entry['filename']}")
+                self.journal.record(
+                    query,
+                    QUEUED,
+                    username=alt["username"],
+                    filename=entry["filename"],
+                    detail=f"failover after {user}: {reason}",
+                    alternatives=alternatives,
+                )
+                self.failovers += 1
+                return True
+        print(f"[fail] {query}: {user} ({reason}), no alternatives left")
+        self.journal.record(query, FAILED, username=user, filename=row["filename"], detail=reason)
+        self.failed += 1
+        return False
+
+    def run(self, interval: float, timeout: float) -> None:
+        deadline = self.clock() + timeout
+        while True:
+            try:
+                active = self.poll()
+            except Exception as exc:
+                print(f"[warn] transfer monitor poll failed ({exc})")
+                active = 1
+            if not active or self.clock() >= deadline:
+                break
+            time.sleep(interval)
+        print(
+            f"Monitor: completed={self.completed}, failovers={self.failovers}, "
+            f"failed={self.failed}, still active={active}"
+        )
+
+
+class EnqueueBatcher:
+    """Buffers chosen files per peer and enqueues each peer's files in one request.
+
+    A peer's batch is sent once it holds `size` files or its oldest file has
+    waited `max_wait` seconds (checked by flush_due); flush_all sends the
+    rest. `on_result(item, user, file, ok, error)` is called for every file.
+    When a batch request raises or is refused, its files are retried one by
+    one so each still gets its own outcome.
+    """
+
+    def __init__(self, enqueue, size: int, max_wait: float, on_result, clock=None):
+        self.enqueue = enqueue
+        self.size = max(1, size)
+        self.max_wait = max_wait
+        self.on_result = on_result
+        self.clock = clock or time.monotonic
+        self.pending: Dict[str, List[Tuple[Dict, object]]] = {}
+        self.first_added: Dict[str, float] = {}
+        self.requests = 0
+        self.files = 0
+
+    def add(self, user: str, file_entry: Dict, item) -> None:
+        self.first_added.setdefault(user, self.clock())
+        self.pending.setdefault(user, []).append((file_entry, item))
+        if len(self.pending[user]) >= self.size:
+            self.flush(user)
+
+    def flush_due(self) -> None:
+        now = self.clock()
+        for user in [u for u, since in self.first_added.items() if now - since >= self.max_wait]:
+            self.flush(user)
+
+    def flush_all(self) -> None:
+        # on_result may add failover files while flushing.
+        while self.pending:
+            self.flush(next(iter(self.pending)))
+
+    def _send(self, user: str, files: List[Dict]) -> Tuple[bool, Optional[str]]:
+        self.requests += 1
+        try:
+            return bool(self.enqueue(user, files)), None
+        except Exception as exc:
+            return False, str(exc) or type(exc).__name__
+
+    def flush(self, user: str) -> None:
+        batch = self.pending.pop(user, [])
+        self.first_added.pop(user, None)
+        if not batch:
+            return
+        files = list({entry["filename"]: entry for entry, _ in batch}.values())
+        self.files += len(files)
+        ok, error = self._send(user, files)
+        if ok or len(files) == 1:
+            for entry, item in batch:
+                self.on_result(item, user, entry, ok, error)
+            return
+        # Find out which files the peer's batch failed on.
+        outcomes = {entry["filename"]: self._send(user, [entry]) for entry in files}
+        for entry, item in batch:
+            self.on_result(item, user, entry, *outcomes[entry["filename"]])
 
 
 def main() -> None:
+    global API_GUARD
     parser = argparse.ArgumentParser(description="Queue slskd downloads from dj_candidates.csv")
-    parser.add_argument("--csv", default="dj_candidates.csv", help="Path to dj_candidates.csv")
+    parser.add_argument(
+        "--csv",
+        default="dj_candidates.csv",
+        help="Path to dj_candidates.csv (.parquet/.arrow candidates also accepted)",
+    )
     parser.add_argument("--limit", type=int, default=None, help="Limit number of rows processed")
     parser.add_argument("--search-timeout-ms", type=int, default=90000, help="Search timeout (ms)")
+    parser.add_argument(
+        "--settle-ms",
+        type=int,
+        default=DEFAULT_SETTLE_MS,
+        help="Finish a search early once its response/file counts stop growing for this long (ms)",
+    )
     parser.add_argument("--response-limit", type=int, default=100, help="Max user responses")
     parser.add_argument("--file-limit", type=int, default=10000, help="Max files in results")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help="Searches kept in flight at once",
+    )
+    parser.add_argument(
+        "--bulk-poll",
+        action="store_true",
+        help="Poll all active searches with one list request instead of one state request each",
+    )
+    parser.add_argument(
+        "--cache",
+        default=DEFAULT_CACHE_PATH,
+        help="SQLite file caching search results between runs",
+    )
+    parser.add_argument(
+        "--cache-ttl-hours",
+        type=float,
+        default=DEFAULT_TTL_HOURS,
+        help="Reuse cached search results younger than this",
+    )
+    parser.add_argument("--no-cache", action="store_true", help="Always search, do not read or write the cache")
+    parser.add_argument(
+        "--journal",
+        default=None,
+        help="Run journal path (default: <csv_stem>_slskd_journal.sqlite next to --csv)",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue the journaled run: skip rows already queued or without results",
+    )
+    parser.add_argument(
+        "--skip-owned",
+        action="store_true",
+        help="Do not search for tracks already in --library-dir or --downloads-dir",
+    )
+    parser.add_argument("--library-dir", default=os.path.expanduser("~/Music/DJ/library"))
+    parser.add_argument("--downloads-dir", default=os.path.expanduser("~/Soulseek/downloads/complete"))
+    parser.add_argument(
+        "--owned-index",
+        default=DEFAULT_OWNED_INDEX,
+        help="JSON cache of the local files index used by --skip-owned",
+    )
+    parser.add_argument(
+        "--enqueue-batch",
+        type=int,
+        default=DEFAULT_ENQUEUE_BATCH,
+        help="Enqueue up to this many files per peer in one request (1 = one request per file)",
+    )
+    parser.add_argument(
+        "--enqueue-wait-ms",
+        type=int,
+        default=DEFAULT_ENQUEUE_WAIT_MS,
+        help="Send a peer's partial batch once its oldest file has waited this long (ms)",
+    )
+    parser.add_argument(
+        "--top-k",
+        type=int,
+        default=DEFAULT_TOP_K,
+        help="Ranked files kept per search (the best plus alternatives for failover)",
+    )
+    parser.add_argument(
+        "--monitor",
+        action="store_true",
+        help="After queueing, watch transfers and fail over stalled or failed downloads",
+    )
+    parser.add_argument(
+        "--stall-timeout-min",
+        type=float,
+        default=10.0,
+        help="Fail over a download that made no progress for this long (minutes)",
+    )
+    parser.add_argument("--monitor-interval", type=float, default=30.0, help="Seconds between transfer polls")
+    parser.add_argument(
+        "--monitor-timeout-min",
+        type=float,
+        default=120.0,
+        help="Stop monitoring after this long (minutes)",
+    )
+    parser.add_argument(
+        "--api-rate",
+        type=float,
+        default=DEFAULT_API_RATE,
+        help="Max slskd API requests per second across all workers (0 = unlimited)",
+    )
+    parser.add_argument("--api-burst", type=int, default=DEFAULT_BURST, help="Requests allowed in a burst")
+    parser.add_argument(
+        "--breaker-failures",
+        type=int,
+        default=DEFAULT_FAILURE_THRESHOLD,
+        help="Pause all requests after this many failed API calls in a row (0 = never)",
+    )
+    parser.add_argument(
+        "--breaker-cooldown-s",
+        type=float,
+        default=DEFAULT_COOLDOWN,
+        help="How long to pause before probing slskd again (seconds)",
+    )
+    parser.add_argument("--peer-db", default=DEFAULT_PEER_DB, help="SQLite file with per-peer history")
+    parser.add_argument(
+        "--reputation-half-life-days",
+        type=float,
+        default=DEFAULT_HALF_LIFE_DAYS,
+        help="Peer history loses half its weight after this many days",
+    )
+    parser.add_argument("--no-reputation", action="store_true", help="Ignore and do not record peer history")
     parser.add_argument("--dry-run", action="store_true", help="Do not enqueue downloads")
     parser.add_argument("--debug", action="store_true", help="Print response structure for troubleshooting")
     parser.add_argument("--no-stop", action="store_true", help="Do not stop searches after queuing a download")
     args = parser.parse_args()
 
+    if args.concurrency < 1:
+        raise SystemExit("--concurrency must be at least 1")
+    if args.monitor and args.dry_run:
+        raise SystemExit("--monitor needs real downloads; drop --dry-run")
+
     host = os.getenv("SLSKD_HOST", DEFAULT_HOST)
     url_base = os.getenv("SLSKD_URL_BASE", DEFAULT_URL_BASE)
     # slskd_api already prefixes /api/v0 internally; avoid double-prefix.
@@ -238,190 +1262,166 @@ def main() -> None:
         raise SystemExit("Missing SLSKD_API_KEY in environment. Set it in .env.")
 
     slskd = slskd_api.SlskdClient(host, api_key, url_base)
+    # Workers, the main thread and slskd_api all share one keep-alive pool.
+    session = build_session(api_key, pool_size=args.concurrency + 2)
+    share_session(slskd, session)
+    API_GUARD = ApiGuard(
+        TokenBucket(args.api_rate, args.api_burst),
+        CircuitBreaker(args.breaker_failures, args.breaker_cooldown_s),
+    )
     api_base = build_api_base(host)
+    endpoint = ResponseEndpoint()
+    states = SearchStates(slskd) if args.bulk_poll else None
+    cache = None if args.no_cache else SearchCache(args.cache, args.cache_ttl_hours)
+    reputation = None if args.no_reputation else PeerReputation(args.peer_db, args.reputation_half_life_days)
+    priors = reputation.priors() if reputation is not None else None
+    if cache is not None:
+        cache.purge()
 
     searches = load_search_strings(args.csv, args.limit)
     if not searches:
         raise SystemExit("No search_string rows found.")
 
-    queued = 0
-    skipped = 0
-
-    for query in searches:
-        search_id = str(uuid.uuid4())
-        search_resp = retry_with_backoff(
-            lambda: slskd.searches.search_text(
-                searchText=query,
-                id=search_id,
-                fileLimit=args.file_limit,
-                responseLimit=args.response_limit,
-                searchTimeout=args.search_timeout_ms,
-            ),
-            label="slskd.searches.search_text",
+    if args.skip_owned:
+        owned = OwnedIndex.build([args.library_dir, args.downloads_dir], args.owned_index)
+        searches, dropped = drop_owned(searches, owned, load_candidate_isrcs(args.csv))
+        for query in dropped:
+            print(f"[owned] {query}")
+        print(
+            f"Owned: {len(dropped)} searches avoided "
+            f"({len(owned.entries)} local files indexed, {owned.scanned} read)"
         )
-        # slskd may return its own token/id; prefer them if present
-        search_token = None
-        search_id_actual = search_id
-        if isinstance(search_resp, dict):
-            search_id_actual = search_resp.get("id") or search_id_actual
-            search_token = search_resp.get("token") or search_resp.get("id")
-        if not search_token:
-            search_token = search_id_actual
-        # Prefer UUID token for state/response calls when available
-        state_id = search_token
-        if isinstance(search_token, int):
-            state_id = search_id_actual
-
-        # Give the server a moment to populate results
-        time.sleep(3)
-
-        # Poll for responses as soon as they appear (no need to wait for completion)
-        responses = []
-        raw_responses = None
-        state_obj = None
-        stop_issued = False
-        deadline = time.time() + max(args.search_timeout_ms / 1000.0, 1.0)
-        while time.time() < deadline:
-            # Try direct REST endpoint for responses (more reliable than wrapper)
-            try:
-                responses = fetch_search_responses(api_base, api_key, search_id_actual)
-            except Exception:
-                responses = []
-            if responses:
-                break
 
-            state_obj = retry_with_backoff(
-                lambda: slskd.searches.state(state_id, includeResponses=True),
-                label="slskd.searches.state",
-            )
-            if isinstance(state_obj, dict):
-                # If we have counts but no inline responses yet, stop the search to finalize results.
-                if (not args.no_stop) and (not stop_issued) and state_obj.get("responseCount", 0) and not state_obj.get("isComplete", False):
-                    try:
-                        retry_with_backoff(
-                            lambda: slskd.searches.stop(state_id),
-                            label="slskd.searches.stop",
-                        )
-                        stop_issued = True
-                    except Exception:
-                        pass
-
-                responses = normalize_responses(state_obj.get("responses"))
-                if responses:
-                    break
-                # If counts exist but no inline responses, try responses endpoint with id/token
-                if state_obj.get("responseCount", 0):
-                    try:
-                        raw_responses = retry_with_backoff(
-                            lambda: slskd.searches.search_responses(state_id),
-                            label="slskd.searches.search_responses",
-                        )
-                        responses = normalize_responses(raw_responses)
-                    except Exception:
-                        raw_responses = None
-                        responses = []
-                    if responses:
-                        break
-
-                    # As a fallback, try state/responses using the alternate identifier
-                    if search_token != state_id:
-                        try:
-                            alt_state = retry_with_backoff(
-                                lambda: slskd.searches.state(search_token, includeResponses=True),
-                                label="slskd.searches.state (alt)",
-                            )
-                            if isinstance(alt_state, dict):
-                                responses = normalize_responses(alt_state.get("responses"))
-                                state_obj = alt_state
-                        except Exception:
-                            pass
-                        if not responses:
-                            try:
-                                alt_responses = retry_with_backoff(
-                                    lambda: slskd.searches.search_responses(search_token),
-                                    label="slskd.searches.search_responses (alt)",
-                                )
-                                responses = normalize_responses(alt_responses)
-                            except Exception:
-                                pass
-                        if responses:
-                            break
-            time.sleep(2)
-        if args.debug and (not responses):
-            print(f"[debug] timed out waiting for responses after {args.search_timeout_ms}ms")
-
-        # If completed but responses still empty, try fallback endpoints once.
-        if not responses:
-            try:
-                raw_responses = retry_with_backoff(
-                    lambda: slskd.searches.search_responses(state_id),
-                    label="slskd.searches.search_responses (final)",
-                )
-                responses = normalize_responses(raw_responses)
-            except Exception:
-                raw_responses = None
-
-        if args.debug:
-            if isinstance(search_resp, dict):
-                print(f"[debug] search_resp keys: {sorted(search_resp.keys())}")
-            print(f"[debug] search_id: {search_id_actual}")
-            print(f"[debug] search_token: {search_token}")
-            print(f"[debug] state_id: {state_id}")
-            print(f"[debug] raw response type: {type(raw_responses)}")
-            if isinstance(raw_responses, list):
-                print(f"[debug] raw response length: {len(raw_responses)}")
-            if isinstance(state_obj, dict):
-                print(f"[debug] state keys: {sorted(state_obj.keys())}")
-                print(f"[debug] state counts: responses={state_obj.get('responseCount')} files={state_obj.get('fileCount')}")
-                print(f"[debug] state complete: {state_obj.get('isComplete')}")
-                resp_val = state_obj.get("responses")
-                if isinstance(resp_val, list):
-                    print(f"[debug] state responses len: {len(resp_val)}")
-                else:
-                    print(f"[debug] state responses type: {type(resp_val)}")
-            if responses:
-                sample = responses[0]
-                print(f"[debug] response keys: {sorted(sample.keys())}")
-                files = iter_files(sample)
-                print(f"[debug] first response files: {len(files)}")
-            else:
-                if isinstance(raw_responses, dict):
-                    print(f"[debug] raw response keys: {sorted(raw_responses.keys())}")
+    # Dry runs queue nothing, so they neither read nor write the journal.
+    journal = None
+    if not args.dry_run:
+        journal = RunJournal(args.journal or default_journal_for_csv(args.csv))
+        if args.resume:
+            done = journal.finished()
+            retry = [query for query in searches if query not in done]
+            print(f"Resuming: {len(searches) - len(retry)} rows already finished, {len(retry)} to search")
+            searches = retry
+        else:
+            journal.reset()
+        journal.add(searches)
 
-        user, file_info = pick_best_file(responses)
-        if not user or not file_info:
-            print(f"[skip] no results for: {query}")
-            skipped += 1
-            continue
+    queued = 0
+    skipped = 0
+    failed = 0
+    started = time.monotonic()
 
-        payload = [{"filename": file_info.get("filename"), "size": file_info.get("size")}]
+    def search(query: str) -> SearchResult:
+        if journal is not None:
+            journal.record(query, SEARCHING)
+        try:
+            return search_best_file(
+                slskd, query, args, api_base, api_key, session, endpoint, states, cache, priors
+            )
+        except Exception as exc:
+            return SearchResult(query, None, None, None, error=str(exc) or type(exc).__name__)
 
-        if args.dry_run:
-            print(f"[dry-run] {user}: {payload[0]['filename']}")
-            queued += 1
-            continue
+    def record(query: str, status: str, **kwargs) -> None:
+        if journal is not None:
+            journal.record(query, status, **kwargs)
 
-        ok = retry_with_backoff(
-            lambda: slskd.transfers.enqueue(user, payload),
-            label="slskd.transfers.enqueue",
-        )
-        if ok:
-            print(f"[queued] {user}: {payload[0]['filename']}")
+    def enqueued(result: SearchResult, user: str, file_entry: Dict, ok: bool, error: Optional[str]) -> None:
+        nonlocal queued, skipped, failed
+        query, filename = result.query, file_entry["filename"]
+        if reputation is not None:
+            reputation.record_enqueue(user, bool(ok) and not error)
+        others = [alt for alt in result.alternatives if alt[0] != user]
+        if not ok and others:
+            # Refused right away: try the next-best peer before giving up.
+            (alt_user, alt_file), rest = others[0], tuple(others[1:])
+            print(f"[failover] {query}: {user} ({error or 'enqueue rejected'}) -> {alt_user}")
+            batcher.add(
+                alt_user,
+                _file_entry(alt_file),
+                result._replace(user=alt_user, file_info=alt_file, alternatives=rest),
+            )
+            return
+        if error:
+            print(f"[fail] enqueue failed for: {query} ({error})")
+            record(query, FAILED, username=user, filename=filename, detail=error)
+            failed += 1
+        elif ok:
+            print(f"[queued] {user}: {filename}")
+            alternatives = [
+                {"username": alt_user, **_file_entry(alt_file)} for alt_user, alt_file in result.alternatives
+            ]
+            record(query, QUEUED, username=user, filename=filename, alternatives=alternatives)
             queued += 1
             # Stop the search to clear "in progress" status in UI
-            if not args.no_stop:
+            if not args.no_stop and result.state_id:
                 try:
                     retry_with_backoff(
-                        lambda: slskd.searches.stop(state_id),
+                        lambda: slskd.searches.stop(result.state_id),
                         label="slskd.searches.stop (post enqueue)",
                     )
                 except Exception:
                     pass
         else:
             print(f"[skip] enqueue failed for: {query}")
+            record(query, FAILED, username=user, filename=filename, detail="enqueue rejected")
             skipped += 1
 
-    print(f"\nDone. queued={queued}, skipped={skipped}")
+    batcher = EnqueueBatcher(
+        lambda user, files: retry_with_backoff(
+            lambda: slskd.transfers.enqueue(user, files),
+            label="slskd.transfers.enqueue",
+        ),
+        size=args.enqueue_batch,
+        max_wait=args.enqueue_wait_ms / 1000.0,
+        on_result=enqueued,
+    )
+
+    try:
+        # Searches run in worker threads; enqueueing happens here as each one finishes.
+        for query, result in run_concurrently(search, searches, args.concurrency):
+            if result.error:
+                print(f"[fail] search failed for: {query} ({result.error})")
+                record(query, FAILED, detail=result.error)
+                failed += 1
+            elif not result.user or not result.file_info:
+                print(f"[skip] no results for: {query}")
+                record(query, NO_RESULTS)
+                skipped += 1
+            elif args.dry_run:
+                filename = result.file_info.get("filename")
+                print(f"[dry-run] {result.user}: {filename}{' (cached)' if result.cached else ''}")
+                queued += 1
+            else:
+                batcher.add(result.user, _file_entry(result.file_info), result)
+            batcher.flush_due()
+        batcher.flush_all()
+        if args.monitor and journal is not None:
+            journal.flush()
+            print("Monitoring transfers...")
+            TransferMonitor(slskd, journal, args.stall_timeout_min * 60, reputation=reputation).run(
+                args.monitor_interval, args.monitor_timeout_min * 60
+            )
+    finally:
+        if journal is not None:
+            journal.close()
+        if reputation is not None:
+            reputation.close()
+
+    if batcher.requests:
+        print(f"Enqueue: {batcher.files} files in {batcher.requests} requests")
+    elapsed = time.monotonic() - started
+    rate = len(searches) / elapsed * 60 if elapsed > 0 else 0.0
+    print(f"\nDone. queued={queued}, skipped={skipped}, failed={failed}")
+    print(f"{len(searches)} queries in {elapsed:.1f}s ({rate:.1f} queries/min, concurrency={args.concurrency})")
+    if states is not None:
+        print(f"Bulk poll: {states.refreshes} searches list requests")
+    if API_GUARD.bucket.waited or API_GUARD.breaker.trips:
+        print(
+            f"Throttle: {API_GUARD.bucket.waited:.1f}s waiting for the rate limit, "
+            f"circuit opened {API_GUARD.breaker.trips} times"
+        )
+    if cache is not None:
+        print(f"Cache: {cache.hits} searches answered from {args.cache}")
+        cache.close()
 
 
 if __name__ == "__main__":
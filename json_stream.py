@@ -0,0 +1,76 @@
+"""Incremental parsing of large JSON array bodies.
+
+iter_json_array yields the elements of a top-level JSON array as byte
+chunks arrive, so a caller can reduce them one at a time instead of
+holding the whole decoded document in memory.
+"""
+import codecs
+import json
+from typing import Iterable, Iterator
+
+_WHITESPACE = " \t\r\n"
+_decoder = json.JSONDecoder()
+
+
+def _skip(buffer: str, pos: int, chars: str) -> int:
+    while pos < len(buffer) and buffer[pos] in chars:
+        pos += 1
+    return pos
+
+
+def iter_json_array(chunks: Iterable[bytes]) -> Iterator:
+    """Elements of the JSON array in `chunks` (UTF-8 bytes), in order.
+
+    A body that is not an array is decoded whole and yields nothing, like a
+    non-list body on the non-streaming path. Raises ValueError on malformed
+    or truncated input.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    chunks = iter(chunks)
+    buffer = ""
+    pos = 0
+    started = False
+    # Retry a partial element only once the buffer has doubled, so a single
+    # huge element is not re-parsed for every small chunk.
+    retry_at = 0
+    done = False
+    while not done:
+        chunk = next(chunks, None)
+        if chunk is None:
+            buffer += decoder.decode(b"", final=True)
+            done = True
+        else:
+            buffer += decoder.decode(chunk)
+        if not started:
+            pos = _skip(buffer, pos, _WHITESPACE)
+            if pos == len(buffer):
+                continue
+            if buffer[pos] != "[":
+                rest = buffer + "".join(decoder.decode(c) for c in chunks) + decoder.decode(b"", final=True)
+                json.loads(rest)
+                return
+            started = True
+            pos += 1
+        if len(buffer) < retry_at and not done:
+            continue
+        retry_at = 0
+        while True:
+            pos = _skip(buffer, pos, _WHITESPACE + ",")
+            if pos < len(buffer) and buffer[pos] == "]":
+                return
+            if pos == len(buffer):
+                break
+            try:
+                element, end = _decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if done:
+                    raise
+                element, end = None, None
+            # A number at the very end of the buffer may continue in the next chunk.
+            if end is None or (end == len(buffer) and not done and not isinstance(element, (dict, list))):
+                retry_at = 2 * (len(buffer) - pos)
+                break
+            pos = end
+            yield element
+        buffer, pos = buffer[pos:], 0
+    raise ValueError("truncated JSON array")
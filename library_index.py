@@ -0,0 +1,120 @@
+"""Index of tracks already on disk, to skip searching for them again.
+
+Keys come from text_normalize.library_track_keys (the same artist - title
+keys scripts/export_m3u_by_style.py matches playlists with), plus a variant
+cleaned like the candidates' search_string ("(Original Mix)" etc. dropped)
+and the ISRC tag when present. Tags are read with mutagen; the result is
+cached in a JSON file per path, mtime and size, so later runs only re-read
+new or changed files.
+"""
+import json
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+from text_normalize import (
+    clean_filename,
+    clean_track_name,
+    library_track_keys,
+    normalize_isrc,
+    normalize_key,
+    primary_artist,
+)
+
+INDEX_VERSION = 1
+AUDIO_PATTERNS = ("*.mp3", "*.flac", "*.wav", "*.aif", "*.aiff")
+
+
+def read_tags(path: Path) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    """(artist, title, isrc) from the file's tags; Nones when unreadable."""
+    from mutagen import File as MutagenFile
+
+    try:
+        audio = MutagenFile(path, easy=True)
+    except Exception:
+        return None, None, None
+    if not audio or not audio.tags:
+        return None, None, None
+
+    def first(key: str) -> Optional[str]:
+        try:
+            values = audio.tags.get(key)
+        except Exception:
+            return None
+        return values[0] if values else None
+
+    return first("artist"), first("title"), first("isrc")
+
+
+def owned_keys(stem: str, artist: Optional[str], title: Optional[str]) -> Set[str]:
+    keys, _ = library_track_keys(stem, artist, title)
+    pairs = [(artist, title)] if artist and title else []
+    stem = clean_filename(stem)
+    if " - " in stem:
+        pairs.append(tuple(stem.split(" - ", 1)))
+    for a, t in pairs:
+        cleaned = f"{primary_artist(a)} - {clean_track_name(t)}"
+        keys.add(normalize_key(cleaned, strip_brackets=False))
+    return keys
+
+
+class OwnedIndex:
+    def __init__(self, entries: Dict[str, Dict]):
+        # path -> {"mtime", "size", "keys", "isrc"}
+        self.entries = entries
+        self.keys: Set[str] = set()
+        self.isrcs: Set[str] = set()
+        for entry in entries.values():
+            self.keys.update(entry["keys"])
+            if entry.get("isrc"):
+                self.isrcs.add(entry["isrc"])
+        self.scanned = 0
+
+    @classmethod
+    def build(cls, dirs: Iterable[Path], cache_path: Optional[str] = None) -> "OwnedIndex":
+        """Scan `dirs` (missing ones are ignored), reusing cached entries of unchanged files."""
+        cached: Dict[str, Dict] = {}
+        if cache_path and Path(cache_path).exists():
+            try:
+                payload = json.loads(Path(cache_path).read_text(encoding="utf-8"))
+            except ValueError:
+                payload = {}
+            if payload.get("version") == INDEX_VERSION:
+                cached = payload.get("files", {})
+
+        entries: Dict[str, Dict] = {}
+        scanned = 0
+        for directory in dirs:
+            directory = Path(directory).expanduser()
+            if not directory.is_dir():
+                continue
+            for pattern in AUDIO_PATTERNS:
+                for path in directory.rglob(pattern):
+                    try:
+                        stat = path.stat()
+                    except OSError:
+                        continue
+                    key = str(path)
+                    entry = cached.get(key)
+                    if entry is None or entry["mtime"] != stat.st_mtime or entry["size"] != stat.st_size:
+                        artist, title, isrc = read_tags(path)
+                        entry = {
+                            "mtime": stat.st_mtime,
+                            "size": stat.st_size,
+                            "keys": sorted(owned_keys(path.stem, artist, title)),
+                            "isrc": normalize_isrc(isrc),
+                        }
+                        scanned += 1
+                    entries[key] = entry
+
+        index = cls(entries)
+        index.scanned = scanned
+        if cache_path:
+            payload = {"version": INDEX_VERSION, "files": entries}
+            Path(cache_path).write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+        return index
+
+    def owns(self, search_string: str, isrc: Optional[str] = None) -> bool:
+        isrc = normalize_isrc(isrc)
+        if isrc and isrc in self.isrcs:
+            return True
+        return normalize_key(search_string, strip_brackets=False) in self.keys
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""BPM/Camelot neighbour index over a candidates file.
+
+The index is a JSON file next to the candidates. It holds every track's BPM
+folded to half and double time in one sorted array, plus its Camelot key
+(from the Spotify export's Key/Mode). "What mixes into this track?" is then a
+bisect over the BPM array filtered by the Camelot wheel, with no CSV rescan.
+
+    python mix_index.py build --candidates dj_candidates.csv --export spotify_export.csv
+    python mix_index.py query --candidates dj_candidates.csv --track "Artist - Title"
+"""
+import argparse
+import json
+from bisect import bisect_left, bisect_right
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from candidates_io import read_candidate_columns
+from spotify_export import iter_export_rows
+from text_normalize import clean_track_name, primary_artist
+
+INDEX_VERSION = 1
+# Tempo multipliers a track is also listed under (half-time / double-time).
+BPM_FOLDS = (1.0, 0.5, 2.0)
+DEFAULT_BPM_RANGE = 4.0
+
+
+def camelot_code(key, mode) -> Optional[str]:
+    """Spotify pitch class (0=C..11=B, -1 unknown) and mode (1 major) -> '8A'."""
+    try:
+        pitch = int(float(key))
+        major = int(float(mode)) == 1
+    except (TypeError, ValueError):
+        return None
+    if not 0 <= pitch <= 11:
+        return None
+    number = (pitch * 7 + (8 if major else 5)) % 12 or 12
+    return f"{number}{'B' if major else 'A'}"
+
+
+def camelot_neighbours(code: str) -> List[str]:
+    """Harmonically compatible keys: same key, one step either way, relative major/minor."""
+    number, letter = int(code[:-1]), code[-1]
+    other = "A" if letter == "B" else "B"
+    return [
+        code,
+        f"{(number - 2) % 12 + 1}{letter}",
+        f"{number % 12 + 1}{letter}",
+        f"{number}{other}",
+    ]
+
+
+CAMELOT_WHEEL = {
+    f"{number}{letter}": camelot_neighbours(f"{number}{letter}")
+    for number in range(1, 13)
+    for letter in "AB"
+}
+
+
+def default_index_for_candidates(candidates_file: str) -> str:
+    path = Path(candidates_file)
+    return str(path.with_name(f"{path.stem}_mix_index.json"))
+
+
+def _float_or_none(value) -> Optional[float]:
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return number if number == number else None
+
+
+def export_keys(export_file: str) -> Dict[str, str]:
+    """search_string -> Camelot code from an export, keyed like the candidates."""
+    keys: Dict[str, str] = {}
+    for row in iter_export_rows(export_file, ["Artist Name(s)", "Track Name", "Key", "Mode"]):
+        artist, track = row.get("Artist Name(s)", ""), row.get("Track Name", "")
+        if not artist.strip() or not track.strip():
+            continue
+        search_string = f"{primary_artist(artist)} - {clean_track_name(track)}"
+        code = camelot_code(row.get("Key"), row.get("Mode"))
+        if code and search_string not in keys:
+            keys[search_string] = code
+    return keys
+
+
+class MixIndex:
+    def __init__(self, tracks: List[Dict], bpm: List[float], entries: List[List]):
+        self.tracks = tracks
+        # Parallel to bpm: [track id, fold]
+        self.bpm = bpm
+        self.entries = entries
+        self._by_search = {}
+        for idx, track in enumerate(tracks):
+            self._by_search.setdefault(track["search_string"], idx)
+
+    @classmethod
+    def build(cls, candidates_file: str, export_file: Optional[str] = None) -> "MixIndex":
+        data = read_candidate_columns(
+            candidates_file, ["search_string", "bpm"], optional=["artist", "track", "energy", "style"]
+        )
+        keys = export_keys(export_file) if export_file else {}
+        tracks = []
+        folded = []
+        for i, search_string in enumerate(data["search_string"]):
+            bpm = _float_or_none(data["bpm"][i])
+            tracks.append(
+                {
+                    "search_string": search_string,
+                    "artist": data["artist"][i],
+                    "track": data["track"][i],
+                    "bpm": bpm,
+                    "energy": _float_or_none(data["energy"][i]),
+                    "style": data["style"][i],
+                    "camelot": keys.get(search_string),
+                }
+            )
+            if bpm and bpm > 0:
+                folded.extend((bpm * fold, len(tracks) - 1, fold) for fold in BPM_FOLDS)
+        folded.sort()
+        return cls(tracks, [item[0] for item in folded], [[item[1], item[2]] for item in folded])
+
+    @classmethod
+    def load(cls, path: str) -> "MixIndex":
+        payload = json.loads(Path(path).read_text(encoding="utf-8"))
+        if payload.get("version") != INDEX_VERSION:
+            raise ValueError(f"Unsupported mix index version in {path}; rebuild it")
+        return cls(payload["tracks"], payload["bpm"], payload["entries"])
+
+    def save(self, path: str) -> None:
+        payload = {
+            "version": INDEX_VERSION,
+            "camelot_wheel": CAMELOT_WHEEL,
+            "tracks": self.tracks,
+            "bpm": self.bpm,
+            "entries": self.entries,
+        }
+        Path(path).write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+
+    def find(self, search_string: str) -> Optional[Dict]:
+        idx = self._by_search.get(search_string)
+        return None if idx is None else self.tracks[idx]
+
+    def compatible(
+        self,
+        search_string: Optional[str] = None,
+        bpm: Optional[float] = None,
+        camelot: Optional[str] = None,
+        bpm_range: float = DEFAULT_BPM_RANGE,
+        fold: bool = True,
+        harmonic: bool = True,
+        limit: Optional[int] = 20,
+    ) -> List[Dict]:
+        """Tracks within bpm_range BPM (optionally half/double time) and a
+        neighbouring Camelot key, closest tempo first.
+
+        Pass search_string to use a track from the index as the seed, or
+        bpm/camelot directly.
+        """
+        seed_idx = None
+        if search_string is not None:
+            seed_idx = self._by_search.get(search_string)
+            if seed_idx is None:
+                raise KeyError(f"Track not in index: {search_string}")
+            seed = self.tracks[seed_idx]
+            bpm = seed["bpm"] if bpm is None else bpm
+            camelot = seed["camelot"] if camelot is None else camelot
+        if not bpm:
+            raise ValueError("A seed BPM is required")
+
+        keys = set(CAMELOT_WHEEL.get(camelot, ())) if harmonic and camelot else None
+        lo = bisect_left(self.bpm, bpm - bpm_range)
+        hi = bisect_right(self.bpm, bpm + bpm_range)
+        best: Dict[int, tuple] = {}
+        for pos in range(lo, hi):
+            idx, factor = self.entries[pos]
+            if idx == seed_idx or (factor != 1.0 and not fold):
+                continue
+            if keys is not None and self.tracks[idx]["camelot"] not in keys:
+                continue
+            delta = abs(self.bpm[pos] - bpm)
+            if idx not in best or delta < best[idx][0]:
+                best[idx] = (delta, factor)
+
+        ranked = sorted(best.items(), key=lambda item: (item[1][0], item[1][1] != 1.0, item[0]))
+        if limit is not None:
+            ranked = ranked[:limit]
+        return [
+            {**self.tracks[idx], "bpm_delta": round(delta, 2), "fold": factor}
+            for idx, (delta, factor) in ranked
+        ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build or query the BPM/Camelot mix index")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    build = sub.add_parser("build", help="Write the index next to a candidates file")
+    build.add_argument("--candidates", default="dj_candidates.csv", help="Candidates CSV/Parquet/Arrow")
+    build.add_argument("--export", default=None, help="Spotify export with Key/Mode (enables Camelot matching)")
+    build.add_argument("--output", default=None, help="Index path (default: <candidates_stem>_mix_index.json)")
+
+    query = sub.add_parser("query", help="List tracks that mix well with a track or BPM/key")
+    query.add_argument("--candidates", default="dj_candidates.csv", help="Candidates file the index belongs to")
+    query.add_argument("--index", default=None, help="Index path (default: next to --candidates)")
+    query.add_argument("--track", default=None, help='Seed track as "Artist - Title" (its search_string)')
+    query.add_argument("--bpm", type=float, default=None, help="Seed BPM (overrides the track's)")
+    query.add_argument("--key", default=None, help="Seed Camelot key, e.g. 8A (overrides the track's)")
+    query.add_argument("--bpm-range", type=float, default=DEFAULT_BPM_RANGE, help="Allowed BPM difference")
+    query.add_argument("--no-fold", action="store_true", help="Ignore half-time/double-time matches")
+    query.add_argument("--any-key", action="store_true", help="Ignore Camelot compatibility")
+    query.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    if args.command == "build":
+        if not Path(args.candidates).exists():
+            raise SystemExit(f"Candidates file not found: {args.candidates}")
+        if args.export and not Path(args.export).exists():
+            raise SystemExit(f"Export not found: {args.export}")
+        output = args.output or default_index_for_candidates(args.candidates)
+        try:
+            index = MixIndex.build(args.candidates, args.export)
+        except ValueError as exc:
+            raise SystemExit(str(exc)) from exc
+        index.save(output)
+        keyed = sum(1 for track in index.tracks if track["camelot"])
+        print(f"✅ Generado {output} ({len(index.tracks)} tracks, {keyed} with Camelot key)")
+        return
+
+    index_path = args.index or default_index_for_candidates(args.candidates)
+    if not Path(index_path).exists():
+        raise SystemExit(f"Mix index not found: {index_path} (run: mix_index.py build)")
+    if args.track is None and args.bpm is None:
+        raise SystemExit("Pass --track or --bpm")
+    try:
+        index = MixIndex.load(index_path)
+        results = index.compatible(
+            search_string=args.track,
+            bpm=args.bpm,
+            camelot=args.key.upper() if args.key else None,
+            bpm_range=args.bpm_range,
+            fold=not args.no_fold,
+            harmonic=not args.any_key,
+            limit=args.limit,
+        )
+    except (KeyError, ValueError) as exc:
+        raise SystemExit(str(exc).strip("'\"")) from exc
+    for result in results:
+        fold = "" if result["fold"] == 1.0 else f" (x{result['fold']:g})"
+        print(f"{result['bpm']:>6g}  {result['camelot'] or '-':>3}  ±{result['bpm_delta']:<5g}{fold}  {result['search_string']}")
+    print(f"🎧 {len(results)} compatible tracks")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Per-peer track record across dj_to_slskd_pipeline runs.
+
+A SQLite table keyed by Soulseek username holds decayed counts of
+successful and failed enqueues/transfers plus observed download speed.
+Counts lose half their weight every `half_life_days`, so old behaviour
+fades. prior() turns a peer's record into a ranking bonus or penalty.
+"""
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+DEFAULT_HALF_LIFE_DAYS = 30.0
+# Outcome weights: a finished (or failed) transfer says more than an enqueue.
+ENQUEUE_WEIGHT = 0.5
+TRANSFER_WEIGHT = 1.0
+# Ranking prior: +/- RELIABILITY_WEIGHT for always/never delivering, plus up
+# to SPEED_WEIGHT for peers that downloaded at SPEED_FULL bytes/s or more.
+RELIABILITY_WEIGHT = 40.0
+SPEED_WEIGHT = 15.0
+SPEED_FULL = 1_000_000
+
+
+class PeerReputation:
+    def __init__(self, path: str, half_life_days: float = DEFAULT_HALF_LIFE_DAYS):
+        self.path = path
+        self.half_life = half_life_days * 86400
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS peers ("
+                "username TEXT PRIMARY KEY, successes REAL NOT NULL, failures REAL NOT NULL, "
+                "speed_sum REAL NOT NULL, speed_weight REAL NOT NULL, updated_at REAL NOT NULL)"
+            )
+
+    def _decay(self, age: float) -> float:
+        return 0.5 ** (max(age, 0.0) / self.half_life) if self.half_life > 0 else 1.0
+
+    def _record(
+        self, username: str, success: float, failure: float, speed: Optional[float], now: Optional[float]
+    ) -> None:
+        now = time.time() if now is None else now
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT successes, failures, speed_sum, speed_weight, updated_at FROM peers WHERE username = ?",
+                (username,),
+            ).fetchone()
+            successes = failures = speed_sum = speed_weight = 0.0
+            if row:
+                factor = self._decay(now - row[4])
+                successes, failures, speed_sum, speed_weight = (value * factor for value in row[:4])
+            successes += success
+            failures += failure
+            if speed:
+                speed_sum += speed
+                speed_weight += 1
+            self._conn.execute(
+                "INSERT OR REPLACE INTO peers VALUES (?, ?, ?, ?, ?, ?)",
+                (username, successes, failures, speed_sum, speed_weight, now),
+            )
+
+    def record_enqueue(self, username: str, ok: bool, now: Optional[float] = None) -> None:
+        self._record(username, ENQUEUE_WEIGHT if ok else 0.0, 0.0 if ok else ENQUEUE_WEIGHT, None, now)
+
+    def record_transfer(
+        self, username: str, ok: bool, speed: Optional[float] = None, now: Optional[float] = None
+    ) -> None:
+        """A finished (ok) or failed/stalled download; `speed` in bytes/s."""
+        self._record(username, TRANSFER_WEIGHT if ok else 0.0, 0.0 if ok else TRANSFER_WEIGHT, speed, now)
+
+    def priors(self, now: Optional[float] = None) -> Dict[str, float]:
+        """username -> ranking adjustment for every known peer."""
+        now = time.time() if now is None else now
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT username, successes, failures, speed_sum, speed_weight, updated_at FROM peers"
+            ).fetchall()
+        priors = {}
+        for username, successes, failures, speed_sum, speed_weight, updated_at in rows:
+            factor = self._decay(now - updated_at)
+            successes, failures = successes * factor, failures * factor
+            # Laplace-smoothed success rate: a peer with no history sits at 0.5.
+            reliability = (successes + 1) / (successes + failures + 2)
+            prior = (reliability - 0.5) * 2 * RELIABILITY_WEIGHT
+            if speed_weight:
+                prior += min(speed_sum / speed_weight / SPEED_FULL, 1.0) * SPEED_WEIGHT
+            priors[username] = prior
+        return priors
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,141 @@
+"""Durable per-query journal for dj_to_slskd_pipeline runs.
+
+Every search_string gets a row in a SQLite file next to the candidates CSV,
+moving through pending -> searching -> queued / no_results / failed, and
+queued -> completed (or back to queued on another peer) under --monitor.
+Queued rows keep the ranked alternative files for failover. Updates are
+buffered and committed in batches. With --resume, finished rows are skipped
+and everything else is retried.
+"""
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+
+PENDING = "pending"
+SEARCHING = "searching"
+QUEUED = "queued"
+NO_RESULTS = "no_results"
+FAILED = "failed"
+COMPLETED = "completed"
+FINISHED = (QUEUED, NO_RESULTS, COMPLETED)
+
+DEFAULT_BATCH_SIZE = 50
+DEFAULT_FLUSH_SECONDS = 2.0
+
+
+def default_journal_for_csv(csv_path: str) -> str:
+    path = Path(csv_path)
+    return str(path.with_name(f"{path.stem}_slskd_journal.sqlite"))
+
+
+class RunJournal:
+    def __init__(
+        self,
+        path: str,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        flush_seconds: float = DEFAULT_FLUSH_SECONDS,
+        clock=None,
+    ):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.clock = clock or time.monotonic
+        self._pending = []
+        self._last_flush = self.clock()
+        # Searches record "searching" from worker threads.
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS queries ("
+                "query TEXT PRIMARY KEY, status TEXT NOT NULL, username TEXT, filename TEXT, "
+                "detail TEXT, updated_at REAL NOT NULL, alternatives TEXT)"
+            )
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(queries)")}
+            if "alternatives" not in columns:
+                self._conn.execute("ALTER TABLE queries ADD COLUMN alternatives TEXT")
+
+    def reset(self) -> None:
+        """Forget earlier runs (a run without --resume starts over)."""
+        with self._lock, self._conn:
+            self._pending.clear()
+            self._conn.execute("DELETE FROM queries")
+
+    def add(self, queries: Iterable[str]) -> None:
+        """Register queries as pending; rows from earlier runs keep their status."""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO queries (query, status, updated_at) VALUES (?, ?, ?)",
+                [(query, PENDING, now) for query in queries],
+            )
+
+    def finished(self) -> Set[str]:
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT query FROM queries WHERE status IN ({','.join('?' * len(FINISHED))})", FINISHED
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    def status(self, query: str) -> Optional[str]:
+        self.flush()
+        with self._lock:
+            row = self._conn.execute("SELECT status FROM queries WHERE query = ?", (query,)).fetchone()
+        return row[0] if row else None
+
+    def queued(self) -> List[Dict]:
+        """Queued rows with their remaining alternatives ({username, filename, size} dicts)."""
+        self.flush()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT query, username, filename, alternatives FROM queries WHERE status = ?", (QUEUED,)
+            ).fetchall()
+        return [
+            {
+                "query": query,
+                "username": username,
+                "filename": filename,
+                "alternatives": json.loads(alternatives) if alternatives else [],
+            }
+            for query, username, filename, alternatives in rows
+        ]
+
+    def record(
+        self,
+        query: str,
+        status: str,
+        username: Optional[str] = None,
+        filename: Optional[str] = None,
+        detail: Optional[str] = None,
+        alternatives: Optional[List[Dict]] = None,
+    ) -> None:
+        """Buffer a status change; committed once the batch is full or old enough."""
+        alternatives_json = json.dumps(alternatives, ensure_ascii=False) if alternatives else None
+        with self._lock:
+            self._pending.append((status, username, filename, detail, alternatives_json, time.time(), query))
+            due = (
+                len(self._pending) >= self.batch_size
+                or self.clock() - self._last_flush >= self.flush_seconds
+            )
+        if due:
+            self.flush()
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._pending:
+                with self._conn:
+                    self._conn.executemany(
+                        "UPDATE queries SET status = ?, username = ?, filename = ?, detail = ?, "
+                        "alternatives = ?, updated_at = ? WHERE query = ?",
+                        self._pending,
+                    )
+                self._pending.clear()
+            self._last_flush = self.clock()
+
+    def close(self) -> None:
+        self.flush()
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""Micro-benchmark: strings/sec for the old per-script normalizers vs text_normalize."""
+import argparse
+import random
+import re
+import sys
+import time
+import unicodedata
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from text_normalize import normalize_key  # noqa: E402
+
+
+def legacy_normalize(text: str) -> str:
+    text = text or ""
+    text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode()
+    text = text.lower()
+    text = re.sub(r"\(.*?\)|\[.*?\]|\{.*?\}", " ", text)
+    text = text.replace("&", " and ")
+    text = re.sub(r"[^a-z0-9]+", " ", text)
+    text = re.sub(r"\s+", " ", text).strip()
+    return text
+
+
+def sample_strings(count: int, distinct: int, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    artists = ["Artist %d" % i for i in range(distinct)] + ["Café Del Mar", "Röyksopp", "Âme & Dixon"]
+    titles = ["Track %d (Extended Mix)" % i for i in range(distinct)] + ["Señorita [Remastered]"]
+    pool = [f"{rng.choice(artists)} - {rng.choice(titles)}" for _ in range(distinct)] + artists
+    return [rng.choice(pool) for _ in range(count)]
+
+
+def rate(fn, strings) -> float:
+    start = time.perf_counter()
+    for text in strings:
+        fn(text)
+    return len(strings) / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark text normalization throughput.")
+    parser.add_argument("--count", type=int, default=200_000, help="Strings to normalize")
+    parser.add_argument("--distinct", type=int, default=2_000, help="Distinct strings to draw from")
+    args = parser.parse_args()
+
+    strings = sample_strings(args.count, args.distinct)
+    before = rate(legacy_normalize, strings)
+    normalize_key.cache_clear()
+    uncached = rate(normalize_key.__wrapped__, strings)
+    after = rate(normalize_key, strings)
+    print(f"legacy re.sub chain: {before:,.0f} strings/sec")
+    print(f"text_normalize (no memo): {uncached:,.0f} strings/sec ({uncached / before:.1f}x)")
+    print(f"text_normalize (memoized): {after:,.0f} strings/sec ({after / before:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
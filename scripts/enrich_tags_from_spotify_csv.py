@@ -2,9 +2,7 @@
 import argparse
 import csv
 import os
-import re
 import sys
-import unicodedata
 from difflib import SequenceMatcher
 from pathlib import Path
 
@@ -12,6 +10,40 @@ from mutagen import File as MutagenFile
 from mutagen.id3 import ID3, TPE1, TIT2, TALB, TDRC, TCON, TPUB, TBPM, TXXX, TSRC
 from mutagen.flac import FLAC
 
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from spotify_export import iter_export_rows  # noqa: E402
+from text_normalize import (  # noqa: E402
+    artist_list,
+    clean_filename,
+    normalize_isrc,
+    normalize_key,
+    strip_mix_suffix,
+)
+
+# Export columns used for matching, tagging and the report; the rest of a
+# wide export is never loaded.
+EXPORT_COLUMNS = [
+    "Track URI",
+    "Track Name",
+    "Album Name",
+    "Artist Name(s)",
+    "Release Date",
+    "Duration (ms)",
+    "Genres",
+    "Record Label",
+    "Tempo",
+    "Energy",
+    "Danceability",
+    "Key",
+    "Loudness",
+    "Valence",
+    "Instrumentalness",
+    "ISRC",
+]
+
 
 def _setup_logging() -> None:
     script_path = Path(__file__).resolve()
@@ -44,29 +76,7 @@ def _setup_logging() -> None:
     sys.stderr = Tee(sys.stderr, log_file)
 
 
-def normalize(text: str) -> str:
-    text = text or ""
-    text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode()
-    text = text.lower()
-    text = re.sub(r"\(.*?\)|\[.*?\]|\{.*?\}", " ", text)
-    text = text.replace("&", " and ")
-    text = re.sub(r"[^a-z0-9]+", " ", text)
-    text = re.sub(r"\s+", " ", text).strip()
-    return text
-
-
-def clean_filename(name: str) -> str:
-    name = name.strip()
-    name = re.sub(r"^\d{1,3}\s*[-._]\s*", "", name)
-    name = re.sub(r"^\d{1,3}\s+", "", name)
-    return name
-
-
-def artist_list(artist_raw: str) -> list[str]:
-    if not artist_raw:
-        return []
-    parts = [p.strip() for p in artist_raw.split(";") if p.strip()]
-    return parts or [artist_raw.strip()]
+normalize = normalize_key
 
 
 def generate_keys(row: dict) -> set[str]:
@@ -84,7 +94,7 @@ def generate_keys(row: dict) -> set[str]:
     if len(artists) > 1:
         keys.add(normalize(f"{' & '.join(artists)} - {track}"))
 
-    track_clean = re.sub(r"\s*-\s*.*(remix|mix|edit|version|rework)\b.*", "", track, flags=re.IGNORECASE)
+    track_clean = strip_mix_suffix(track)
     if track_clean and track_clean != track:
         keys.add(normalize(f"{artist_primary} - {track_clean}"))
 
@@ -96,7 +106,7 @@ def generate_title_keys(row: dict) -> set[str]:
         return set()
     keys = set()
     keys.add(normalize(track))
-    track_clean = re.sub(r"\s*-\s*.*(remix|mix|edit|version|rework)\b.*", "", track, flags=re.IGNORECASE)
+    track_clean = strip_mix_suffix(track)
     if track_clean and track_clean != track:
         keys.add(normalize(track_clean))
     return {k for k in keys if k}
@@ -187,13 +197,6 @@ def extract_isrc(path: Path) -> str | None:
     return None
 
 
-def normalize_isrc(value: str | None) -> str | None:
-    if not value:
-        return None
-    normalized = re.sub(r"[^A-Za-z0-9]", "", str(value)).upper()
-    return normalized or None
-
-
 def extract_duration_ms(path: Path) -> int | None:
     try:
         audio = MutagenFile(path, easy=False)
@@ -339,18 +342,16 @@ def main() -> None:
     candidates = []
     title_candidates = []
     isrc_map = {}
-    with csv_path.open(newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            isrc = normalize_isrc(row.get("ISRC") or row.get("isrc"))
-            if isrc:
-                isrc_map[isrc] = row
-            keys = generate_keys(row)
-            for k in keys:
-                candidates.append((k, row))
-            tkeys = generate_title_keys(row)
-            for k in tkeys:
-                title_candidates.append((k, row))
+    for row in iter_export_rows(csv_path, EXPORT_COLUMNS):
+        isrc = normalize_isrc(row.get("ISRC") or row.get("isrc"))
+        if isrc:
+            isrc_map[isrc] = row
+        keys = generate_keys(row)
+        for k in keys:
+            candidates.append((k, row))
+        tkeys = generate_title_keys(row)
+        for k in tkeys:
+            title_candidates.append((k, row))
 
     input_dir = Path(args.input_dir).expanduser()
     files = []
@@ -1,14 +1,21 @@
 #!/usr/bin/env python3
 import argparse
-import csv
 import os
 import re
 import sys
-import unicodedata
 from pathlib import Path
 
 from mutagen import File as MutagenFile
 
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from candidates_io import iter_candidate_rows  # noqa: E402
+from library_index import AUDIO_PATTERNS  # noqa: E402
+from mix_index import DEFAULT_BPM_RANGE, MixIndex, default_index_for_candidates  # noqa: E402
+from text_normalize import clean_filename, library_track_keys, normalize_key  # noqa: E402
+
 
 def _setup_logging() -> None:
     script_path = Path(__file__).resolve()
@@ -42,20 +49,7 @@ def _setup_logging() -> None:
 
 
 def normalize(text: str) -> str:
-    text = text or ""
-    text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode()
-    text = text.lower()
-    text = text.replace("&", " and ")
-    text = re.sub(r"[^a-z0-9]+", " ", text)
-    text = re.sub(r"\s+", " ", text).strip()
-    return text
-
-
-def clean_filename(stem: str) -> str:
-    stem = stem.strip()
-    stem = re.sub(r"^\d{1,3}\s*[-._]\s*", "", stem)
-    stem = re.sub(r"^\d{1,3}\s+", "", stem)
-    return stem
+    return normalize_key(text, strip_brackets=False)
 
 
 def extract_tags(path: Path):
@@ -78,27 +72,12 @@ def build_index(library_dir: Path):
     index = {}
     title_index = {}
     files = []
-    for ext in ("*.mp3", "*.flac", "*.wav", "*.aif", "*.aiff"):
+    for ext in AUDIO_PATTERNS:
         files.extend(library_dir.rglob(ext))
 
     for path in files:
         artist, title = extract_tags(path)
-        keys = set()
-        title_keys = set()
-
-        if artist and title:
-            keys.add(normalize(f"{artist} - {title}"))
-            title_keys.add(normalize(title))
-
-        stem = clean_filename(path.stem)
-        if " - " in stem:
-            a, t = stem.split(" - ", 1)
-            keys.add(normalize(f"{a} - {t}"))
-            title_keys.add(normalize(t))
-        else:
-            keys.add(normalize(stem))
-            title_keys.add(normalize(stem))
-
+        keys, title_keys = library_track_keys(path.stem, artist, title)
         for k in keys:
             index.setdefault(k, []).append(path)
         for k in title_keys:
@@ -107,6 +86,30 @@ def build_index(library_dir: Path):
     return index, title_index
 
 
+def find_library_paths(index, title_index, artist: str, title: str) -> list:
+    key = normalize(f"{artist} - {title}") if artist and title else normalize(title)
+    paths = index.get(key) or []
+    if not paths and title:
+        paths = title_index.get(normalize(title)) or []
+    return paths
+
+
+def mix_playlist(mix_index_path: Path, seed: str, index, title_index, bpm_range: float) -> list:
+    """Library paths for the seed track followed by tracks that mix into it."""
+    mix = MixIndex.load(str(mix_index_path))
+    seed_track = mix.find(seed)
+    if seed_track is None:
+        raise SystemExit(f"Track not in mix index: {seed}")
+    paths = []
+    for track in [seed_track] + mix.compatible(seed, bpm_range=bpm_range, limit=None):
+        artist = (track["artist"] or "").strip()
+        title = (track["track"] or "").strip()
+        found = find_library_paths(index, title_index, artist, title)
+        if found and found[0] not in paths:
+            paths.append(found[0])
+    return paths
+
+
 def sanitize_filename(name: str) -> str:
     name = name.strip().replace("/", "-")
     name = re.sub(r"[^a-zA-Z0-9._ -]+", "", name)
@@ -114,12 +117,29 @@ def sanitize_filename(name: str) -> str:
     return name
 
 
+def write_m3u(m3u_path: Path, paths: list, dry_run: bool) -> None:
+    if dry_run:
+        print(f"[dry-run] {m3u_path} ({len(paths)} tracks)")
+        return
+    with m3u_path.open("w", encoding="utf-8") as f:
+        f.write("#EXTM3U\n")
+        for p in paths:
+            f.write(str(p) + "\n")
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(description="Export M3U playlists by style from dj_candidates.csv")
-    parser.add_argument("--csv", default="dj_candidates.csv")
+    parser.add_argument("--csv", default="dj_candidates.csv", help="Candidates CSV, .parquet or .arrow")
     parser.add_argument("--library-dir", default=os.path.expanduser("~/Music/DJ/library"))
     parser.add_argument("--out-dir", default="playlists")
     parser.add_argument("--dry-run", action="store_true")
+    parser.add_argument(
+        "--mix-from",
+        default=None,
+        help='Also write a playlist of tracks that mix into this "Artist - Title" (needs the mix index)',
+    )
+    parser.add_argument("--mix-index", default=None, help="Mix index (default: <csv_stem>_mix_index.json)")
+    parser.add_argument("--bpm-range", type=float, default=DEFAULT_BPM_RANGE, help="BPM window for --mix-from")
     args = parser.parse_args()
 
     csv_path = Path(args.csv)
@@ -133,43 +153,42 @@ def main() -> None:
     out_dir = Path(args.out_dir)
     out_dir.mkdir(parents=True, exist_ok=True)
 
+    mix_index_path = None
+    if args.mix_from:
+        mix_index_path = Path(args.mix_index or default_index_for_candidates(str(csv_path)))
+        if not mix_index_path.exists():
+            raise SystemExit(f"Mix index not found: {mix_index_path} (run: mix_index.py build)")
+
     index, title_index = build_index(library_dir)
 
     playlists = {}
     matched = 0
     skipped = 0
 
-    with csv_path.open(newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            style = (row.get("style") or "Unknown").strip() or "Unknown"
-            artist = (row.get("artist") or "").strip()
-            title = (row.get("track") or "").strip()
+    # Only style/artist/track are loaded (CSV, Parquet or Arrow input).
+    for row in iter_candidate_rows(csv_path, [], optional=["style", "artist", "track"]):
+        style = (row.get("style") or "Unknown").strip() or "Unknown"
+        artist = (row.get("artist") or "").strip()
+        title = (row.get("track") or "").strip()
 
-            key = normalize(f"{artist} - {title}") if artist and title else normalize(title)
-            paths = index.get(key) or []
-            if not paths and title:
-                paths = title_index.get(normalize(title)) or []
-
-            if not paths:
-                skipped += 1
-                continue
+        paths = find_library_paths(index, title_index, artist, title)
+        if not paths:
+            skipped += 1
+            continue
 
-            # Prefer first match
-            path = paths[0]
-            playlists.setdefault(style, []).append(path)
-            matched += 1
+        # Prefer first match
+        path = paths[0]
+        playlists.setdefault(style, []).append(path)
+        matched += 1
 
     for style, paths in playlists.items():
         name = sanitize_filename(style).replace(" ", "_") or "Unknown"
-        m3u_path = out_dir / f"{name}.m3u"
-        if args.dry_run:
-            print(f"[dry-run] {m3u_path} ({len(paths)} tracks)")
-            continue
-        with m3u_path.open("w", encoding="utf-8") as f:
-            f.write("#EXTM3U\n")
-            for p in paths:
-                f.write(str(p) + "\n")
+        write_m3u(out_dir / f"{name}.m3u", paths, args.dry_run)
+
+    if mix_index_path is not None:
+        paths = mix_playlist(mix_index_path, args.mix_from, index, title_index, args.bpm_range)
+        name = sanitize_filename(f"Mix {args.mix_from}").replace(" ", "_")
+        write_m3u(out_dir / f"{name}.m3u", paths, args.dry_run)
 
     print(f"\nDone. matched={matched} skipped={skipped} styles={len(playlists)}")
 
@@ -4,7 +4,6 @@ import csv
 import hashlib
 import json
 import os
-import re
 import shutil
 import sys
 from dataclasses import dataclass
@@ -13,6 +12,12 @@ from typing import Dict, Iterable, List, Optional, Sequence
 
 from mutagen import File as MutagenFile
 
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from text_normalize import normalize_key  # noqa: E402
+
 
 AUDIO_EXTENSIONS = {
     ".mp3",
@@ -111,15 +116,7 @@ class UnionFind:
             self.rank[left_root] += 1
 
 
-def normalize_text(value: Optional[str]) -> str:
-    if not value:
-        return ""
-    text = value.lower().strip()
-    text = re.sub(r"\(.*?\)|\[.*?\]|\{.*?\}", " ", text)
-    text = text.replace("&", " and ")
-    text = re.sub(r"[^a-z0-9]+", " ", text)
-    text = re.sub(r"\s+", " ", text).strip()
-    return text
+normalize_text = normalize_key
 
 
 def compute_sha256(path: Path) -> str:
@@ -0,0 +1,87 @@
+"""On-disk cache of slskd search results.
+
+Results are stored in SQLite, keyed by the normalized search string, as a
+compact JSON copy of the responses: per peer, only the fields ranking uses.
+Entries older than the TTL are ignored and overwritten by the next search.
+"""
+import json
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional
+
+from text_normalize import normalize_key
+
+DEFAULT_TTL_HOURS = 24.0
+# Per-response and per-file fields kept in the cache.
+RESPONSE_FIELDS = ("username", "hasFreeUploadSlot", "uploadSpeed", "queueLength")
+FILE_FIELDS = ("filename", "size", "extension", "bitRate", "bitDepth", "sampleRate", "length", "isLocked")
+FILE_KEYS = ("files", "fileInfos", "results", "file_results")
+
+
+def cache_key(query: str) -> str:
+    # Keep bracketed parts: "Track (Remix)" and "Track" are different searches.
+    return normalize_key(query, strip_brackets=False)
+
+
+def compact_responses(responses: List[Dict]) -> List[Dict]:
+    """Responses reduced to RESPONSE_FIELDS plus `files` with FILE_FIELDS."""
+    compact = []
+    for response in responses:
+        files = []
+        for key in FILE_KEYS:
+            if isinstance(response.get(key), list):
+                files = response[key]
+                break
+        item = {field: response[field] for field in RESPONSE_FIELDS if field in response}
+        item["files"] = [
+            {field: f[field] for field in FILE_FIELDS if field in f} for f in files if isinstance(f, dict)
+        ]
+        compact.append(item)
+    return compact
+
+
+class SearchCache:
+    def __init__(self, path: str, ttl_hours: float = DEFAULT_TTL_HOURS):
+        self.path = path
+        self.ttl = ttl_hours * 3600
+        self.hits = 0
+        # Worker threads share the connection; sqlite3 calls are serialized.
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS searches ("
+                "key TEXT PRIMARY KEY, query TEXT NOT NULL, stored_at REAL NOT NULL, responses TEXT NOT NULL)"
+            )
+
+    def get(self, query: str, now: Optional[float] = None) -> Optional[List[Dict]]:
+        """Cached responses for `query`, or None if missing or stale."""
+        now = time.time() if now is None else now
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT stored_at, responses FROM searches WHERE key = ?", (cache_key(query),)
+            ).fetchone()
+        if row is None or now - row[0] > self.ttl:
+            return None
+        self.hits += 1
+        return json.loads(row[1])
+
+    def put(self, query: str, responses: List[Dict], now: Optional[float] = None) -> None:
+        now = time.time() if now is None else now
+        payload = json.dumps(compact_responses(responses), ensure_ascii=False, separators=(",", ":"))
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO searches (key, query, stored_at, responses) VALUES (?, ?, ?, ?)",
+                (cache_key(query), query, now, payload),
+            )
+
+    def purge(self, now: Optional[float] = None) -> int:
+        """Delete stale entries; returns how many were removed."""
+        now = time.time() if now is None else now
+        with self._lock, self._conn:
+            return self._conn.execute("DELETE FROM searches WHERE stored_at < ?", (now - self.ttl,)).rowcount
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,251 @@
+"""Load Spotify playlist exports with only the columns a script needs.
+
+Exportify is the reference layout. Other exporters name the same fields
+differently, so headers are matched case-insensitively against
+COLUMN_ALIASES and renamed to the Exportify names. Columns are parsed with
+explicit dtypes: floats for audio features, categoricals for repetitive text
+and a datetime for Release Date.
+"""
+from __future__ import annotations
+
+import csv
+from typing import TYPE_CHECKING, Dict, Iterator, List, NamedTuple, Optional, Sequence
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+EXPORTIFY_COLUMNS = [
+    "Track URI",
+    "Track Name",
+    "Album Name",
+    "Artist Name(s)",
+    "Release Date",
+    "Duration (ms)",
+    "Popularity",
+    "Explicit",
+    "Added By",
+    "Added At",
+    "Genres",
+    "Record Label",
+    "Danceability",
+    "Energy",
+    "Key",
+    "Loudness",
+    "Mode",
+    "Speechiness",
+    "Acousticness",
+    "Instrumentalness",
+    "Liveness",
+    "Valence",
+    "Tempo",
+    "Time Signature",
+    "ISRC",
+]
+# Exportify name -> other spellings seen in exports (older Exportify
+# releases, TuneMyMusic, Soundiiz, hand-made sheets).
+COLUMN_ALIASES: Dict[str, tuple] = {
+    "Track URI": ("Spotify URI", "URI", "Spotify Track URI"),
+    "Track Name": ("Track", "Title", "Song", "Track Title"),
+    "Album Name": ("Album", "Album Title"),
+    "Artist Name(s)": ("Artist Name", "Artist Names", "Artists", "Artist"),
+    "Release Date": ("Album Release Date", "Released"),
+    "Duration (ms)": ("Track Duration (ms)", "Duration_ms", "Duration"),
+    "Genres": ("Genre", "Artist Genres"),
+    "Record Label": ("Label",),
+    "Tempo": ("BPM",),
+}
+FLOAT_COLUMNS = (
+    "Duration (ms)",
+    "Popularity",
+    "Danceability",
+    "Energy",
+    "Key",
+    "Loudness",
+    "Mode",
+    "Speechiness",
+    "Acousticness",
+    "Instrumentalness",
+    "Liveness",
+    "Valence",
+    "Tempo",
+    "Time Signature",
+)
+CATEGORY_COLUMNS = ("Genres", "Record Label", "Added By")
+DATE_COLUMNS = ("Release Date",)
+# Cells pandas.read_csv treats as missing by default; every engine uses them.
+PANDAS_NA_VALUES = frozenset(
+    [
+        "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND",
+        "1.#QNAN", "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null",
+    ]
+)
+
+
+class ExportLayout(NamedTuple):
+    flavour: str
+    columns: Dict[str, str]  # Exportify name -> header in the file
+
+    def rename_map(self) -> Dict[str, str]:
+        return {source: name for name, source in self.columns.items()}
+
+
+def read_header(path) -> List[str]:
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        return next(csv.reader(f), [])
+
+
+def detect_layout(header: Sequence[str]) -> ExportLayout:
+    """Map Exportify column names to the headers this export actually uses."""
+    lookup: Dict[str, str] = {}
+    for name in header:
+        lookup.setdefault(name.strip().lower(), name)
+    known = list(dict.fromkeys(EXPORTIFY_COLUMNS + list(COLUMN_ALIASES)))
+    columns: Dict[str, str] = {}
+    for name in known:
+        for spelling in (name, *COLUMN_ALIASES.get(name, ())):
+            source = lookup.get(spelling.lower())
+            if source is not None and source not in columns.values():
+                columns[name] = source
+                break
+    exact = all(name == source for name, source in columns.items())
+    flavour = "exportify" if exact and "Track URI" in columns else "generic"
+    return ExportLayout(flavour=flavour, columns=columns)
+
+
+def canonical_header(header: Sequence[str]) -> List[str]:
+    """The header with recognised columns renamed to their Exportify names."""
+    rename = detect_layout(header).rename_map()
+    return [rename.get(name, name) for name in header]
+
+
+def _csv_engine() -> str:
+    try:
+        import pyarrow.csv  # noqa: F401
+    except Exception:
+        return "c"
+    return "pyarrow"
+
+
+def _read_pyarrow(path, names: Sequence[str], layout: ExportLayout, numeric: bool) -> "pd.DataFrame":
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+
+    column_types = {}
+    for name in names:
+        if name in FLOAT_COLUMNS:
+            if numeric:
+                column_types[layout.columns[name]] = pa.float64()
+        elif name in CATEGORY_COLUMNS:
+            column_types[layout.columns[name]] = pa.dictionary(pa.int32(), pa.string())
+        else:
+            column_types[layout.columns[name]] = pa.string()
+    options = pacsv.ConvertOptions(
+        column_types=column_types,
+        include_columns=[layout.columns[name] for name in names],
+        null_values=sorted(PANDAS_NA_VALUES),
+        strings_can_be_null=True,
+    )
+    return pacsv.read_csv(str(path), convert_options=options).to_pandas()
+
+
+def _dtypes(names: Sequence[str], layout: ExportLayout, numeric: bool) -> Dict[str, object]:
+    dtypes: Dict[str, object] = {}
+    for name in names:
+        source = layout.columns[name]
+        if name in FLOAT_COLUMNS:
+            if numeric:
+                dtypes[source] = "float64"
+        elif name in CATEGORY_COLUMNS:
+            dtypes[source] = "category"
+        else:
+            dtypes[source] = str
+    return dtypes
+
+
+def load_export(
+    path,
+    columns: Sequence[str],
+    optional: Sequence[str] = (),
+    engine: Optional[str] = None,
+) -> "pd.DataFrame":
+    """Typed frame of the wanted columns, named as in Exportify.
+
+    Columns the export lacks are left out; callers check for the ones they
+    require. When a numeric column holds stray text the file is re-read with
+    numeric types inferred, leaving that column as text for the caller to
+    coerce.
+    """
+    import pandas as pd
+
+    layout = detect_layout(read_header(path))
+    names = [name for name in dict.fromkeys([*columns, *optional]) if name in layout.columns]
+    engine = engine or _csv_engine()
+
+    def read(numeric: bool) -> "pd.DataFrame":
+        if engine == "pyarrow":
+            # pyarrow.csv directly: pandas' engine="pyarrow" casts dtypes after
+            # parsing, which is lenient ("1_0" -> 10.0) and fails on int + NA.
+            return _read_pyarrow(path, names, layout, numeric)
+        return pd.read_csv(
+            path,
+            usecols=[layout.columns[name] for name in names],
+            dtype=_dtypes(names, layout, numeric),
+            encoding="utf-8",
+            # Parse floats exactly like float(), as the pandas-free engine does.
+            float_precision="round_trip",
+        )
+
+    try:
+        df = read(True)
+    except ValueError:
+        df = read(False)
+    df = df.rename(columns=layout.rename_map())[names]
+    for name in FLOAT_COLUMNS:
+        # Clean columns of the untyped retry came back as int/float.
+        if name in df.columns and df[name].dtype.kind in "iuf":
+            df[name] = df[name].astype("float64")
+    for name in DATE_COLUMNS:
+        if name in df.columns:
+            df[name] = pd.to_datetime(df[name], errors="coerce", format="mixed")
+    return df
+
+
+def iter_export_chunks(
+    path, columns: Sequence[str], chunksize: int, optional: Sequence[str] = ()
+) -> Iterator["pd.DataFrame"]:
+    """load_export in chunks; numeric dtypes are inferred per chunk."""
+    import pandas as pd
+
+    layout = detect_layout(read_header(path))
+    names = [name for name in dict.fromkeys([*columns, *optional]) if name in layout.columns]
+    reader = pd.read_csv(
+        path,
+        usecols=[layout.columns[name] for name in names],
+        dtype=_dtypes(names, layout, numeric=False),
+        float_precision="round_trip",
+        chunksize=chunksize,
+        encoding="utf-8",
+    )
+    rename = layout.rename_map()
+    for chunk in reader:
+        yield chunk.rename(columns=rename)[names]
+
+
+def iter_export_rows(path, columns: Sequence[str]) -> Iterator[Dict[str, str]]:
+    """Rows as {Exportify name: raw cell text}, keeping only `columns`.
+
+    Cells are returned exactly as written (no NA handling), like
+    csv.DictReader; columns missing from the export are absent from rows.
+    """
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        layout = detect_layout(header)
+        positions = {source: idx for idx, source in reversed(list(enumerate(header)))}
+        picks = [
+            (name, positions[layout.columns[name]]) for name in columns if name in layout.columns
+        ]
+        for row in reader:
+            if not row:
+                continue
+            yield {name: row[idx] if idx < len(row) else "" for name, idx in picks}
@@ -0,0 +1,208 @@
+"""Style classification driven by an ordered rule table.
+
+Each rule names a style plus conditions that must all hold; the first
+matching rule wins and rows matching none get the default style. Genre
+keywords from every rule are compiled into one Aho-Corasick automaton, so a
+genres string is scanned once no matter how many keywords the table has.
+
+Config file (JSON):
+
+    {
+      "default": "House / Groovy",
+      "rules": [
+        {"style": "Tech House", "genres_any": ["tech house"]},
+        {"style": "Peak House", "bpm_gte": 126, "energy_gte": 0.65}
+      ]
+    }
+"""
+import hashlib
+import json
+from collections import deque
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence
+
+DEFAULT_STYLE = "House / Groovy"
+DEFAULT_STYLE_RULES: List[Dict] = [
+    {"style": "Garage / Breaky", "genres_any": ["garage", "break"]},
+    {"style": "Minimal / Micro", "genres_any": ["minimal", "micro"]},
+    {"style": "Tech House", "genres_any": ["tech house"]},
+    {"style": "Deep House", "genres_any": ["deep"]},
+    {"style": "Deep House", "energy_lt": 0.6},
+    {"style": "Peak House", "bpm_gte": 126, "energy_gte": 0.65},
+]
+
+# rule key -> (feature, comparison)
+THRESHOLD_FIELDS = {
+    "bpm_gte": ("bpm", "gte"),
+    "bpm_lt": ("bpm", "lt"),
+    "energy_gte": ("energy", "gte"),
+    "energy_lt": ("energy", "lt"),
+    "danceability_gte": ("danceability", "gte"),
+    "danceability_lt": ("danceability", "lt"),
+}
+GENRE_FIELDS = ("genres_any", "genres_none")
+
+
+class KeywordMatcher:
+    """Aho-Corasick automaton returning a bitmask of the keywords found."""
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords = list(dict.fromkeys(k.lower() for k in keywords if k))
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail = [0]
+        self._out = [0]
+        for idx, keyword in enumerate(self.keywords):
+            node = 0
+            for ch in keyword:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(0)
+                node = nxt
+            self._out[node] |= 1 << idx
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self._goto[node].items():
+                queue.append(nxt)
+                fallback = self._fail[node]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[nxt] = self._goto[fallback].get(ch, 0)
+                self._out[nxt] |= self._out[self._fail[nxt]]
+
+    def bit(self, keyword: str) -> int:
+        return 1 << self.keywords.index(keyword.lower())
+
+    def scan(self, text: str) -> int:
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        found = 0
+        for ch in text:
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            found |= out[node]
+        return found
+
+
+class StyleClassifier:
+    def __init__(self, rules: Sequence[Dict], default: str = DEFAULT_STYLE):
+        self.default = default
+        self.rules = [self._validate(rule) for rule in rules]
+        keywords = [kw for rule in self.rules for field in GENRE_FIELDS for kw in rule.get(field, [])]
+        self.matcher = KeywordMatcher(keywords)
+        # Per rule: (style, any-mask, none-mask, [(feature, op, value)])
+        self._compiled = []
+        for rule in self.rules:
+            any_mask = 0
+            for kw in rule.get("genres_any", []):
+                any_mask |= self.matcher.bit(kw)
+            none_mask = 0
+            for kw in rule.get("genres_none", []):
+                none_mask |= self.matcher.bit(kw)
+            thresholds = [
+                (*THRESHOLD_FIELDS[key], float(rule[key])) for key in THRESHOLD_FIELDS if key in rule
+            ]
+            self._compiled.append((rule["style"], any_mask, none_mask, thresholds))
+
+    @staticmethod
+    def _validate(rule: Dict) -> Dict:
+        if not isinstance(rule, dict) or not rule.get("style"):
+            raise ValueError(f"Style rule needs a 'style': {rule!r}")
+        unknown = set(rule) - {"style", *GENRE_FIELDS, *THRESHOLD_FIELDS}
+        if unknown:
+            raise ValueError(f"Unknown style rule field(s): {', '.join(sorted(unknown))}")
+        for field in GENRE_FIELDS:
+            if field in rule and (
+                not isinstance(rule[field], list) or not all(isinstance(k, str) and k for k in rule[field])
+            ):
+                raise ValueError(f"'{field}' must be a list of keywords in rule {rule['style']!r}")
+        return rule
+
+    @property
+    def signature(self) -> str:
+        """Stable digest of the rule table, for cache invalidation."""
+        payload = json.dumps({"default": self.default, "rules": self.rules}, sort_keys=True)
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+    def classify(self, genres, bpm, energy, danceability=0.0) -> str:
+        found = self.matcher.scan(str(genres).lower())
+        features = {"bpm": bpm, "energy": energy, "danceability": danceability}
+        for style, any_mask, none_mask, thresholds in self._compiled:
+            if any_mask and not (found & any_mask):
+                continue
+            if found & none_mask:
+                continue
+            if all(
+                (features[name] >= value) if op == "gte" else (features[name] < value)
+                for name, op, value in thresholds
+            ):
+                return style
+        return self.default
+
+    def classify_frame(self, genres, bpm, energy, danceability=None):
+        """Vectorized classify over pandas Series; returns a numpy array of styles.
+
+        Genre strings are factorized first, so the automaton runs once per
+        distinct string and every rule becomes one boolean mask.
+        """
+        import numpy as np
+        import pandas as pd
+
+        codes, uniques = pd.factorize(pd.Series(genres).astype(str).str.lower(), use_na_sentinel=False)
+        # Distinct genre strings collapse further into distinct keyword-hit
+        # bitmasks; rules are evaluated once per bitmask, not per string.
+        combo_ids: Dict[int, int] = {}
+        unique_combo = np.array(
+            [combo_ids.setdefault(self.matcher.scan(str(text).lower()), len(combo_ids)) for text in uniques],
+            dtype=np.intp,
+        )
+        row_combo = unique_combo[codes]
+        combos = list(combo_ids)
+        features = {
+            "bpm": np.asarray(bpm, dtype=float),
+            "energy": np.asarray(energy, dtype=float),
+            "danceability": (
+                np.zeros(len(codes)) if danceability is None else np.asarray(danceability, dtype=float)
+            ),
+        }
+        conditions = []
+        choices = []
+        for style, any_mask, none_mask, thresholds in self._compiled:
+            mask = np.ones(len(codes), dtype=bool)
+            if any_mask or none_mask:
+                per_combo = np.array(
+                    [(not any_mask or bool(f & any_mask)) and not (f & none_mask) for f in combos],
+                    dtype=bool,
+                )
+                mask &= per_combo[row_combo]
+            for name, op, value in thresholds:
+                mask &= (features[name] >= value) if op == "gte" else (features[name] < value)
+            conditions.append(mask)
+            choices.append(style)
+        if not conditions:
+            return np.full(len(codes), self.default, dtype=object)
+        return np.select(conditions, choices, default=self.default)
+
+
+def load_style_rules(path: Optional[str]) -> StyleClassifier:
+    """Classifier from a JSON rule file, or the built-in rules when path is None."""
+    if not path:
+        return StyleClassifier(DEFAULT_STYLE_RULES)
+    config_path = Path(path).expanduser()
+    if not config_path.exists():
+        raise ValueError(f"Style rules not found: {config_path}")
+    config = json.loads(config_path.read_text(encoding="utf-8"))
+    if isinstance(config, list):
+        config = {"rules": config}
+    if not isinstance(config, dict) or not isinstance(config.get("rules"), list):
+        raise ValueError("Style rules file must contain a 'rules' list")
+    return StyleClassifier(config["rules"], default=config.get("default", DEFAULT_STYLE))
+
+
+DEFAULT_CLASSIFIER = StyleClassifier(DEFAULT_STYLE_RULES)
@@ -0,0 +1,58 @@
+from datetime import datetime, timezone
+import types
+
+import api_guard as mod
+
+
+class FakeHTTPError(Exception):
+    def __init__(self, headers):
+        super().__init__("429")
+        self.response = types.SimpleNamespace(headers=headers)
+
+
+def test_retry_after_seconds_and_http_date():
+    assert mod.retry_after(FakeHTTPError({"Retry-After": "7"})) == 7.0
+    now = datetime(2024, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
+    assert mod.retry_after(FakeHTTPError({"Retry-After": "Mon, 01 Jan 2024 12:00:30 GMT"}), now=now) == 30.0
+    assert mod.retry_after(FakeHTTPError({"Retry-After": "3600"})) == mod.RETRY_AFTER_MAX
+    assert mod.retry_after(FakeHTTPError({"Retry-After": "soon"})) is None
+    assert mod.retry_after(ValueError("no response")) is None
+
+
+def test_token_bucket_limits_rate_and_honours_pause(monkeypatch):
+    now = {"t": 0.0}
+    sleeps = []
+
+    def sleep(seconds):
+        sleeps.append(round(seconds, 3))
+        now["t"] += seconds
+
+    monkeypatch.setattr(mod.time, "sleep", sleep)
+    bucket = mod.TokenBucket(rate=2, burst=2, clock=lambda: now["t"])
+    for _ in range(4):
+        bucket.acquire()
+    assert sleeps == [0.5, 0.5]
+
+    bucket.pause(10)
+    bucket.acquire()
+    assert now["t"] == 11.5  # paused 10s, then refilled from empty
+    assert bucket.waited == sum(sleeps)
+
+
+def test_circuit_breaker_opens_probes_and_closes():
+    now = {"t": 0.0}
+    breaker = mod.CircuitBreaker(threshold=2, cooldown=30, clock=lambda: now["t"])
+    assert breaker.failure() is False
+    assert breaker.failure() is True
+    assert breaker.opened_at == 0.0
+
+    now["t"] = 31
+    breaker.wait()  # cooldown over: this caller probes
+    assert breaker.probing
+    assert breaker.failure() is True  # failed probe reopens at once
+    assert (breaker.opened_at, breaker.trips) == (31, 2)
+
+    now["t"] = 62
+    breaker.wait()
+    breaker.success()
+    assert breaker.opened_at is None and breaker.failures == 0
@@ -0,0 +1,63 @@
+import pytest
+
+import candidates_io as mod
+
+
+def test_candidates_format():
+    assert mod.candidates_format("dj_candidates.csv") == "csv"
+    assert mod.candidates_format("dj_candidates.parquet") == "parquet"
+    assert mod.candidates_format("dj_candidates.ARROW") == "arrow"
+    assert mod.candidates_format("dj_candidates.feather") == "arrow"
+
+
+def test_read_candidate_columns_csv(tmp_path):
+    path = tmp_path / "c.csv"
+    path.write_text("artist,track,style\nA,T,Deep House\nB,U,\n", encoding="utf-8")
+    data = mod.read_candidate_columns(path, ["track"], optional=["style", "label"])
+    assert data == {"track": ["T", "U"], "style": ["Deep House", ""], "label": [None, None]}
+
+
+def test_read_candidate_columns_missing(tmp_path):
+    path = tmp_path / "c.csv"
+    path.write_text("artist\nA\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="search_string"):
+        mod.read_candidate_columns(path, ["search_string"])
+
+
+@pytest.mark.parametrize("suffix", [".parquet", ".arrow"])
+def test_columnar_roundtrip_loads_only_requested_columns(tmp_path, suffix):
+    pa = pytest.importorskip("pyarrow")
+    table = pa.table(
+        {
+            "artist": ["A", "B"],
+            "track": ["T", "U"],
+            "bpm": pa.array([124, 128], type=pa.int32()),
+            "energy": [0.5, 0.75],
+            "danceability": [0.6, 0.7],
+            "style": pa.array(["Deep House", "Peak House"]).dictionary_encode(),
+            "label": ["L", ""],
+            "genres": ["deep house", ""],
+            "search_string": ["A - T", "B - U"],
+        }
+    ).cast(mod.candidates_schema())
+    path = tmp_path / f"c{suffix}"
+    mod.write_columnar_table(table, path)
+
+    rows = list(mod.iter_candidate_rows(path, ["search_string", "bpm"]))
+    assert rows == [{"search_string": "A - T", "bpm": 124}, {"search_string": "B - U", "bpm": 128}]
+
+
+@pytest.mark.parametrize("suffix", [".parquet", ".arrow"])
+def test_write_columnar_from_csv(tmp_path, suffix):
+    pytest.importorskip("pyarrow")
+    csv_path = tmp_path / "c.csv"
+    csv_path.write_text(
+        "artist,track,bpm,energy,danceability,style,label,genres,search_string\n"
+        "A,T,124,0.5,0.6,Deep House,,,A - T\n"
+        "B,U,128,0.75,0.7,Peak House,L,house,B - U\n",
+        encoding="utf-8",
+    )
+    out = tmp_path / f"c{suffix}"
+    assert mod.write_columnar_from_csv(csv_path, out, {"Deep House", "Peak House"}) == 2
+    data = mod.read_candidate_columns(out, ["style", "energy", "label"])
+    assert data == {"style": ["Deep House", "Peak House"], "energy": [0.5, 0.75], "label": ["", "L"]}
@@ -1,4 +1,9 @@
+import subprocess
+import sys
+from pathlib import Path
+
 import pandas as pd
+import pytest
 
 import csv_to_dj_pipeline as mod
 
@@ -86,3 +91,286 @@ def test_build_candidates_dataframe_empty():
 def test_default_output_for_input():
     assert mod.default_output_for_input("spotify_export.csv") == "spotify_export_dj_candidates.csv"
     assert mod.default_output_for_input("csv/Liked_Songs.csv") == "csv/Liked_Songs_dj_candidates.csv"
+
+
+def test_build_candidates_dataframe_matches_rowwise():
+    titles = [
+        "Song (Extended Mix)",
+        "Track - Original Mix",
+        "Tune [Label Records]",
+        "Edit (Radio Edit)",
+        "Classic (2011 Remaster)",
+        "Plain Title",
+        "Song (Extended Mix)",
+    ]
+    genres = ["uk garage", "minimal techno", "tech house", "deep house", "house", "", "afro house"]
+    rows = []
+    for i in range(70):
+        rows.append(
+            {
+                "Artist Name(s)": f"Artist {i % 9}; Guest" if i % 2 else f" Artist {i % 9} ",
+                "Track Name": titles[i % len(titles)],
+                "Tempo": [120.4, 125.5, 126.5, 127.9, 0.0][i % 5],
+                "Energy": [0.005, 0.015, 0.575, 0.645, 0.655, 0.9][i % 6],
+                "Danceability": [0.125, 0.135, 0.7][i % 3],
+                "Genres": genres[i % len(genres)],
+                "Record Label": f"Label {i % 4}",
+            }
+        )
+    df = pd.DataFrame(rows)
+    # Mimic main(), which drops rows and leaves gaps in the index.
+    df = df[df.index % 11 != 0]
+
+    expected = mod.build_candidates_dataframe_rowwise(df)
+    actual = mod.build_candidates_dataframe(df)
+    pd.testing.assert_frame_equal(actual, expected)
+    assert actual.to_csv(index=False) == expected.to_csv(index=False)
+
+
+def test_infer_style_vectorized_matches_infer_style():
+    genres = pd.Series(["garage", "minimal", "tech house", "deep", "unknown", "unknown", "unknown"])
+    bpm = pd.Series([120, 120, 120, 124, 124, 126, 120])
+    energy = pd.Series([0.8, 0.8, 0.8, 0.7, 0.5, 0.65, 0.9])
+    expected = [mod.infer_style(g, b, e) for g, b, e in zip(genres, bpm, energy)]
+    assert list(mod.infer_style_vectorized(genres, bpm, energy)) == expected
+
+
+def _write_export(path, rows):
+    pd.DataFrame(rows).to_csv(path, index=False)
+
+
+def _export_rows(count):
+    rows = []
+    for i in range(count):
+        rows.append(
+            {
+                "Artist Name(s)": f"Artist {i % 7}; Guest",
+                "Track Name": f"Track {i % 13}, Part \"{i % 3}\" (Extended Mix)",
+                "Tempo": "bad" if i % 17 == 0 else 118 + (i % 15),
+                "Energy": (i % 10) / 10,
+                "Danceability": 0.5,
+                "Genres": ["tech house", "deep house", "minimal", ""][i % 4],
+                "Record Label": f"Label {i % 3}",
+            }
+        )
+    return rows
+
+
+def test_main_chunked_matches_in_memory(tmp_path):
+    export = tmp_path / "export.csv"
+    _write_export(export, _export_rows(200))
+    full = tmp_path / "full.csv"
+    chunked = tmp_path / "chunked.csv"
+
+    mod.main(str(export), str(full))
+    mod.main(str(export), str(chunked), chunksize=16)
+
+    assert chunked.read_bytes() == full.read_bytes()
+
+
+def test_main_chunked_missing_columns(tmp_path):
+    export = tmp_path / "export.csv"
+    export.write_text("Track Name\nSong\n", encoding="utf-8")
+    with pytest.raises(SystemExit, match="Missing required columns"):
+        mod.main(str(export), str(tmp_path / "out.csv"), chunksize=10)
+
+
+def test_hashed_seen_set_across_batches():
+    seen = mod.HashedSeenSet()
+    first = seen.add_new(pd.Series(["a", "b", "c"]))
+    second = seen.add_new(pd.Series(["c", "d", "a"]))
+    assert first.tolist() == [True, True, True]
+    assert second.tolist() == [False, True, False]
+    assert len(seen) == 4
+
+
+def test_main_incremental_matches_full_rebuild(tmp_path):
+    rows = _export_rows(60)
+    for i, row in enumerate(rows):
+        row["Track URI"] = f"spotify:track:{i}"
+        row["Track Name"] = f"Track {i} (Extended Mix)"
+    export = tmp_path / "export.csv"
+    output = tmp_path / "out.csv"
+    _write_export(export, rows)
+
+    mod.main(str(export), str(output), incremental=True)
+    manifest = pd.read_csv(tmp_path / "out_manifest.csv", dtype=str)
+    assert list(manifest.columns) == ["track_uri", "row_hash", "search_string"]
+    assert len(manifest) == 60
+
+    # Next week: two rows removed, one retimed, order shuffled, one added.
+    updated = [dict(row) for row in rows[2:]][::-1]
+    updated[0]["Tempo"] = 131
+    updated.append(dict(rows[0], **{"Track URI": "spotify:track:new", "Track Name": "Fresh Cut"}))
+    _write_export(export, updated)
+
+    stats = mod.incremental_candidates(
+        str(export), str(output), str(tmp_path / "out_manifest.csv"), str(tmp_path / "out_delta.csv")
+    )
+    assert stats["recomputed"] == 2
+    assert stats["reused"] == len(updated) - 2
+
+    full = tmp_path / "full.csv"
+    mod.main(str(export), str(full))
+    assert output.read_bytes() == full.read_bytes()
+
+    delta = pd.read_csv(tmp_path / "out_delta.csv")
+    assert delta["search_string"].tolist() == ["Artist 0 - Fresh Cut"]
+
+
+def test_main_incremental_requires_track_uri(tmp_path):
+    export = tmp_path / "export.csv"
+    _write_export(export, _export_rows(3))
+    with pytest.raises(SystemExit, match="Track URI"):
+        mod.main(str(export), str(tmp_path / "out.csv"), incremental=True)
+
+
+@pytest.mark.parametrize("suffix", [".parquet", ".arrow"])
+@pytest.mark.parametrize("chunksize", [None, 16])
+def test_main_columnar_output_is_typed(tmp_path, suffix, chunksize):
+    pa = pytest.importorskip("pyarrow")
+    export = tmp_path / "export.csv"
+    _write_export(export, _export_rows(120))
+    expected = tmp_path / "expected.csv"
+    output = tmp_path / f"out{suffix}"
+    mod.main(str(export), str(expected))
+    mod.main(str(export), str(output), chunksize=chunksize)
+
+    if suffix == ".parquet":
+        import pyarrow.parquet as pq
+
+        schema = pq.read_schema(str(output))
+    else:
+        import pyarrow.feather as feather
+
+        schema = feather.read_table(str(output)).schema
+    assert pa.types.is_dictionary(schema.field("style").type)
+    assert schema.field("bpm").type == pa.int32()
+    assert schema.field("energy").type == pa.float64()
+
+    pd.testing.assert_frame_equal(
+        mod.read_candidates_frame(str(output)),
+        mod.read_candidates_frame(str(expected)),
+        check_dtype=False,
+    )
+
+
+def test_default_output_for_input_format():
+    assert mod.default_output_for_input("a.csv", "parquet") == "a_dj_candidates.parquet"
+    assert mod.default_output_for_input("a.csv", "arrow") == "a_dj_candidates.arrow"
+
+
+def test_resolve_batch_inputs_skips_generated_files(tmp_path):
+    for name in ["a.csv", "b.csv", "a_dj_candidates.csv", "a_dj_candidates_manifest.csv", "notes.txt"]:
+        (tmp_path / name).write_text("x\n", encoding="utf-8")
+    assert [p.name for p in mod.resolve_batch_inputs(str(tmp_path))] == ["a.csv", "b.csv"]
+    assert [p.name for p in mod.resolve_batch_inputs(str(tmp_path / "b*.csv"))] == ["b.csv"]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_run_batch_writes_per_file_and_merged(tmp_path, workers):
+    rows = _export_rows(40)
+    _write_export(tmp_path / "crate_a.csv", rows[:25])
+    _write_export(tmp_path / "crate_b.csv", rows[15:])
+    (tmp_path / "broken.csv").write_text("Track Name\nSong\n", encoding="utf-8")
+    _write_export(tmp_path / "all.csv", rows)
+
+    inputs = [tmp_path / "crate_a.csv", tmp_path / "crate_b.csv", tmp_path / "broken.csv"]
+    merged = tmp_path / "merged.csv"
+    results = mod.run_batch(inputs, str(merged), workers=workers)
+
+    assert [r["input"] for r in results] == [str(tmp_path / "crate_a.csv"), str(tmp_path / "crate_b.csv")]
+    assert (tmp_path / "crate_a_dj_candidates.csv").exists()
+    assert (tmp_path / "crate_b_dj_candidates.csv").exists()
+
+    full = tmp_path / "full.csv"
+    mod.main(str(tmp_path / "all.csv"), str(full))
+    assert merged.read_bytes() == full.read_bytes()
+
+
+def test_main_with_style_rules_and_incremental_invalidation(tmp_path):
+    rows = _export_rows(20)
+    for i, row in enumerate(rows):
+        row["Track URI"] = f"spotify:track:{i}"
+        row["Track Name"] = f"Track {i}"
+    export = tmp_path / "export.csv"
+    _write_export(export, rows)
+    rules = tmp_path / "rules.json"
+    rules.write_text('{"default": "Everything", "rules": []}', encoding="utf-8")
+    output = tmp_path / "out.csv"
+
+    mod.main(str(export), str(output), incremental=True)
+    assert "Everything" not in set(pd.read_csv(output)["style"])
+
+    mod.main(str(export), str(output), incremental=True, style_rules=str(rules))
+    assert set(pd.read_csv(output)["style"]) == {"Everything"}
+
+
+def test_main_invalid_style_rules(tmp_path):
+    export = tmp_path / "export.csv"
+    _write_export(export, _export_rows(3))
+    rules = tmp_path / "rules.json"
+    rules.write_text('{"rules": [{"style": "X", "nope": 1}]}', encoding="utf-8")
+    with pytest.raises(SystemExit, match="Invalid style rules"):
+        mod.main(str(export), str(tmp_path / "out.csv"), style_rules=str(rules))
+
+
+def test_csv_engine_matches_pandas_engine(tmp_path):
+    export = tmp_path / "export.csv"
+    _write_export(export, _export_rows(120))
+    with export.open("a", encoding="utf-8") as f:
+        f.write('NA,Missing Artist,120,0.5,0.5,house,L\n')
+        f.write('Artist X,"Track, Quoted",inf,-0,0.615,,123\n')
+        f.write('Artist Y,1999,1_0,0.005,nan,uk garage,\n')
+    fast = tmp_path / "fast.csv"
+    slow = tmp_path / "slow.csv"
+
+    mod.main(str(export), str(fast), engine="csv")
+    mod.main(str(export), str(slow), engine="pandas")
+
+    assert fast.read_bytes() == slow.read_bytes()
+
+
+def test_auto_engine_falls_back_to_pandas_above_threshold(tmp_path, monkeypatch):
+    export = tmp_path / "export.csv"
+    _write_export(export, _export_rows(20))
+    used = []
+    original = mod.build_candidate_records
+    monkeypatch.setattr(mod, "build_candidate_records", lambda *a: used.append(1) or original(*a))
+
+    mod.main(str(export), str(tmp_path / "small.csv"))
+    assert used == [1]
+    monkeypatch.setattr(mod, "FAST_ENGINE_MAX_ROWS", 10)
+    mod.main(str(export), str(tmp_path / "large.csv"))
+    assert used == [1]
+    assert (tmp_path / "small.csv").read_bytes() == (tmp_path / "large.csv").read_bytes()
+
+
+def test_csv_engine_does_not_import_pandas(tmp_path):
+    export = tmp_path / "export.csv"
+    _write_export(export, _export_rows(5))
+    script = (
+        "import sys, csv_to_dj_pipeline as m; "
+        f"m.main({str(export)!r}, {str(tmp_path / 'out.csv')!r}, engine='csv'); "
+        "assert 'pandas' not in sys.modules"
+    )
+    subprocess.run(
+        [sys.executable, "-c", script], check=True, cwd=Path(mod.__file__).parent, capture_output=True
+    )
+
+
+@pytest.mark.parametrize("engine", ["csv", "pandas"])
+def test_main_accepts_aliased_export_headers(tmp_path, engine):
+    export = tmp_path / "export.csv"
+    _write_export(export, _export_rows(30))
+    expected = tmp_path / "expected.csv"
+    mod.main(str(export), str(expected), engine=engine)
+
+    renamed = pd.read_csv(export, dtype=str, keep_default_na=False).rename(
+        columns={"Artist Name(s)": "Artist", "Track Name": "Title", "Tempo": "BPM", "Record Label": "Label"}
+    )
+    renamed.to_csv(export, index=False)
+    output = tmp_path / "out.csv"
+    mod.main(str(export), str(output), engine=engine)
+
+    assert output.read_bytes() == expected.read_bytes()
@@ -129,3 +129,581 @@ def test_fetch_search_responses_non_list(monkeypatch):
 
     monkeypatch.setattr(mod.requests, "get", fake_get)
     assert mod.fetch_search_responses("http://host", "key", "id") == []
+
+
+def test_fetch_search_responses_session_404_raised_by_hook():
+    class Session:
+        def get(self, url, headers, timeout):
+            response = mod.requests.Response()
+            response.status_code = 404
+            raise mod.requests.HTTPError(response=response)
+
+    assert mod.fetch_search_responses("http://host", "key", "id", Session()) == []
+
+
+def test_build_session_pools_and_is_shared():
+    session = mod.build_session("key", pool_size=6)
+    adapter = session.get_adapter("http://localhost:5030/api/v0/searches")
+    assert adapter._pool_maxsize == 6
+    assert session.headers["X-API-Key"] == "key"
+    assert session.hooks["response"]
+
+    client = types.SimpleNamespace(
+        searches=types.SimpleNamespace(session=object()),
+        transfers=types.SimpleNamespace(session=object()),
+        api_url="http://host/api/v0",
+    )
+    mod.share_session(client, session)
+    assert client.searches.session is session
+    assert client.transfers.session is session
+
+
+def test_load_search_strings_parquet(tmp_path):
+    pa = pytest.importorskip("pyarrow")
+    import pyarrow.parquet as pq
+
+    path = tmp_path / "input.parquet"
+    pq.write_table(pa.table({"artist": ["A", "B"], "search_string": [" A - T ", None]}), str(path))
+    assert mod.load_search_strings(str(path), None) == ["A - T"]
+
+
+def test_run_concurrently_bounds_in_flight_and_yields_as_completed():
+    import threading
+
+    lock = threading.Lock()
+    release = {"slow": threading.Event()}
+    state = {"active": 0, "peak": 0}
+
+    def work(item):
+        with lock:
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+        if item == "slow":
+            release["slow"].wait(5)
+        with lock:
+            state["active"] -= 1
+        return item.upper()
+
+    results = []
+    for item, value in mod.run_concurrently(work, ["slow", "a", "b", "c", "d"], 2):
+        results.append(value)
+        if len(results) == 4:
+            release["slow"].set()
+    assert results[:4] == ["A", "B", "C", "D"]
+    assert results[4] == "SLOW"
+    assert state["peak"] == 2
+
+
+class FakeSearches:
+    def __init__(self, results):
+        self.results = results
+        self.queries = {}
+        self.stopped = []
+        self.state_calls = 0
+
+    def search_text(self, searchText, id, **kwargs):
+        self.queries[id] = searchText
+        return {"id": id, "searchText": searchText}
+
+    def responses_for(self, id):
+        return self.results.get(self.queries.get(id), [])
+
+    def state(self, id, includeResponses=False):
+        self.state_calls += 1
+        responses = self.responses_for(id)
+        state = {
+            "id": id,
+            "responseCount": len(responses),
+            "fileCount": sum(len(r["files"]) for r in responses),
+            "isComplete": True,
+        }
+        if includeResponses:
+            state["responses"] = responses
+        return state
+
+    def search_responses(self, id):
+        return self.responses_for(id)
+
+    def stop(self, id):
+        self.stopped.append(id)
+        return True
+
+
+class FakeSlskd:
+    def __init__(self, results):
+        self.searches = FakeSearches(results)
+        self.transfers = types.SimpleNamespace(enqueue=lambda user, files: True)
+
+
+def _run_main(monkeypatch, tmp_path, queries, results, *argv, client=None):
+    csv_path = tmp_path / "candidates.csv"
+    csv_path.write_text("search_string\n" + "\n".join(queries) + "\n", encoding="utf-8")
+    client = client or FakeSlskd(results)
+    monkeypatch.setattr(
+        mod, "fetch_search_responses", lambda base_url, api_key, search_id, *args: client.searches.responses_for(search_id)
+    )
+    monkeypatch.setattr(mod.time, "sleep", lambda seconds: None)
+    monkeypatch.setattr(mod.slskd_api, "SlskdClient", lambda *a, **k: client, raising=False)
+    monkeypatch.setenv("SLSKD_API_KEY", "key")
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        [
+            "dj_to_slskd_pipeline.py",
+            "--csv",
+            str(csv_path),
+            "--search-timeout-ms",
+            "1",
+            "--cache",
+            str(tmp_path / "cache.sqlite"),
+            "--peer-db",
+            str(tmp_path / "peers.sqlite"),
+            *argv,
+        ],
+    )
+    mod.main()
+    return client
+
+
+def test_main_dry_run_concurrent(monkeypatch, tmp_path, capsys):
+    results = {
+        "A - One": [{"username": "u1", "files": [{"filename": "one.flac", "size": 1}]}],
+        "B - Two": [{"username": "u2", "files": [{"filename": "two.mp3", "size": 2}]}],
+    }
+    _run_main(monkeypatch, tmp_path, ["A - One", "B - Two", "C - None"], results, "--dry-run", "--concurrency", "3")
+    out = capsys.readouterr().out
+    assert "[dry-run] u1: one.flac" in out
+    assert "[dry-run] u2: two.mp3" in out
+    assert "[skip] no results for: C - None" in out
+    assert "Done. queued=2, skipped=1" in out
+    assert "queries/min" in out
+
+
+def test_adaptive_poller_backs_off_and_settles(monkeypatch):
+    now = {"t": 0.0}
+    slept = []
+
+    def fake_sleep(seconds):
+        slept.append(seconds)
+        now["t"] += seconds
+
+    monkeypatch.setattr(mod.time, "sleep", fake_sleep)
+    poller = mod.AdaptivePoller(timeout=60, settle=3, initial=0.5, maximum=2, factor=2, clock=lambda: now["t"])
+    assert not poller.observe((0, 0))
+    poller.sleep()
+    assert not poller.observe((0, 0))  # nothing found yet is never "settled"
+    poller.sleep()
+    assert not poller.observe((2, 10))
+    poller.sleep()
+    assert not poller.observe((2, 10))  # 2s without growth < 3s window
+    poller.sleep()
+    assert poller.observe((2, 10))
+    assert slept == [0.5, 1.0, 2, 2]
+
+
+def test_search_best_file_finishes_when_counts_settle(monkeypatch):
+    now = {"t": 0.0}
+    monkeypatch.setattr(mod.time, "monotonic", lambda: now["t"])
+    monkeypatch.setattr(mod.time, "sleep", lambda seconds: now.__setitem__("t", now["t"] + seconds))
+    responses = [{"username": "u1", "files": [{"filename": "a.flac", "size": 1}]}]
+    client = FakeSlskd({"A - One": responses})
+    counts = iter([0, 1, 2] + [2] * 20)
+
+    def state(id, includeResponses=False):
+        n = next(counts)
+        return {"responseCount": n, "fileCount": n, "isComplete": False}
+
+    client.searches.state = state
+    monkeypatch.setattr(mod, "fetch_search_responses", lambda *a: responses)
+    options = types.SimpleNamespace(
+        search_timeout_ms=90000, settle_ms=3000, response_limit=100, file_limit=10000, no_stop=False, debug=False
+    )
+    result = mod.search_best_file(client, "A - One", options, "http://host", "key")
+    assert result.user == "u1"
+    assert now["t"] < 15  # well before the 90s timeout
+    assert client.searches.stopped == [result.state_id]
+
+
+def test_fetch_responses_probes_once_then_uses_cached_endpoint(monkeypatch):
+    calls = []
+    responses = [{"username": "u1", "files": [{"filename": "a.flac"}]}]
+
+    def rest(*args):
+        calls.append("rest")
+        return []
+
+    class Searches:
+        def state(self, id, includeResponses=False):
+            calls.append("state")
+            return {"responseCount": 1}
+
+        def search_responses(self, id):
+            calls.append("responses")
+            return responses
+
+    monkeypatch.setattr(mod, "fetch_search_responses", rest)
+    client = types.SimpleNamespace(searches=Searches())
+    endpoint = mod.ResponseEndpoint()
+
+    found, _, _ = mod.fetch_responses(client, "http://host", "key", "sid", "sid", "sid", endpoint=endpoint)
+    assert found == responses
+    assert calls == ["rest", "state", "responses"]
+    assert endpoint.name == "responses"
+
+    calls.clear()
+    found, raw, _ = mod.fetch_responses(client, "http://host", "key", "sid2", "sid2", "sid2", endpoint=endpoint)
+    assert found == responses and raw == responses
+    assert calls == ["responses"]
+
+
+def test_search_states_shares_one_listing_per_interval():
+    now = {"t": 0.0}
+    calls = []
+
+    def get_all():
+        calls.append(now["t"])
+        return [{"id": "a", "token": 1, "responseCount": 2}, {"id": "b", "token": 2, "responseCount": 0}, "junk"]
+
+    client = types.SimpleNamespace(searches=types.SimpleNamespace(get_all=get_all))
+    states = mod.SearchStates(client, max_age=1.0, clock=lambda: now["t"])
+    assert states.get("a")["responseCount"] == 2
+    assert states.get("b")["responseCount"] == 0
+    assert states.get(1)["id"] == "a"
+    assert states.get("missing") is None
+    assert len(calls) == 1
+    now["t"] = 1.5
+    states.get("a")
+    assert len(calls) == 2
+
+
+def test_main_bulk_poll_uses_list_requests(monkeypatch, tmp_path, capsys):
+    results = {"A - One": [{"username": "u1", "files": [{"filename": "one.flac", "size": 1}]}]}
+    listing = []
+    original = FakeSearches.search_text
+
+    def search_text(self, searchText, id, **kwargs):
+        listing.append({"id": id, "responseCount": 1, "fileCount": 1, "isComplete": True})
+        return original(self, searchText, id, **kwargs)
+
+    monkeypatch.setattr(FakeSearches, "search_text", search_text)
+    monkeypatch.setattr(FakeSearches, "get_all", lambda self: list(listing), raising=False)
+    client = _run_main(monkeypatch, tmp_path, ["A - One"], results, "--dry-run", "--bulk-poll")
+    out = capsys.readouterr().out
+    assert "[dry-run] u1: one.flac" in out
+    assert "Bulk poll: 1 searches list requests" in out
+    assert client.searches.state_calls == 0
+
+
+def test_main_reuses_cached_results(monkeypatch, tmp_path, capsys):
+    results = {"A - One": [{"username": "u1", "files": [{"filename": "one.flac", "size": 1}]}]}
+    _run_main(monkeypatch, tmp_path, ["A - One"], results, "--dry-run")
+    capsys.readouterr()
+    client = _run_main(monkeypatch, tmp_path, ["a - one"], {}, "--dry-run")
+    out = capsys.readouterr().out
+    assert "[dry-run] u1: one.flac (cached)" in out
+    assert "Cache: 1 searches answered" in out
+    assert client.searches.queries == {}
+
+
+def test_main_resume_skips_finished_rows(monkeypatch, tmp_path, capsys):
+    results = {"A - One": [{"username": "u1", "files": [{"filename": "one.flac", "size": 1}]}]}
+
+    def enqueue(user, files):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(mod, "retry_with_backoff", lambda func, **kwargs: func())
+    client = FakeSlskd(results)
+    client.transfers.enqueue = enqueue
+    queries = ["A - One", "B - Nothing"]
+    _run_main(monkeypatch, tmp_path, queries, results, "--no-cache", client=client)
+    out = capsys.readouterr().out
+    assert "[fail] enqueue failed for: A - One (boom)" in out
+    assert "Done. queued=0, skipped=1, failed=1" in out
+
+    client.transfers.enqueue = lambda user, files: True
+    client.searches.queries.clear()
+    _run_main(monkeypatch, tmp_path, queries, results, "--no-cache", "--resume", client=client)
+    out = capsys.readouterr().out
+    assert "Resuming: 1 rows already finished, 1 to search" in out
+    assert "[queued] u1: one.flac" in out
+    assert list(client.searches.queries.values()) == ["A - One"]
+
+    journal = mod.RunJournal(mod.default_journal_for_csv(str(tmp_path / "candidates.csv")))
+    assert journal.status("A - One") == "queued"
+    assert journal.status("B - Nothing") == "no_results"
+
+
+def test_main_skip_owned_avoids_searches(monkeypatch, tmp_path, capsys):
+    library = tmp_path / "library"
+    library.mkdir()
+    (library / "01 - A - One (Original Mix).mp3").write_bytes(b"")
+    import library_index
+
+    monkeypatch.setattr(library_index, "read_tags", lambda path: (None, None, None))
+    csv_rows = ["A - One", "B - Two"]
+    client = _run_main(
+        monkeypatch,
+        tmp_path,
+        csv_rows,
+        {},
+        "--dry-run",
+        "--skip-owned",
+        "--library-dir",
+        str(library),
+        "--downloads-dir",
+        str(tmp_path / "missing"),
+        "--owned-index",
+        str(tmp_path / "owned.json"),
+    )
+    out = capsys.readouterr().out
+    assert "[owned] A - One" in out
+    assert "Owned: 1 searches avoided" in out
+    assert list(client.searches.queries.values()) == ["B - Two"]
+
+
+def test_drop_owned_uses_isrc():
+    index = mod.OwnedIndex({"x": {"mtime": 0, "size": 0, "keys": [], "isrc": "USAAA0000001"}})
+    keep, dropped = mod.drop_owned(["A - One", "B - Two"], index, {"B - Two": "US-AAA-00-00001"})
+    assert keep == ["A - One"] and dropped == ["B - Two"]
+
+
+def test_enqueue_batcher_groups_per_peer_and_reports_each_file():
+    now = {"t": 0.0}
+    sent = []
+    outcomes = []
+
+    def enqueue(user, files):
+        sent.append((user, [f["filename"] for f in files]))
+        if len(files) > 1 and any(f["filename"] == "bad" for f in files):
+            return False
+        if files[0]["filename"] == "bad":
+            raise RuntimeError("rejected")
+        return True
+
+    batcher = mod.EnqueueBatcher(
+        enqueue,
+        size=2,
+        max_wait=5,
+        on_result=lambda item, user, entry, ok, error: outcomes.append((item, ok, error)),
+        clock=lambda: now["t"],
+    )
+    batcher.add("u1", {"filename": "a"}, "q1")
+    batcher.add("u2", {"filename": "x"}, "q2")
+    assert sent == []
+    batcher.add("u1", {"filename": "b"}, "q3")  # size reached
+    assert sent == [("u1", ["a", "b"])]
+    now["t"] = 6
+    batcher.flush_due()  # u2 waited long enough
+    assert sent[-1] == ("u2", ["x"])
+    batcher.add("u3", {"filename": "ok"}, "q4")
+    batcher.add("u3", {"filename": "bad"}, "q5")
+    assert sent[-3:] == [("u3", ["ok", "bad"]), ("u3", ["ok"]), ("u3", ["bad"])]
+    assert outcomes == [
+        ("q1", True, None),
+        ("q3", True, None),
+        ("q2", True, None),
+        ("q4", True, None),
+        ("q5", False, "rejected"),
+    ]
+    assert (batcher.requests, batcher.files) == (5, 5)
+
+
+def test_main_enqueues_same_peer_in_one_request(monkeypatch, tmp_path, capsys):
+    results = {
+        "A - One": [{"username": "label", "files": [{"filename": "one.flac", "size": 1}]}],
+        "B - Two": [{"username": "label", "files": [{"filename": "two.flac", "size": 2}]}],
+    }
+    client = FakeSlskd(results)
+    sent = []
+    client.transfers.enqueue = lambda user, files: sent.append((user, files)) or True
+    _run_main(monkeypatch, tmp_path, list(results), results, "--no-cache", client=client)
+    out = capsys.readouterr().out
+    assert len(sent) == 1 and len(sent[0][1]) == 2
+    assert "[queued] label: one.flac" in out and "[queued] label: two.flac" in out
+    assert "Enqueue: 2 files in 1 requests" in out
+
+
+def test_rank_files_keeps_top_k_in_order():
+    responses = [
+        {"username": "u1", "files": [{"filename": "a.mp3", "size": 1}, {"filename": "b.flac", "size": 5}]},
+        {"username": None, "files": [{"filename": "ignored.flac", "size": 99}]},
+        {"username": "u2", "files": [{"filename": "c.flac", "size": 9}, {"filename": "d 320.mp3", "size": 1}]},
+    ]
+    ranked = mod.rank_files(responses, 3)
+    assert [(user, f["filename"]) for user, f in ranked] == [("u2", "c.flac"), ("u1", "b.flac"), ("u2", "d 320.mp3")]
+    assert mod.pick_best_file(responses)[1]["filename"] == "c.flac"
+    assert mod.pick_best_file([]) == (None, None)
+
+
+def test_transfer_monitor_completes_and_fails_over(tmp_path):
+    journal = mod.RunJournal(str(tmp_path / "journal.sqlite"))
+    journal.add(["done", "errored", "stalled", "lost"])
+    alt = [{"username": "u1", "filename": "same-peer"}, {"username": "alt", "filename": "alt.flac", "size": 3}]
+    journal.record("done", mod.QUEUED, username="u1", filename="done.flac")
+    journal.record("errored", mod.QUEUED, username="u1", filename="err.flac", alternatives=alt)
+    journal.record("stalled", mod.QUEUED, username="u2", filename="slow.flac", alternatives=alt)
+    journal.record("lost", mod.QUEUED, username="u3", filename="lost.flac")
+
+    downloads = [
+        {
+            "username": "u1",
+            "directories": [
+                {
+                    "files": [
+                        {"id": "1", "filename": "done.flac", "state": "Completed, Succeeded"},
+                        {"id": "2", "filename": "err.flac", "state": "Completed, Errored"},
+                    ]
+                }
+            ],
+        },
+        {"username": "u2", "directories": [{"files": [{"id": "3", "filename": "slow.flac", "state": "Queued, Remotely"}]}]},
+        {"username": "u3", "directories": [{"files": [{"id": "4", "filename": "lost.flac", "state": "Completed, Rejected"}]}]},
+    ]
+    enqueued, cancelled = [], []
+    client = types.SimpleNamespace(
+        transfers=types.SimpleNamespace(
+            get_all_downloads=lambda: downloads,
+            enqueue=lambda user, files: enqueued.append((user, files[0]["filename"])) or True,
+            cancel_download=lambda user, id: cancelled.append((user, id)) or True,
+        )
+    )
+    now = {"t": 0.0}
+    reputation = mod.PeerReputation(str(tmp_path / "peers.sqlite"))
+    monitor = mod.TransferMonitor(client, journal, stall_timeout=60, reputation=reputation, clock=lambda: now["t"])
+    assert monitor.poll() == 2  # stalled (first sighting) and the failed-over errored row
+    assert journal.status("done") == "completed"
+    assert journal.status("lost") == "failed"
+    assert enqueued == [("alt", "alt.flac")]
+
+    now["t"] = 61
+    monitor.poll()
+    assert cancelled == [("u2", "3")]
+    assert enqueued[-1] == ("u1", "same-peer")  # only the failing peer itself is skipped
+    assert (monitor.completed, monitor.failovers, monitor.failed) == (1, 2, 1)
+    rows = {row["query"]: row for row in journal.queued()}
+    assert rows["stalled"]["username"] == "u1"
+    assert rows["stalled"]["alternatives"] == [alt[1]]
+    priors = reputation.priors()
+    assert priors["u2"] < 0 and priors["u3"] < 0
+
+
+def test_main_fails_over_when_enqueue_is_refused(monkeypatch, tmp_path, capsys):
+    results = {
+        "A - One": [
+            {"username": "busy", "files": [{"filename": "one.flac", "size": 1}]},
+            {"username": "other", "files": [{"filename": "one.mp3", "size": 1}]},
+        ]
+    }
+    client = FakeSlskd(results)
+    client.transfers.enqueue = lambda user, files: user != "busy"
+    monkeypatch.setattr(mod, "retry_with_backoff", lambda func, **kwargs: func())
+    _run_main(monkeypatch, tmp_path, list(results), results, "--no-cache", client=client)
+    out = capsys.readouterr().out
+    assert "[failover] A - One: busy (enqueue rejected) -> other" in out
+    assert "[queued] other: one.mp3" in out
+    assert "Done. queued=1, skipped=0, failed=0" in out
+
+
+def test_ranking_prefers_free_fast_peers_over_queued_flac():
+    responses = [
+        {
+            "username": "slow",
+            "hasFreeUploadSlot": False,
+            "queueLength": 80,
+            "uploadSpeed": 10_000,
+            "files": [{"filename": "song.flac", "size": 30_000_000, "length": 400}],
+        },
+        {
+            "username": "fast",
+            "hasFreeUploadSlot": True,
+            "queueLength": 0,
+            "uploadSpeed": 2_000_000,
+            "files": [
+                {"filename": "song.mp3", "size": 9_000_000, "bitRate": 320, "length": 400},
+                {"filename": "song preview.mp3", "size": 900_000, "bitRate": 320, "length": 30},
+                {"filename": "song low.mp3", "size": 4_000_000, "bitRate": 128, "length": 400},
+            ],
+        },
+    ]
+    ranked = mod.rank_files(responses, 4)
+    assert [f["filename"] for _, f in ranked] == ["song.mp3", "song.flac", "song low.mp3", "song preview.mp3"]
+
+
+def test_vectorized_scores_match_score_file():
+    responses = [
+        {
+            "username": "a",
+            "hasFreeUploadSlot": True,
+            "queueLength": 3,
+            "uploadSpeed": 500_000,
+            "files": [{"filename": "x 320.MP3", "size": 5}, {"filename": "y.flac", "extension": "flac", "bitRate": 1000}],
+        },
+        {"username": "b", "queueLength": "n/a", "fileInfos": [{"filename": "z.wav", "size": "7", "length": 12}]},
+    ]
+    pairs, scores, sizes = mod.score_responses(responses)
+    peers = {r["username"]: r for r in responses}
+    expected = [mod.score_file(f, peers[user]) for user, f in pairs]
+    assert list(scores) == [score for score, _ in expected]
+    assert list(sizes) == [size for _, size in expected]
+
+
+def test_ranking_uses_peer_priors():
+    responses = [
+        {"username": "flaky", "files": [{"filename": "song.mp3", "size": 9, "bitRate": 320}]},
+        {"username": "steady", "files": [{"filename": "song.mp3", "size": 8, "bitRate": 320}]},
+    ]
+    assert mod.rank_files(responses)[0][0] == "flaky"  # bigger file wins a tie
+    priors = {"flaky": -20.0, "steady": 10.0}
+    assert mod.rank_files(responses, priors=priors)[0][0] == "steady"
+    pairs, scores, _ = mod.score_responses(responses, priors)
+    assert list(scores) == [mod.score_file(f, prior=priors[user])[0] for user, f in pairs]
+
+
+def test_main_records_enqueue_outcomes(monkeypatch, tmp_path):
+    results = {"A - One": [{"username": "u1", "files": [{"filename": "one.flac", "size": 1}]}]}
+    _run_main(monkeypatch, tmp_path, list(results), results)
+    reputation = mod.PeerReputation(str(tmp_path / "peers.sqlite"))
+    assert reputation.priors()["u1"] > 0
+
+
+def test_retry_with_backoff_honours_retry_after_and_shares_breaker(monkeypatch, capsys):
+    sleeps = []
+    monkeypatch.setattr(mod.time, "sleep", sleeps.append)
+    now = {"t": 0.0}
+    guard = mod.ApiGuard(
+        mod.TokenBucket(rate=0), mod.CircuitBreaker(threshold=2, cooldown=30, clock=lambda: now["t"])
+    )
+    response = mod.requests.Response()
+    response.status_code = 429
+    response.headers["Retry-After"] = "12"
+    calls = iter([mod.requests.HTTPError(response=response), "ok"])
+
+    def flaky():
+        item = next(calls)
+        if isinstance(item, Exception):
+            raise item
+        return item
+
+    assert mod.retry_with_backoff(flaky, label="x", guard=guard) == "ok"
+    assert sleeps == [12.0]
+    assert guard.breaker.failures == 0
+
+    def down():
+        raise mod.requests.ConnectionError("refused")
+
+    for _ in range(2):
+        with pytest.raises(mod.requests.ConnectionError):
+            mod.retry_with_backoff(down, label="y", retries=0, guard=guard)
+    assert guard.breaker.opened_at == 0.0
+    assert "pausing all requests for 30s" in capsys.readouterr().out
+
+    # After the cooldown a probe that slskd answers, even with a 404, closes the circuit.
+    response.status_code = 404
+
+    def missing():
+        raise mod.requests.HTTPError(response=response)
+
+    now["t"] = 31
+    with pytest.raises(mod.requests.HTTPError):
+        mod.retry_with_backoff(missing, label="z", guard=guard)
+    assert guard.breaker.opened_at is None and guard.breaker.trips == 1
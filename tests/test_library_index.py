@@ -0,0 +1,38 @@
+import library_index as mod
+
+
+def test_owned_keys_match_candidate_search_strings():
+    keys = mod.owned_keys("01 - Artist - Title (Original Mix)", None, None)
+    assert keys == {"artist title", "artist title original mix"}
+    tagged = mod.owned_keys("track01", "Artíst; Guest", "Song (Extended Mix)")
+    assert "artist song" in tagged
+
+
+def test_build_reuses_cache_and_matches_isrc(tmp_path, monkeypatch):
+    library = tmp_path / "library"
+    library.mkdir()
+    (library / "Artist - Title.mp3").write_bytes(b"x")
+    (library / "tagged.flac").write_bytes(b"y")
+    reads = []
+
+    def fake_read_tags(path):
+        reads.append(path.name)
+        if path.name == "tagged.flac":
+            return "Other", "Song", "us-abc-12-34567"
+        return None, None, None
+
+    monkeypatch.setattr(mod, "read_tags", fake_read_tags)
+    cache = str(tmp_path / "owned.json")
+    index = mod.OwnedIndex.build([library, tmp_path / "missing"], cache)
+    assert sorted(reads) == ["Artist - Title.mp3", "tagged.flac"]
+    assert index.owns("Artist - Title")
+    assert index.owns("other - song")
+    assert index.owns("Unknown - Track", isrc="USABC1234567")
+    assert not index.owns("Artist - Other Title")
+
+    (library / "New - Track.mp3").write_bytes(b"z")
+    reads.clear()
+    index = mod.OwnedIndex.build([library], cache)
+    assert reads == ["New - Track.mp3"]
+    assert index.scanned == 1
+    assert index.owns("Artist - Title") and index.owns("New - Track")
@@ -0,0 +1,56 @@
+import pytest
+
+import csv_to_dj_pipeline as pipeline
+import mix_index as mod
+
+EXPORT = """Track Name,Artist Name(s),Tempo,Energy,Danceability,Genres,Record Label,Key,Mode
+Seed,A,124,0.7,0.7,tech house,L,9,0
+Near,B,125.6,0.6,0.7,tech house,L,0,1
+Step,C,122,0.6,0.7,tech house,L,4,0
+Clash,D,124,0.6,0.7,tech house,L,1,1
+Half,E,62,0.6,0.7,deep house,L,9,0
+Far,F,131,0.6,0.7,deep house,L,9,0
+"""
+
+
+def test_camelot_code():
+    assert mod.camelot_code(9, 0) == "8A"  # A minor
+    assert mod.camelot_code(0, 1) == "8B"  # C major
+    assert mod.camelot_code("7.0", "1") == "9B"  # G major
+    assert mod.camelot_code(8, 0) == "1A"  # G# minor
+    assert mod.camelot_code(-1, 1) is None
+    assert mod.camelot_code("", "") is None
+
+
+def test_camelot_neighbours_wrap():
+    assert mod.camelot_neighbours("8A") == ["8A", "7A", "9A", "8B"]
+    assert mod.camelot_neighbours("12B") == ["12B", "11B", "1B", "12A"]
+    assert mod.camelot_neighbours("1A") == ["1A", "12A", "2A", "1B"]
+
+
+@pytest.fixture
+def index(tmp_path):
+    export = tmp_path / "export.csv"
+    export.write_text(EXPORT, encoding="utf-8")
+    candidates = tmp_path / "candidates.csv"
+    pipeline.main(str(export), str(candidates))
+    built = mod.MixIndex.build(str(candidates), str(export))
+    path = mod.default_index_for_candidates(str(candidates))
+    built.save(path)
+    return mod.MixIndex.load(path)
+
+
+def test_compatible_uses_bpm_folding_and_camelot(index):
+    results = index.compatible("A - Seed")
+    assert [r["search_string"] for r in results] == ["E - Half", "C - Step", "B - Near"]
+    assert results[0]["fold"] == 2.0
+    assert index.find("D - Clash")["camelot"] == "3B"
+
+
+def test_compatible_options(index):
+    assert [r["search_string"] for r in index.compatible("A - Seed", fold=False)] == ["C - Step", "B - Near"]
+    any_key = index.compatible(bpm=124, harmonic=False, fold=False)
+    assert {r["search_string"] for r in any_key} == {"A - Seed", "D - Clash", "C - Step", "B - Near"}
+    assert [r["search_string"] for r in index.compatible(bpm=131, camelot="8A", bpm_range=1)] == ["F - Far"]
+    with pytest.raises(KeyError):
+        index.compatible("Nobody - Nothing")
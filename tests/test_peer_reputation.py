@@ -0,0 +1,31 @@
+import peer_reputation as mod
+
+DAY = 86400
+
+
+def test_priors_reward_reliable_fast_peers(tmp_path):
+    store = mod.PeerReputation(str(tmp_path / "peers.sqlite"))
+    for _ in range(4):
+        store.record_transfer("good", True, speed=2_000_000, now=0)
+        store.record_transfer("bad", False, now=0)
+    store.record_enqueue("new", True, now=0)
+    priors = store.priors(now=0)
+    assert priors["good"] > priors["new"] > 0 > priors["bad"]
+    assert priors["good"] <= mod.RELIABILITY_WEIGHT + mod.SPEED_WEIGHT
+    assert "unknown" not in priors
+    store.close()
+
+
+def test_old_history_decays(tmp_path):
+    store = mod.PeerReputation(str(tmp_path / "peers.sqlite"), half_life_days=10)
+    for _ in range(10):
+        store.record_transfer("peer", False, now=0)
+    fresh = store.priors(now=0)["peer"]
+    faded = store.priors(now=100 * DAY)["peer"]
+    assert fresh < faded < 0
+    assert abs(faded) < 0.5
+
+    # New outcomes count at full weight against the decayed history.
+    store.record_transfer("peer", True, now=100 * DAY)
+    assert store.priors(now=100 * DAY)["peer"] > 0
+    store.close()
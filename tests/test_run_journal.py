@@ -0,0 +1,32 @@
+import run_journal as mod
+
+
+def test_journal_batches_commits_and_resumes(tmp_path):
+    path = str(tmp_path / "journal.sqlite")
+    now = {"t": 0.0}
+    journal = mod.RunJournal(path, batch_size=3, flush_seconds=60, clock=lambda: now["t"])
+    journal.add(["a", "b", "c"])
+    journal.record("a", mod.SEARCHING)
+    journal.record("a", mod.QUEUED, username="u", filename="a.flac")
+
+    other = mod.RunJournal(path)
+    assert other.finished() == set()  # still buffered
+    journal.record("b", mod.NO_RESULTS)  # third update fills the batch
+    assert other.finished() == {"a", "b"}
+
+    journal.record("c", mod.FAILED, detail="timeout")
+    now["t"] = 61
+    journal.record("c", mod.FAILED, detail="timeout again")  # flushed by age
+    assert other.status("c") == mod.FAILED
+    journal.close()
+
+    resumed = mod.RunJournal(path)
+    resumed.add(["a", "d"])
+    assert resumed.status("a") == mod.QUEUED
+    assert resumed.status("d") == mod.PENDING
+    resumed.reset()
+    assert resumed.finished() == set()
+
+
+def test_default_journal_for_csv():
+    assert mod.default_journal_for_csv("csv/Liked_dj_candidates.csv") == "csv/Liked_dj_candidates_slskd_journal.sqlite"
@@ -0,0 +1,29 @@
+import search_cache as mod
+
+
+def test_compact_responses_keeps_ranking_fields():
+    responses = [
+        {
+            "username": "u1",
+            "uploadSpeed": 100,
+            "token": 5,
+            "fileInfos": [{"filename": "a.flac", "size": 1, "bitRate": 900, "code": 1}],
+        }
+    ]
+    assert mod.compact_responses(responses) == [
+        {"username": "u1", "uploadSpeed": 100, "files": [{"filename": "a.flac", "size": 1, "bitRate": 900}]}
+    ]
+
+
+def test_cache_ttl_and_normalized_key(tmp_path):
+    cache = mod.SearchCache(str(tmp_path / "cache.sqlite"), ttl_hours=1)
+    cache.put("Artíst - Track (Remix)", [{"username": "u", "files": [{"filename": "x.mp3"}]}], now=1000)
+    assert cache.get("artist - track (remix)", now=1000 + 3599) == [{"username": "u", "files": [{"filename": "x.mp3"}]}]
+    assert cache.get("Artist - Track", now=1000) is None
+    assert cache.get("Artist - Track (Remix)", now=1000 + 3601) is None
+    assert cache.hits == 1
+    assert cache.purge(now=1000 + 3601) == 1
+    cache.close()
+
+    reopened = mod.SearchCache(str(tmp_path / "cache.sqlite"), ttl_hours=1)
+    assert reopened.get("Artist - Track (Remix)") is None
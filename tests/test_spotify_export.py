@@ -0,0 +1,67 @@
+import pandas as pd
+import pytest
+
+import spotify_export as mod
+
+HEADER = "Track URI,Track Name,Artist Name(s),Release Date,Genres,Record Label,Tempo,Energy,Popularity\n"
+
+
+def _write(path, text):
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+def test_detect_layout_exportify_and_aliases():
+    exportify = mod.detect_layout(HEADER.strip().split(","))
+    assert exportify.flavour == "exportify"
+    assert exportify.columns["Track Name"] == "Track Name"
+
+    generic = mod.detect_layout(["title", "Artist", "BPM", "Label", "isrc"])
+    assert generic.flavour == "generic"
+    assert generic.columns == {
+        "Track Name": "title",
+        "Artist Name(s)": "Artist",
+        "Tempo": "BPM",
+        "Record Label": "Label",
+        "ISRC": "isrc",
+    }
+    assert mod.canonical_header(["title", "Other"]) == ["Track Name", "Other"]
+
+
+@pytest.mark.parametrize("engine", ["c", "pyarrow"])
+def test_load_export_prunes_and_types_columns(tmp_path, engine):
+    if engine == "pyarrow":
+        pytest.importorskip("pyarrow")
+    path = _write(
+        tmp_path / "export.csv",
+        HEADER
+        + "spotify:track:1,Song,A,2020-05-01,house,L,120.5,0.7,10\n"
+        + "spotify:track:2,NA,B,2019,,L,,0.615,\n",
+    )
+    df = mod.load_export(path, ["Track Name", "Tempo", "Genres"], optional=["Release Date", "ISRC"], engine=engine)
+
+    assert df.columns.tolist() == ["Track Name", "Tempo", "Genres", "Release Date"]
+    assert df["Tempo"].dtype == "float64"
+    assert isinstance(df["Genres"].dtype, pd.CategoricalDtype)
+    assert df["Release Date"].tolist() == [pd.Timestamp("2020-05-01"), pd.Timestamp("2019-01-01")]
+    assert df["Track Name"].isna().tolist() == [False, True]
+    assert pd.isna(df["Tempo"].iloc[1])
+
+
+@pytest.mark.parametrize("engine", ["c", "pyarrow"])
+def test_load_export_leaves_dirty_numbers_untyped(tmp_path, engine):
+    if engine == "pyarrow":
+        pytest.importorskip("pyarrow")
+    path = _write(tmp_path / "export.csv", HEADER + "u,Song,A,2020,house,L,1_0,0.7,1\n")
+    df = mod.load_export(path, ["Tempo", "Energy"], engine=engine)
+    assert pd.to_numeric(df["Tempo"], errors="coerce").isna().all()
+    assert df["Energy"].tolist() == [0.7]
+
+
+def test_iter_export_rows_keeps_raw_text_of_requested_columns(tmp_path):
+    path = _write(tmp_path / "export.csv", "Title,Artist,Unused,isrc\nSong,NA,x,US1\nShort\n")
+    rows = list(mod.iter_export_rows(path, ["Track Name", "Artist Name(s)", "ISRC", "Tempo"]))
+    assert rows == [
+        {"Track Name": "Song", "Artist Name(s)": "NA", "ISRC": "US1"},
+        {"Track Name": "Short", "Artist Name(s)": "", "ISRC": ""},
+    ]
@@ -0,0 +1,79 @@
+import json
+
+import pandas as pd
+import pytest
+
+import style_rules as mod
+
+
+def test_keyword_matcher_finds_overlapping_keywords():
+    matcher = mod.KeywordMatcher(["tech house", "house", "use", "techno"])
+    found = matcher.scan("deep tech house, techno")
+    assert found == matcher.bit("tech house") | matcher.bit("house") | matcher.bit("use") | matcher.bit("techno")
+    assert matcher.scan("minimal") == 0
+
+
+def test_keyword_matcher_suffix_links():
+    matcher = mod.KeywordMatcher(["he", "she", "his", "hers"])
+    assert matcher.scan("ushers") == matcher.bit("he") | matcher.bit("she") | matcher.bit("hers")
+
+
+def test_default_rules_match_previous_infer_style():
+    c = mod.DEFAULT_CLASSIFIER
+    assert c.classify("UK Garage", 130, 0.9) == "Garage / Breaky"
+    assert c.classify("micro house", 120, 0.8) == "Minimal / Micro"
+    assert c.classify("tech house", 120, 0.5) == "Tech House"
+    assert c.classify("deep tech", 128, 0.9) == "Deep House"
+    assert c.classify("house", 128, 0.59) == "Deep House"
+    assert c.classify("house", 126, 0.65) == "Peak House"
+    assert c.classify("house", 125, 0.9) == "House / Groovy"
+
+
+def test_custom_rules_first_match_wins_and_exclusions():
+    c = mod.StyleClassifier(
+        [
+            {"style": "Afro House", "genres_any": ["afro"], "genres_none": ["tech"]},
+            {"style": "Fast", "bpm_gte": 130, "danceability_lt": 0.5},
+            {"style": "Any House", "genres_any": ["house"]},
+        ],
+        default="Other",
+    )
+    assert c.classify("afro house", 120, 0.7) == "Afro House"
+    assert c.classify("afro tech house", 120, 0.7) == "Any House"
+    assert c.classify("techno", 132, 0.7, 0.4) == "Fast"
+    assert c.classify("techno", 132, 0.7, 0.6) == "Other"
+
+
+def test_classify_frame_matches_classify():
+    c = mod.StyleClassifier(
+        mod.DEFAULT_STYLE_RULES[:3]
+        + [{"style": "Afro", "genres_any": ["afro"], "energy_gte": 0.7}]
+        + mod.DEFAULT_STYLE_RULES[3:]
+    )
+    genres = pd.Series(["garage", "afro house", "afro house", "Tech House", "", None, "deep", "house"])
+    bpm = pd.Series([120, 124, 124, 126, 128, 120, 130, 127])
+    energy = pd.Series([0.8, 0.9, 0.5, 0.7, 0.7, 0.3, 0.9, 0.66])
+    expected = [c.classify(g, b, e) for g, b, e in zip(genres, bpm, energy)]
+    assert list(c.classify_frame(genres, bpm, energy)) == expected
+
+
+def test_load_style_rules(tmp_path):
+    path = tmp_path / "rules.json"
+    path.write_text(
+        json.dumps({"default": "Misc", "rules": [{"style": "Techno", "genres_any": ["techno"]}]}),
+        encoding="utf-8",
+    )
+    c = mod.load_style_rules(str(path))
+    assert c.classify("hard techno", 140, 0.9) == "Techno"
+    assert c.classify("house", 120, 0.9) == "Misc"
+    assert c.signature != mod.DEFAULT_CLASSIFIER.signature
+    assert mod.load_style_rules(None).signature == mod.DEFAULT_CLASSIFIER.signature
+
+
+def test_invalid_rules():
+    with pytest.raises(ValueError, match="Unknown style rule field"):
+        mod.StyleClassifier([{"style": "X", "bpm_min": 120}])
+    with pytest.raises(ValueError, match="genres_any"):
+        mod.StyleClassifier([{"style": "X", "genres_any": "house"}])
+    with pytest.raises(ValueError, match="style"):
+        mod.StyleClassifier([{"genres_any": ["house"]}])
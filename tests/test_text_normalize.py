@@ -0,0 +1,59 @@
+import random
+import re
+import unicodedata
+
+import text_normalize as mod
+
+
+def legacy_normalize(text, strip_brackets=True):
+    text = text or ""
+    text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode()
+    text = text.lower()
+    if strip_brackets:
+        text = re.sub(r"\(.*?\)|\[.*?\]|\{.*?\}", " ", text)
+    text = text.replace("&", " and ")
+    text = re.sub(r"[^a-z0-9]+", " ", text)
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def legacy_clean_filename(name):
+    name = name.strip()
+    name = re.sub(r"^\d{1,3}\s*[-._]\s*", "", name)
+    return re.sub(r"^\d{1,3}\s+", "", name)
+
+
+def test_normalize_key_examples():
+    assert mod.normalize_key("Café (Remix) & Co.") == "cafe and co"
+    assert mod.normalize_key("Café (Remix) & Co.", strip_brackets=False) == "cafe remix and co"
+    assert mod.normalize_key("  Multiple   Spaces ") == "multiple spaces"
+    assert mod.normalize_key(None) == ""
+
+
+def test_normalize_key_matches_legacy_regex_chain():
+    rng = random.Random(7)
+    alphabet = "abXZ09 &()[]{}-_.,'éüñßİﬁ²½\t!"
+    for _ in range(5000):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 20)))
+        assert mod.normalize_key(text) == legacy_normalize(text)
+        assert mod.normalize_key(text, strip_brackets=False) == legacy_normalize(text, False)
+        assert mod.clean_filename(text) == legacy_clean_filename(text)
+
+
+def test_clean_filename():
+    assert mod.clean_filename("01 - 02 Track") == "Track"
+    assert mod.clean_filename("7 Track") == "Track"
+    assert mod.clean_filename("Track 01") == "Track 01"
+
+
+def test_clean_track_name_and_mix_suffix():
+    assert mod.clean_track_name("Song (Extended Mix) [Label]") == "Song"
+    assert mod.strip_mix_suffix("Song - Artist Remix") == "Song"
+    assert mod.strip_mix_suffix("Song") == "Song"
+
+
+def test_artists_and_isrc():
+    assert mod.artist_list("A; B ; C") == ["A", "B", "C"]
+    assert mod.artist_list(" ; ") == [";"]
+    assert mod.primary_artist("A; B") == "A"
+    assert mod.normalize_isrc("us-abc-12-34567") == "USABC1234567"
+    assert mod.normalize_isrc("--") is None
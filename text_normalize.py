@@ -0,0 +1,120 @@
+"""Shared text normalization for track matching.
+
+Every script that builds artist/title keys goes through this module so keys
+agree across candidate generation, tagging, playlist export and duplicate
+detection. Patterns are compiled once, ASCII case/punctuation folding is a
+single str.translate pass, and normalized keys are memoized since the same
+artist and title strings recur constantly.
+"""
+import re
+import unicodedata
+from functools import lru_cache
+from typing import List, Optional, Set, Tuple
+
+TRACK_JUNK_PATTERNS = [
+    r"\(.*extended.*\)",
+    r"\(.*original.*\)",
+    r"\(.*radio.*\)",
+    r"\(.*remaster.*\)",
+    r"\[.*\]",
+    r"- extended.*",
+    r"- original.*",
+]
+# One alternation instead of a re.sub pass per pattern; shared by the
+# row-wise helper and the column-wise engine so both clean identically.
+TRACK_JUNK_RE = re.compile("|".join(TRACK_JUNK_PATTERNS), re.IGNORECASE)
+
+BRACKETS_RE = re.compile(r"\(.*?\)|\[.*?\]|\{.*?\}")
+MIX_SUFFIX_RE = re.compile(r"\s*-\s*.*(remix|mix|edit|version|rework)\b.*", re.IGNORECASE)
+TRACK_NUMBER_SEP_RE = re.compile(r"^\d{1,3}\s*[-._]\s*")
+TRACK_NUMBER_SPACE_RE = re.compile(r"^\d{1,3}\s+")
+ISRC_STRIP_RE = re.compile(r"[^A-Za-z0-9]")
+
+# ASCII fold table: letters lowercased, digits kept, '&' spelled out and every
+# other ASCII character turned into a separator.
+_KEY_TABLE = {i: " " for i in range(128)}
+_KEY_TABLE.update({ord(c): c for c in "abcdefghijklmnopqrstuvwxyz0123456789"})
+_KEY_TABLE.update({ord(c): c.lower() for c in "ABCDEFGHIJKLMNOPQRSTUVWXYZ"})
+_KEY_TABLE[ord("&")] = " and "
+
+KEY_CACHE_SIZE = 1 << 16
+
+
+def fold_ascii(text: str) -> str:
+    """Strip accents and drop characters with no ASCII equivalent."""
+    if text.isascii():
+        return text
+    return unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode()
+
+
+@lru_cache(maxsize=KEY_CACHE_SIZE)
+def normalize_key(text: Optional[str], strip_brackets: bool = True) -> str:
+    """Matching key: ASCII, lowercase, '&' -> 'and', single-spaced alphanumerics.
+
+    With strip_brackets, (...), [...] and {...} segments are removed first.
+    """
+    if not text:
+        return ""
+    text = fold_ascii(text)
+    if strip_brackets:
+        text = BRACKETS_RE.sub(" ", text)
+    return " ".join(text.translate(_KEY_TABLE).split())
+
+
+def clean_track_name(name) -> str:
+    """Drop extended/original/radio/remaster suffixes and [...] tags."""
+    return TRACK_JUNK_RE.sub("", str(name)).strip()
+
+
+def strip_mix_suffix(track: str) -> str:
+    """'Song - Artist Remix' -> 'Song'; unchanged when there is no mix suffix."""
+    return MIX_SUFFIX_RE.sub("", track)
+
+
+def clean_filename(stem: str) -> str:
+    """Remove a leading track number ("01 - ", "001_", "7 ") from a file stem."""
+    stem = TRACK_NUMBER_SEP_RE.sub("", stem.strip())
+    return TRACK_NUMBER_SPACE_RE.sub("", stem)
+
+
+@lru_cache(maxsize=KEY_CACHE_SIZE)
+def split_artists(artist_raw: str) -> tuple:
+    parts = tuple(p.strip() for p in artist_raw.split(";") if p.strip())
+    return parts or (artist_raw.strip(),)
+
+
+def artist_list(artist_raw: str) -> List[str]:
+    if not artist_raw:
+        return []
+    return list(split_artists(artist_raw))
+
+
+def primary_artist(artist_raw: str) -> str:
+    # Soulseek suele fallar con múltiples artistas
+    return artist_raw.split(";")[0].strip()
+
+
+def normalize_isrc(value: Optional[str]) -> Optional[str]:
+    if not value:
+        return None
+    normalized = ISRC_STRIP_RE.sub("", str(value)).upper()
+    return normalized or None
+
+
+def library_track_keys(stem: str, artist: Optional[str] = None, title: Optional[str] = None) -> Tuple[Set[str], Set[str]]:
+    """(artist - title keys, title keys) for a library file, from its tags and file stem."""
+    keys = set()
+    title_keys = set()
+    if artist and title:
+        keys.add(normalize_key(f"{artist} - {title}", strip_brackets=False))
+        title_keys.add(normalize_key(title, strip_brackets=False))
+
+    stem = clean_filename(stem)
+    if " - " in stem:
+        a, t = stem.split(" - ", 1)
+        keys.add(normalize_key(f"{a} - {t}", strip_brackets=False))
+        title_keys.add(normalize_key(t, strip_brackets=False))
+    else:
+        keys.add(normalize_key(stem, strip_brackets=False))
+        title_keys.add(normalize_key(stem, strip_brackets=False))
+    return keys, title_keys
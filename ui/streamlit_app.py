@@ -3,12 +3,17 @@ import os
 import shlex
 import shutil
 import subprocess
+import sys
 from pathlib import Path
 
 import streamlit as st
 
 
 REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from mix_index import DEFAULT_BPM_RANGE, MixIndex, default_index_for_candidates  # noqa: E402
 
 
 def expand_path(value: str) -> Path:
@@ -234,6 +239,37 @@ with tab_pipeline:
         if not can_run:
             st.info("Step is blocked until Spotify CSV exists.")
 
+    with st.expander("Mix index: compatible next tracks", expanded=False):
+        mix_index_path = Path(default_index_for_candidates(str(candidates_csv)))
+        st.write(f"Index: `{mix_index_path}`")
+        if st.button("Build mix index", key="build_mix_index", disabled=not (candidates_ok and spotify_ok)):
+            run_cmd_stream(
+                label="mix_index",
+                cmd=[
+                    "python",
+                    "mix_index.py",
+                    "build",
+                    "--candidates",
+                    str(candidates_csv),
+                    "--export",
+                    str(spotify_csv),
+                ],
+                env=env,
+            )
+        if mix_index_path.exists():
+            mix = MixIndex.load(str(mix_index_path))
+            seed = st.selectbox("Seed track", sorted(track["search_string"] for track in mix.tracks))
+            bpm_range = st.slider("BPM range", 0.5, 10.0, DEFAULT_BPM_RANGE, 0.5)
+            if seed:
+                st.dataframe(
+                    [
+                        {k: r[k] for k in ("search_string", "bpm", "camelot", "bpm_delta", "fold", "style")}
+                        for r in mix.compatible(seed, bpm_range=bpm_range)
+                    ]
+                )
+        else:
+            st.info("Build the index after generating candidates.")
+
     with st.expander("Step 3: Queue slskd downloads", expanded=False):
         st.write(f"Input CSV: `{candidates_csv}`")
         can_run = candidates_ok and api_key_ok